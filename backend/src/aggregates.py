@@ -0,0 +1,166 @@
+import math
+from collections import Counter, deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from .schemas import DecisionLog
+
+class LatencyHistogram:
+    """
+    HDR-style histogram over log-spaced buckets.
+    Each bucket is `growth` wider than the previous one, so any reported
+    percentile is within (growth - 1) relative error. Recording is O(1) and
+    percentile queries walk a fixed number of buckets, whatever the sample count.
+    """
+
+    def __init__(self, lowest_ms: float = 0.001, highest_ms: float = 60_000.0, growth: float = 1.05):
+        self.lowest_ms = lowest_ms
+        self.highest_ms = highest_ms
+        self._log_growth = math.log(growth)
+        self.n_buckets = int(math.ceil(math.log(highest_ms / lowest_ms) / self._log_growth)) + 1
+        self.counts: List[int] = [0] * self.n_buckets
+        self.total = 0
+        self.sum_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def _bucket(self, value_ms: float) -> int:
+        if value_ms <= self.lowest_ms:
+            return 0
+        idx = int(math.log(value_ms / self.lowest_ms) / self._log_growth) + 1
+        return min(idx, self.n_buckets - 1)
+
+    def _upper_edge(self, idx: int) -> float:
+        return self.lowest_ms * math.exp(idx * self._log_growth)
+
+    def record(self, value_ms: float):
+        self.counts[self._bucket(value_ms)] += 1
+        self.total += 1
+        self.sum_ms += value_ms
+        if value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def merge(self, other: "LatencyHistogram"):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.total += other.total
+        self.sum_ms += other.sum_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket edge of the q-th percentile (0-100), clamped to the observed max."""
+        if self.total == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(q / 100.0 * self.total)))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self._upper_edge(i), self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, float]:
+        if self.total == 0:
+            return {"count": 0, "mean": 0.0, "min": 0.0, "max": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0}
+        return {
+            "count": self.total,
+            "mean": self.sum_ms / self.total,
+            "min": self.min_ms,
+            "max": self.max_ms,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+class WindowAggregate:
+    """Counts, per-rule violations and a latency histogram for one span of time."""
+
+    def __init__(self, start: float, end: Optional[float] = None):
+        self.start = start
+        self.end = end
+        self.count = 0
+        self.decisions: Counter = Counter()
+        # Decisions that violated a rule (each decision counted once per rule)
+        self.rule_hits: Counter = Counter()
+        self.latency = LatencyHistogram()
+
+    def record(self, decision: DecisionLog):
+        self.count += 1
+        self.decisions[decision.decision] += 1
+        for rule_id in {v.rule_id for v in decision.violations}:
+            self.rule_hits[rule_id] += 1
+        self.latency.record(decision.processing_time_ms)
+
+    def summary(self) -> Dict:
+        return {
+            "start": self.start,
+            "end": self.end,
+            "count": self.count,
+            "decisions": dict(self.decisions),
+            "violation_rates": {r: n / self.count for r, n in self.rule_hits.items()} if self.count else {},
+            "processing_time_ms": self.latency.summary(),
+        }
+
+class DashboardAggregates:
+    """
+    Aggregates maintained as decisions arrive, so summary queries cost the
+    same no matter how much history the store holds.
+    Keeps a running total since server start plus the last `max_windows`
+    tumbling windows of `window_s` seconds each.
+    """
+
+    def __init__(self, window_s: float = 60.0, max_windows: int = 60):
+        self.window_s = window_s
+        self.totals = WindowAggregate(start=0.0)
+        self.windows: Deque[WindowAggregate] = deque(maxlen=max_windows)
+        # Decisions that arrived for a window older than any we still retain
+        self.late_dropped = 0
+
+    def _window_for(self, received_at: float) -> Optional[WindowAggregate]:
+        start = math.floor(received_at / self.window_s) * self.window_s
+        if not self.windows or start > self.windows[-1].start:
+            self.windows.append(WindowAggregate(start=start, end=start + self.window_s))
+            return self.windows[-1]
+        if start < self.windows[0].start:
+            return None
+        # Late arrivals land in their own window, which may be a gap we never opened
+        for i in range(len(self.windows) - 1, -1, -1):
+            w = self.windows[i]
+            if w.start == start:
+                return w
+            if w.start < start:
+                window = WindowAggregate(start=start, end=start + self.window_s)
+                if len(self.windows) == self.windows.maxlen:
+                    self.windows.popleft()
+                    i -= 1
+                self.windows.insert(i + 1, window)
+                return window
+        return None
+
+    def record(self, decisions: Iterable[DecisionLog], received_at: float):
+        if not self.totals.count and not self.windows:
+            self.totals.start = received_at
+        window = self._window_for(received_at)
+        for d in decisions:
+            self.totals.record(d)
+            if window is not None:
+                window.record(d)
+            else:
+                self.late_dropped += 1
+
+    def current_window(self) -> Optional[WindowAggregate]:
+        return self.windows[-1] if self.windows else None
+
+    def summary(self) -> Dict:
+        current = self.current_window()
+        return {
+            "window_s": self.window_s,
+            "since_start": self.totals.summary(),
+            "current_window": current.summary() if current else None,
+            "late_dropped": self.late_dropped,
+        }
+
+    def window_summaries(self) -> List[Dict]:
+        return [w.summary() for w in self.windows]
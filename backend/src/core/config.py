@@ -1,11 +1,31 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Flowguard"
     VERSION: str = "0.1.0"
     API_V1_STR: str = "/api/v1"
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
+
+    # Telemetry storage (SQLite, no Postgres needed locally)
+    STORAGE_PATH: str = "telemetry.db"
+    RECENT_CAPACITY: int = 1000
+    FLUSH_INTERVAL_S: float = 0.5
+    FLUSH_BATCH: int = 500
+    RETENTION_S: Optional[float] = 7 * 24 * 3600
+    COMPACT_INTERVAL_S: float = 3600.0
+
+    # Batch ingest: cap on a body after Content-Encoding is undone
+    MAX_DECOMPRESSED_BYTES: int = 64 * 1024 * 1024
+
+    # Dashboard aggregates (tumbling windows)
+    AGGREGATE_WINDOW_S: float = 60.0
+    AGGREGATE_MAX_WINDOWS: int = 60
+
+    # Live stream (SSE)
+    STREAM_QUEUE_SIZE: int = 256
+    STREAM_DELTA_INTERVAL_S: float = 1.0
+    STREAM_KEEPALIVE_S: float = 15.0
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,162 @@
+import functools
+import json
+import zlib
+from typing import Any, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+NDJSON_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-seq", "text/plain", ""}
+MSGPACK_TYPES = {"application/msgpack", "application/x-msgpack", "application/vnd.msgpack"}
+
+# Cap on per-record error details echoed back to the client
+MAX_REPORTED_ERRORS = 10
+
+# Default cap on a decompressed body, so a small compressed request can't exhaust memory
+MAX_DECOMPRESSED_BYTES = 64 * 1024 * 1024
+
+class UnsupportedPayload(Exception):
+    """Body uses an encoding or content type this server can't handle (maps to HTTP 415)."""
+
+class MalformedPayload(Exception):
+    """Body could not be decoded at all (maps to HTTP 400)."""
+
+class PayloadTooLarge(Exception):
+    """Body decompresses to more than the allowed size (maps to HTTP 413)."""
+
+def _too_large(max_bytes: int) -> PayloadTooLarge:
+    return PayloadTooLarge(f"Decompressed body exceeds {max_bytes} bytes")
+
+def _gunzip(body: bytes, max_bytes: int) -> bytes:
+    # Streaming inflate, one gzip member at a time, never producing more than max_bytes + 1
+    out = []
+    total = 0
+    data = body
+    while data:
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunk = inflater.decompress(data, max_bytes - total + 1)
+        total += len(chunk)
+        if total > max_bytes:
+            raise _too_large(max_bytes)
+        out.append(chunk)
+        if not inflater.eof:
+            raise MalformedPayload("Could not decompress gzip body: truncated stream")
+        data = inflater.unused_data
+    return b"".join(out)
+
+def _unzstd(body: bytes, max_bytes: int) -> bytes:
+    with zstandard.ZstdDecompressor().stream_reader(body, read_across_frames=True) as reader:
+        data = reader.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise _too_large(max_bytes)
+    return data
+
+def decompress(body: bytes, content_encoding: Optional[str], max_bytes: int = MAX_DECOMPRESSED_BYTES) -> bytes:
+    """Undoes Content-Encoding. Raises PayloadTooLarge once the output would pass max_bytes."""
+    encoding = (content_encoding or "identity").strip().lower()
+    try:
+        if encoding in ("identity", ""):
+            return body
+        if encoding in ("gzip", "x-gzip"):
+            return _gunzip(body, max_bytes)
+        if encoding == "zstd":
+            if zstandard is None:
+                raise UnsupportedPayload("zstd bodies require the 'zstandard' package on the server")
+            return _unzstd(body, max_bytes)
+    except (zlib.error, OSError, EOFError) as e:
+        raise MalformedPayload(f"Could not decompress {encoding} body: {e}")
+    except Exception as e:
+        if zstandard is not None and isinstance(e, zstandard.ZstdError):
+            raise MalformedPayload(f"Could not decompress zstd body: {e}")
+        raise
+    raise UnsupportedPayload(f"Unsupported Content-Encoding: {encoding}")
+
+def _media_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+def parse_batch(body: bytes, content_type: Optional[str], model: Type[BaseModel]) -> Tuple[List[BaseModel], int, List[dict]]:
+    """
+    Parses a batch body into model instances.
+    Returns (accepted, rejected_count, errors); invalid records are counted
+    and reported rather than failing the whole batch.
+    """
+    media_type = _media_type(content_type)
+    if media_type in NDJSON_TYPES or media_type == "application/json":
+        return _parse_ndjson(body, model)
+    if media_type in MSGPACK_TYPES:
+        if msgpack is None:
+            raise UnsupportedPayload("msgpack bodies require the 'msgpack' package on the server")
+        return _validate_objects(_iter_msgpack(body), model)
+    raise UnsupportedPayload(f"Unsupported Content-Type: {media_type}")
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """List[model] validator, built once per model rather than per request."""
+    return TypeAdapter(List[model])
+
+def _parse_ndjson(body: bytes, model: Type[BaseModel]) -> Tuple[List[BaseModel], int, List[dict]]:
+    stripped = body.strip()
+    if stripped.startswith(b"["):
+        # A plain JSON array is accepted too
+        try:
+            return _validate_objects(iter(json.loads(stripped)), model)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise MalformedPayload(f"Invalid JSON array body: {e}")
+
+    lines = [line for line in stripped.split(b"\n") if line.strip()]
+    if not lines:
+        return [], 0, []
+
+    # Fast path: validate every line in one pydantic-core call. A line holding
+    # more than one value (e.g. `{...}, {...}`) would splice into extra array
+    # items, so the count must match the line count or we go line by line.
+    try:
+        parsed = _list_adapter(model).validate_json(b"[" + b",".join(lines) + b"]")
+        if len(parsed) == len(lines):
+            return parsed, 0, []
+    except ValidationError:
+        pass
+
+    # Slow path: find out which lines are bad
+    accepted, errors = [], []
+    for index, line in enumerate(lines):
+        try:
+            accepted.append(model.model_validate_json(line))
+        except ValidationError as e:
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"index": index, "error": e.errors(include_url=False)[0]["msg"]})
+    return accepted, len(lines) - len(accepted), errors
+
+def _iter_msgpack(body: bytes) -> Iterator[Any]:
+    unpacker = msgpack.Unpacker(raw=False)
+    unpacker.feed(body)
+    try:
+        for obj in unpacker:
+            # Either a stream of objects or a single array of them
+            if isinstance(obj, list):
+                yield from obj
+            else:
+                yield obj
+    except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as e:
+        raise MalformedPayload(f"Invalid msgpack body: {e}")
+
+def _validate_objects(objects: Iterator[Any], model: Type[BaseModel]) -> Tuple[List[BaseModel], int, List[dict]]:
+    accepted, errors = [], []
+    rejected = 0
+    for index, obj in enumerate(objects):
+        try:
+            accepted.append(model.model_validate(obj))
+        except ValidationError as e:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"index": index, "error": e.errors(include_url=False)[0]["msg"]})
+    return accepted, rejected, errors
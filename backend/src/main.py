@@ -1,9 +1,53 @@
-from fastapi import FastAPI, BackgroundTasks
+import asyncio
+import contextlib
+import time
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List
-from .schemas import TelemetryEvent, DecisionLog
+from typing import List, Optional, Type
+from pydantic import BaseModel
+from .schemas import TelemetryEvent, DecisionLog, StoredDecision, BatchAck
+from .ingest import parse_batch, decompress, UnsupportedPayload, MalformedPayload, PayloadTooLarge
+from .storage import TelemetryStore
+from .aggregates import DashboardAggregates
+from .stream import DecisionBroadcaster
+from .core.config import settings
 
-app = FastAPI(title="FlowGuard Telemetry Server")
+store = TelemetryStore(
+    settings.STORAGE_PATH,
+    recent_capacity=settings.RECENT_CAPACITY,
+    flush_interval_s=settings.FLUSH_INTERVAL_S,
+    flush_batch=settings.FLUSH_BATCH,
+    retention_s=settings.RETENTION_S,
+    compact_interval_s=settings.COMPACT_INTERVAL_S,
+)
+aggregates = DashboardAggregates(window_s=settings.AGGREGATE_WINDOW_S, max_windows=settings.AGGREGATE_MAX_WINDOWS)
+broadcaster = DecisionBroadcaster(queue_size=settings.STREAM_QUEUE_SIZE)
+
+def _record_decisions(batch: List[DecisionLog]):
+    received_at = time.time()
+    store.add_decisions(batch, received_at=received_at)
+    aggregates.record(batch, received_at)
+    broadcaster.publish(batch, received_at)
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    store.open()
+    tasks = [
+        asyncio.create_task(store.run()),
+        asyncio.create_task(broadcaster.run_deltas(aggregates, settings.STREAM_DELTA_INTERVAL_S)),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        store.close()
+
+app = FastAPI(title="FlowGuard Telemetry Server", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,29 +57,79 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory store for demo purposes
-event_log: List[TelemetryEvent] = []
-decisions: List[DecisionLog] = []
-
 @app.post("/api/v1/telemetry/event")
 async def ingest_event(event: TelemetryEvent):
-    event_log.append(event)
-    return {"status": "received", "count": len(event_log)}
+    store.add_events([event])
+    return {"status": "received", "count": store.total_events}
 
 @app.post("/api/v1/telemetry/decision")
 async def ingest_decision(decision: DecisionLog):
-    decisions.append(decision)
-    # in a real app, write to DB or TimescaleDB here
-    return {"status": "logged", "total_decisions": len(decisions)}
+    _record_decisions([decision])
+    return {"status": "logged", "total_decisions": store.total_decisions}
+
+async def _read_batch(request: Request, model: Type[BaseModel]):
+    """Decompresses and bulk-parses an NDJSON/msgpack batch body."""
+    body = await request.body()
+    try:
+        raw = decompress(body, request.headers.get("content-encoding"), max_bytes=settings.MAX_DECOMPRESSED_BYTES)
+        return parse_batch(raw, request.headers.get("content-type"), model)
+    except UnsupportedPayload as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except PayloadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except MalformedPayload as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/v1/telemetry/events:batch", response_model=BatchAck)
+async def ingest_events_batch(request: Request):
+    accepted, rejected, errors = await _read_batch(request, TelemetryEvent)
+    store.add_events(accepted)
+    return BatchAck(accepted=len(accepted), rejected=rejected, errors=errors, total=store.total_events)
+
+@app.post("/api/v1/telemetry/decisions:batch", response_model=BatchAck)
+async def ingest_decisions_batch(request: Request):
+    accepted, rejected, errors = await _read_batch(request, DecisionLog)
+    _record_decisions(accepted)
+    return BatchAck(accepted=len(accepted), rejected=rejected, errors=errors, total=store.total_decisions)
+
+@app.get("/api/v1/telemetry/decisions", response_model=List[StoredDecision])
+def query_decisions(start: Optional[float] = None, end: Optional[float] = None,
+                    decision: Optional[str] = None, limit: int = 1000):
+    # Sync handler on purpose: FastAPI runs it in the threadpool so SQLite reads don't block ingest
+    return store.query_decisions(start=start, end=end, decision=decision, limit=min(limit, 10000))
+
+@app.get("/api/v1/telemetry/stream")
+async def stream_decisions(request: Request, decision: Optional[List[str]] = Query(None),
+                           rule_id: Optional[List[str]] = Query(None)):
+    """Server-Sent Events: `decision` events for matching decisions, `aggregates` deltas for everyone."""
+    sub = broadcaster.subscribe(decisions=decision, rule_ids=rule_id)
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(sub.queue.get(), timeout=settings.STREAM_KEEPALIVE_S)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            broadcaster.unsubscribe(sub)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.get("/api/v1/dashboard/summary")
 async def get_dashboard_summary():
     return {
-        "total_events": len(event_log),
-        "total_decisions": len(decisions),
-        "recent_decisions": decisions[-5:]
+        "total_events": store.total_events,
+        "total_decisions": store.total_decisions,
+        "recent_decisions": store.recent_decisions(5),
+        "aggregates": aggregates.summary()
     }
 
+@app.get("/api/v1/dashboard/windows")
+async def get_dashboard_windows():
+    return {"window_s": aggregates.window_s, "windows": aggregates.window_summaries()}
+
 @app.get("/health")
 async def health():
     return {"status": "online", "role": "telemetry-aggregator"}
@@ -17,3 +17,13 @@ class DecisionLog(BaseModel):
     violations: List[ViolationLog]
     original_action_id: str
     processing_time_ms: float
+
+class StoredDecision(DecisionLog):
+    received_at: float
+
+class BatchAck(BaseModel):
+    status: str = "received"
+    accepted: int
+    rejected: int
+    errors: List[Dict[str, Any]] = []
+    total: int
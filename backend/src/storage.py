@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from .schemas import TelemetryEvent, DecisionLog, StoredDecision
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    id INTEGER PRIMARY KEY,
+    received_at REAL NOT NULL,
+    decision TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_received_at ON decisions (received_at);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    received_at REAL NOT NULL,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_received_at ON events (received_at);
+"""
+
+class TelemetryStore:
+    """
+    Two-tier telemetry storage.
+    Recent decisions live in a fixed-size in-memory ring; everything is also
+    queued for an append-only SQLite database (WAL mode) that a background
+    task writes in batches. History older than the retention window is
+    deleted by periodic compaction.
+    """
+
+    def __init__(self, path: str, recent_capacity: int = 1000, flush_interval_s: float = 0.5,
+                 flush_batch: int = 500, retention_s: Optional[float] = None, compact_interval_s: float = 3600.0):
+        self.path = path
+        self.flush_interval_s = flush_interval_s
+        self.flush_batch = flush_batch
+        self.retention_s = retention_s
+        self.compact_interval_s = compact_interval_s
+
+        self.recent: Deque[Tuple[float, DecisionLog]] = deque(maxlen=recent_capacity)
+        self._pending_decisions: List[Tuple[float, DecisionLog]] = []
+        self._pending_events: List[Tuple[float, TelemetryEvent]] = []
+        # Ingest appends from the event loop while flush() runs on worker threads
+        self._buffer_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.total_decisions = 0
+        self.total_events = 0
+
+    # --- lifecycle -------------------------------------------------------
+
+    def open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Counts are kept in memory from here on, so only this query scans the tables
+        self.total_decisions = self._conn.execute("SELECT COUNT(*) FROM decisions").fetchone()[0]
+        self.total_events = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        rows = self._conn.execute(
+            "SELECT received_at, payload FROM decisions ORDER BY id DESC LIMIT ?", (self.recent.maxlen,)
+        ).fetchall()
+        self.recent.clear()
+        for received_at, payload in reversed(rows):
+            self.recent.append((received_at, DecisionLog.model_validate_json(payload)))
+
+    def close(self):
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    async def run(self):
+        """Background writer: flushes pending rows in batches and compacts periodically."""
+        self._wakeup = asyncio.Event()
+        last_compaction = time.time()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                # flush() requeued the batch; try again on the next tick rather than dying
+                logger.exception("Telemetry flush failed; %d rows kept for retry", self.pending_count)
+                continue
+
+            if self.retention_s is not None and time.time() - last_compaction >= self.compact_interval_s:
+                try:
+                    await asyncio.to_thread(self.compact)
+                except Exception:
+                    logger.exception("Telemetry compaction failed")
+                last_compaction = time.time()
+
+    # --- ingest ----------------------------------------------------------
+
+    def add_decisions(self, decisions: List[DecisionLog], received_at: Optional[float] = None):
+        received_at = time.time() if received_at is None else received_at
+        rows = [(received_at, d) for d in decisions]
+        self.recent.extend(rows)
+        with self._buffer_lock:
+            self._pending_decisions.extend(rows)
+        self.total_decisions += len(rows)
+        self._maybe_wake()
+
+    def add_events(self, events: List[TelemetryEvent], received_at: Optional[float] = None):
+        received_at = time.time() if received_at is None else received_at
+        with self._buffer_lock:
+            self._pending_events.extend((received_at, e) for e in events)
+        self.total_events += len(events)
+        self._maybe_wake()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending_decisions) + len(self._pending_events)
+
+    def _maybe_wake(self):
+        if self._wakeup is not None and self.pending_count >= self.flush_batch:
+            self._wakeup.set()
+
+    def flush(self):
+        """
+        Writes all pending rows in one transaction. On failure the rows go back
+        to the front of the queue and the error is re-raised.
+        """
+        # Held across swap and write, so a flush from a query waits for one already
+        # in flight instead of reading before those rows land
+        with self._db_lock:
+            # Swap the buffers first so ingest can keep appending while we write
+            with self._buffer_lock:
+                decisions, self._pending_decisions = self._pending_decisions, []
+                events, self._pending_events = self._pending_events, []
+            if not decisions and not events:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO decisions (received_at, decision, payload) VALUES (?, ?, ?)",
+                        [(t, d.decision, d.model_dump_json()) for t, d in decisions]
+                    )
+                    self._conn.executemany(
+                        "INSERT INTO events (received_at, type, payload) VALUES (?, ?, ?)",
+                        [(t, e.type, e.model_dump_json()) for t, e in events]
+                    )
+            except Exception:
+                with self._buffer_lock:
+                    self._pending_decisions[:0] = decisions
+                    self._pending_events[:0] = events
+                raise
+
+    # --- queries ---------------------------------------------------------
+
+    def recent_decisions(self, n: int) -> List[DecisionLog]:
+        if n <= 0:
+            return []
+        return [d for _, d in list(self.recent)[-n:]]
+
+    def query_decisions(self, start: Optional[float] = None, end: Optional[float] = None,
+                        decision: Optional[str] = None, limit: int = 1000) -> List[StoredDecision]:
+        """Decisions received in [start, end), oldest first."""
+        self.flush()
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("received_at >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("received_at < ?")
+            params.append(end)
+        if decision is not None:
+            clauses.append("decision = ?")
+            params.append(decision)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT received_at, payload FROM decisions {where} ORDER BY received_at, id LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [
+            StoredDecision(received_at=received_at, **DecisionLog.model_validate_json(payload).model_dump())
+            for received_at, payload in rows
+        ]
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Deletes rows older than the retention window and truncates the WAL. Returns rows removed."""
+        if self.retention_s is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.retention_s
+        with self._db_lock:
+            with self._conn:
+                removed = self._conn.execute("DELETE FROM decisions WHERE received_at < ?", (cutoff,)).rowcount
+                removed_events = self._conn.execute("DELETE FROM events WHERE received_at < ?", (cutoff,)).rowcount
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.total_decisions -= removed
+        self.total_events -= removed_events
+        return removed + removed_events
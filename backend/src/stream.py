@@ -0,0 +1,97 @@
+import asyncio
+import json
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from .schemas import DecisionLog
+from .aggregates import DashboardAggregates
+
+def sse_message(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+class Subscription:
+    """
+    One live-stream client.
+    The queue is bounded: when a slow client falls behind, its oldest pending
+    messages are dropped so ingest never waits on it.
+    """
+
+    def __init__(self, decisions: Optional[Iterable[str]] = None, rule_ids: Optional[Iterable[str]] = None,
+                 maxsize: int = 256):
+        self.decisions: Optional[Set[str]] = set(decisions) if decisions else None
+        self.rule_ids: Optional[Set[str]] = set(rule_ids) if rule_ids else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def matches(self, decision: DecisionLog) -> bool:
+        if self.decisions is not None and decision.decision not in self.decisions:
+            return False
+        if self.rule_ids is not None and not any(v.rule_id in self.rule_ids for v in decision.violations):
+            return False
+        return True
+
+    def offer(self, message: str):
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.queue.get_nowait()
+            self.queue.put_nowait(message)
+            self.dropped += 1
+
+class DecisionBroadcaster:
+    """Fans out ingested decisions and periodic aggregate deltas to live subscribers."""
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self.subscribers: List[Subscription] = []
+        self._last_counts: Counter = Counter()
+        self._last_total = 0
+
+    def subscribe(self, decisions: Optional[Iterable[str]] = None,
+                  rule_ids: Optional[Iterable[str]] = None) -> Subscription:
+        sub = Subscription(decisions, rule_ids, maxsize=self.queue_size)
+        self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        if sub in self.subscribers:
+            self.subscribers.remove(sub)
+
+    def publish(self, decisions: List[DecisionLog], received_at: float):
+        # Must be called from the event loop thread (asyncio.Queue isn't thread-safe)
+        if not self.subscribers:
+            return
+        for d in decisions:
+            message = None
+            for sub in self.subscribers:
+                if sub.matches(d):
+                    if message is None:
+                        # Encode once per decision, not once per subscriber
+                        payload = d.model_dump()
+                        payload["received_at"] = received_at
+                        message = sse_message("decision", json.dumps(payload))
+                    sub.offer(message)
+
+    def aggregate_delta(self, aggregates: DashboardAggregates) -> Dict:
+        """Changes in the running totals since the previous call, plus the current window's latency."""
+        totals = aggregates.totals
+        delta = {
+            "count": totals.count - self._last_total,
+            "decisions": {k: v - self._last_counts.get(k, 0) for k, v in totals.decisions.items()
+                          if v != self._last_counts.get(k, 0)},
+        }
+        current = aggregates.current_window()
+        delta["processing_time_ms"] = current.latency.summary() if current else None
+        self._last_counts = Counter(totals.decisions)
+        self._last_total = totals.count
+        return delta
+
+    async def run_deltas(self, aggregates: DashboardAggregates, interval_s: float):
+        while True:
+            await asyncio.sleep(interval_s)
+            delta = self.aggregate_delta(aggregates)
+            if not self.subscribers or delta["count"] == 0:
+                continue
+            message = sse_message("aggregates", json.dumps(delta))
+            for sub in self.subscribers:
+                sub.offer(message)
@@ -0,0 +1,66 @@
+"""
+CLI startup benchmark.
+
+Times `python -m invariant.cli --help` in fresh interpreters and fails if the
+median exceeds the budget or if a heavy dependency was imported eagerly.
+
+    python benchmarks/bench_startup.py --budget-ms 300
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+# Modules that must only load once a subcommand actually needs them
+HEAVY_MODULES = ("networkx", "numpy", "yaml", "torch", "requests", "rclpy", "pydantic", "matplotlib")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+def measure_startup_ms(runs: int = 5) -> float:
+    """Median wall time of `invariant --help` in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "invariant.cli", "--help"],
+                       check=True, stdout=subprocess.DEVNULL, env=_env(), cwd=REPO_ROOT)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def eagerly_imported() -> List[str]:
+    """Heavy modules present in sys.modules right after importing the CLI."""
+    probe = (
+        "import sys, invariant.cli; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True,
+                         text=True, env=_env(), cwd=REPO_ROOT).stdout.strip()
+    return [m for m in out.split(",") if m]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=300.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    eager = eagerly_imported()
+    median_ms = measure_startup_ms(args.runs)
+    print(f"invariant --help: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    if eager:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(eager)}")
+        sys.exit(1)
+    if median_ms > args.budget_ms:
+        print("FAIL: startup budget exceeded")
+        sys.exit(1)
+    print("Startup budget OK")
+
+if __name__ == "__main__":
+    main()
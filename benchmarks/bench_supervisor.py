@@ -0,0 +1,77 @@
+"""
+SafetySupervisor micro-benchmark.
+
+Reports per-call latency of evaluate() (pydantic outcome) and evaluate_fast()
+(slotted records) for approved, clamped and rejected commands, with
+telemetry disabled so only the supervisor itself is measured, then the
+per-robot cost of evaluate_batch() for a fleet.
+
+    python benchmarks/bench_supervisor.py --iterations 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from invariant.core.engine import SafetySupervisor
+from invariant.core.batch import StateBatch, ActionBatch
+from invariant.core.types import SystemState, ProposedAction, ActionType
+from invariant.telemetry.client import TelemetryBridge
+from invariant.validators.physical import PhysicalConstraintValidator
+from invariant.validators.policy import GeofenceValidator
+from invariant.validators.uncertainty import UncertaintyValidator
+
+SCENARIOS = {
+    "approved": (SystemState(pose={"x": 0.0, "y": 0.0}), {"v": 1.0, "w": 0.1}),
+    "clamped": (SystemState(pose={"x": 0.0, "y": 0.0}), {"v": 5.0, "w": 0.1}),
+    "rejected": (SystemState(pose={"x": 12.0, "y": 0.0}), {"v": 0.5, "w": 0.0}),
+}
+
+def build_supervisor() -> SafetySupervisor:
+    telemetry = TelemetryBridge()
+    telemetry.enabled = False
+    supervisor = SafetySupervisor(telemetry_bridge=telemetry)
+    supervisor.register_validator(PhysicalConstraintValidator())
+    supervisor.register_validator(GeofenceValidator())
+    supervisor.register_validator(UncertaintyValidator())
+    return supervisor
+
+def time_per_call_us(fn, state, action, iterations: int) -> float:
+    for _ in range(min(iterations, 1000)):
+        fn(state, action)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(state, action)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--fleet", type=int, default=2000)
+    args = parser.parse_args()
+
+    supervisor = build_supervisor()
+    print(f"{'scenario':<10} {'evaluate':>12} {'evaluate_fast':>14} {'speedup':>8}")
+    for name, (state, payload) in SCENARIOS.items():
+        action = ProposedAction(action_id=name, type=ActionType.VELOCITY_CMD, payload=payload)
+        slow = time_per_call_us(supervisor.evaluate, state, action, args.iterations)
+        fast = time_per_call_us(supervisor.evaluate_fast, state, action, args.iterations)
+        print(f"{name:<10} {slow:>10.2f}us {fast:>12.2f}us {slow / fast:>7.1f}x")
+
+    rng = np.random.default_rng(0)
+    states = StateBatch(x=rng.uniform(-12, 12, args.fleet), y=rng.uniform(-12, 12, args.fleet),
+                        sensor_health={"lidar": rng.random(args.fleet) > 0.05})
+    actions = ActionBatch(v=rng.uniform(-3, 3, args.fleet), w=rng.uniform(-1.5, 1.5, args.fleet))
+    rounds = max(1, args.iterations // args.fleet)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        supervisor.evaluate_batch(states, actions)
+    per_robot = (time.perf_counter() - start) / (rounds * args.fleet) * 1e6
+    print(f"evaluate_batch, fleet of {args.fleet}: {per_robot:.3f}us per robot")
+
+if __name__ == "__main__":
+    main()
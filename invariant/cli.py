@@ -1,16 +1,8 @@
 import click
 import os
-import yaml
-from .workflow.loader import WorkflowLoader
-from .execution.engine import DeterministicEngine, PerturbationModel
-from .execution.ros_runner import ROSEngine
-from .ros.bridge import ActiveBridge
-from .core.config import ExperimentConfig
-from .validation.structural import StructuralValidator
-from .validation.temporal import TemporalValidator
-from .validation.behavioral import BehavioralValidator
-from .validation.metrics import StabilityMetrics
-from .reporting.generator import ReportGenerator
+
+# Heavy dependencies (networkx, numpy, yaml, rclpy, ...) are imported inside the
+# commands that need them so `invariant --help` stays fast.
 
 @click.group()
 def main():
@@ -22,31 +14,97 @@ def main():
 @click.option('--runs', default=5, help='Number of validation runs')
 @click.option('--seed', default=42, help='Random seed')
 @click.option('--latency-max', default=20.0, help='Max injected latency (ms)')
-def validate(workflow_path, runs, seed, latency_max):
+@click.option('--archive', 'archive_path', default=None, help='Append the executed traces to this trace archive')
+@click.option('--engine', 'engine_kind', type=click.Choice(['sequential', 'event']), default='sequential',
+              help='sequential: one node at a time; event: discrete-event with parallel branches')
+@click.option('--max-workers', default=None, type=int, help='Concurrent node executions for the event engine')
+@click.option('--rng-mode', type=click.Choice(['sequential', 'counter']), default='sequential',
+              help='counter: Philox draws addressed by (run, node), identical across engines and run splits')
+@click.option('--profiles', 'profiles_path', default=None,
+              help='YAML file of per-node/per-edge perturbation profiles (overrides those in the workflow)')
+@click.option('--cache/--no-cache', 'use_cache', default=True,
+              help='Reuse the compiled workflow and results of an identical earlier run '
+                   '(same workflow content, config and engine version)')
+@click.option('--cache-dir', default=None, help='Cache location (default: INVARIANT_CACHE_DIR or ~/.cache/invariant)')
+def validate(workflow_path, runs, seed, latency_max, archive_path, engine_kind, max_workers, rng_mode, profiles_path,
+             use_cache, cache_dir):
     """Run validation pipeline on a workflow."""
+    from .workflow.loader import WorkflowLoader
+    from .execution.engine import DeterministicEngine, PerturbationModel
+    from .execution.event_engine import EventDrivenEngine
+    from .execution.archive import TraceArchiveWriter
+    from .execution.profiles import PerturbationProfiles
+    from .execution.result_cache import ResultCache, result_key
+    from .workflow.cache import graph_hash, source_hash
+    from .core.config import ExperimentConfig
+    from .validation.structural import StructuralValidator
+    from .validation.temporal import TemporalValidator
+    from .validation.behavioral import BehavioralValidator
+    from .validation.metrics import StabilityMetrics
+    from .reporting.generator import ReportGenerator
+
     if not os.path.exists(workflow_path):
         click.echo(f"Error: Workflow file not found at {workflow_path}")
         return
 
     click.echo(f"Loading workflow: {workflow_path}")
-    graph = WorkflowLoader.from_yaml(workflow_path)
-    
-    config = ExperimentConfig({"workflow": workflow_path, "runs": runs, "seed": seed})
-    engine = DeterministicEngine(graph, config)
-    
-    # Apply perturbations
-    model = PerturbationModel(latency_max_ms=latency_max, jitter_ms=5.0, seed=seed)
-    engine.set_perturbation(model)
-    
-    click.echo(f"Executing {runs} deterministic runs...")
-    traces = []
-    for _ in range(runs):
-        traces.append(engine.run())
-        
-    click.echo("Running validation passes...")
-    validators = [StructuralValidator(), TemporalValidator(), BehavioralValidator()]
-    results = [v.validate(graph, traces) for v in validators]
+    graph = WorkflowLoader.from_yaml(workflow_path, use_cache=use_cache, cache_dir=cache_dir)
     
+    jitter = 5.0
+    profiles = PerturbationProfiles.from_graph(graph)
+    profiles_hash = None
+    if profiles_path:
+        with open(profiles_path, 'rb') as f:
+            profiles_hash = source_hash(f.read())
+        profiles = profiles.merged(PerturbationProfiles.from_yaml(profiles_path))
+
+    # Everything that changes the traces goes into the config (and so its hash);
+    # the workflow by content, so the path it was reached by doesn't matter
+    workflow_hash = graph_hash(graph)
+    config = ExperimentConfig({
+        "workflow": workflow_hash, "runs": runs, "seed": seed,
+        "latency_max_ms": latency_max, "jitter_ms": jitter, "rng_mode": rng_mode,
+        "engine": engine_kind, "max_workers": max_workers if engine_kind == 'event' else None,
+        "profiles": profiles_hash
+    })
+
+    result_cache = ResultCache(cache_dir) if use_cache else None
+    cache_key = result_key(workflow_hash, config.config_hash) if use_cache else None
+    hit = result_cache.get(cache_key) if result_cache else None
+
+    if hit is not None:
+        click.echo(f"Reusing cached results [{cache_key[:12]}] for {runs} runs")
+        traces = hit.traces() if archive_path else None
+        results = hit.results
+    else:
+        if engine_kind == 'event':
+            engine = EventDrivenEngine(graph, config, max_workers=max_workers)
+        else:
+            engine = DeterministicEngine(graph, config)
+
+        # Apply perturbations
+        model = PerturbationModel(latency_max_ms=latency_max, jitter_ms=jitter, seed=seed, rng_mode=rng_mode)
+        engine.set_perturbation(model, profiles)
+
+        click.echo(f"Executing {runs} deterministic runs...")
+        if engine_kind == 'event':
+            executed = traces = [engine.run() for _ in range(runs)]
+        else:
+            executed = engine.run_batch(runs)
+            traces = executed.to_traces()
+
+        click.echo("Running validation passes...")
+        validators = [StructuralValidator(), TemporalValidator(), BehavioralValidator()]
+        results = [v.validate(graph, traces) for v in validators]
+        if result_cache:
+            result_cache.put(cache_key, executed, results, config.config_data)
+
+    if archive_path:
+        with TraceArchiveWriter(archive_path) as writer:
+            for trace in traces:
+                writer.append(trace)
+        click.echo(f"Traces archived to: {archive_path}")
+
     score = StabilityMetrics.compute_stability_score(results)
     
     click.echo(f"Stability Score: {score:.2f}")
@@ -61,11 +119,95 @@ def validate(workflow_path, runs, seed, latency_max):
         
     click.echo(f"Report generated: {report_path}")
 
+@main.command()
+@click.argument('workflow_path')
+@click.option('--runs', default=5, help='Number of validation runs per configuration')
+@click.option('--seed', 'seeds', multiple=True, type=int, default=(42,), help='Random seed (repeatable)')
+@click.option('--latency-max', 'latency_max', multiple=True, type=float, default=(20.0,), help='Max injected latency in ms (repeatable)')
+@click.option('--jitter', 'jitter', multiple=True, type=float, default=(5.0,), help='Jitter in ms (repeatable)')
+@click.option('--drop-prob', 'drop_prob', multiple=True, type=float, default=(0.0,), help='Drop probability (repeatable)')
+@click.option('--workers', default=None, type=int, help='Worker processes (default: CPU count)')
+@click.option('--archive', 'archive_path', default=None, help='Append every configuration\'s traces to this trace archive')
+@click.option('--cache/--no-cache', 'use_cache', default=True, help='Reuse the compiled workflow and skip configurations already computed for it')
+@click.option('--cache-dir', default=None, help='Cache location (default: INVARIANT_CACHE_DIR or ~/.cache/invariant)')
+def sweep(workflow_path, runs, seeds, latency_max, jitter, drop_prob, workers, archive_path, use_cache, cache_dir):
+    """Run the validation pipeline over a grid of perturbation configurations."""
+    from .workflow.loader import WorkflowLoader
+    from .execution.sweep import SweepExecutor, build_grid
+    from .execution.archive import TraceArchiveWriter
+    from .execution.result_cache import ResultCache
+
+    if not os.path.exists(workflow_path):
+        click.echo(f"Error: Workflow file not found at {workflow_path}")
+        return
+
+    click.echo(f"Loading workflow: {workflow_path}")
+    graph = WorkflowLoader.from_yaml(workflow_path, use_cache=use_cache, cache_dir=cache_dir)
+
+    points = build_grid(seeds, latency_max, jitter, drop_prob)
+    executor = SweepExecutor(graph, workflow_path, runs=runs, workers=workers, keep_traces=bool(archive_path),
+                             result_cache=ResultCache(cache_dir) if use_cache else None)
+    click.echo(f"Sweeping {len(points)} configurations x {runs} runs on {executor.workers} workers...")
+
+    writer = TraceArchiveWriter(archive_path) if archive_path else None
+    try:
+        for res in executor.iter_results(points):
+            p = res.point
+            click.echo(
+                f"[{res.config_hash[:12]}] seed={p.seed} latency_max={p.latency_max_ms} "
+                f"jitter={p.jitter_ms} drop={p.drop_probability} -> score {res.stability_score:.2f}"
+                + (" (cached)" if res.cached else "")
+            )
+            if writer:
+                writer.append_batch(res.batch)
+                writer.flush()
+    finally:
+        if writer:
+            writer.close()
+
+@main.command()
+@click.argument('archive_path')
+@click.argument('workflow_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--cache/--no-cache', 'use_cache', default=True, help='Reuse the compiled workflow')
+@click.option('--cache-dir', default=None, help='Cache location (default: INVARIANT_CACHE_DIR or ~/.cache/invariant)')
+def revalidate(archive_path, workflow_path, use_cache, cache_dir):
+    """Re-run the validators over traces stored in a trace archive."""
+    from .workflow.loader import WorkflowLoader
+    from .execution.archive import TraceArchive
+    from .validation.structural import StructuralValidator
+    from .validation.temporal import TemporalValidator
+    from .validation.behavioral import BehavioralValidator
+    from .validation.metrics import StabilityMetrics
+
+    if not os.path.exists(archive_path):
+        click.echo(f"Error: Archive not found at {archive_path}")
+        return
+
+    graph = WorkflowLoader.from_yaml(workflow_path, use_cache=use_cache, cache_dir=cache_dir)
+    with TraceArchive(archive_path) as archive:
+        click.echo(f"Archive holds {len(archive)} runs, {archive.total_signals} signals.")
+
+        # Runs sharing a run id belong to the same experiment
+        groups = {}
+        for i, run_id in enumerate(archive.run_ids):
+            groups.setdefault(run_id, []).append(i)
+
+        validators = [StructuralValidator(), TemporalValidator(), BehavioralValidator()]
+        for run_id, indices in groups.items():
+            traces = [archive.trace(i) for i in indices]
+            results = [v.validate(graph, traces) for v in validators]
+            score = StabilityMetrics.compute_stability_score(results)
+            click.echo(f"{run_id}: {len(traces)} runs -> score {score:.2f}")
+
 @main.command()
 @click.option('--duration', default=10.0, help='Monitoring duration in seconds')
 @click.option('--run-id', default='ros_run_1', help='Identifier for this run')
 def monitor(duration, run_id):
     """Monitor a running ROS 2 system."""
+    from .ros.bridge import ActiveBridge
+    from .execution.ros_runner import ROSEngine
+    from .core.config import ExperimentConfig
+
     click.echo("Connecting to ROS 2 system...")
     bridge = ActiveBridge()
     
@@ -0,0 +1,97 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .types import SystemState, ProposedAction, ActionType
+from .outcome import Decision
+
+# Integer encoding of Decision used in batch results
+DECISION_CODES = (Decision.APPROVED, Decision.MODIFIED, Decision.REJECTED, Decision.EMERGENCY_STOP)
+APPROVED, MODIFIED, REJECTED, EMERGENCY_STOP = range(4)
+
+@dataclass
+class StateBatch:
+    """Struct-of-arrays SystemState for n robots."""
+    x: np.ndarray
+    y: np.ndarray
+    vx: Optional[np.ndarray] = None
+    # sensor name -> (n,) bool; a sensor missing from the dict counts as healthy
+    sensor_health: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @classmethod
+    def from_states(cls, states: Sequence[SystemState]) -> "StateBatch":
+        sensors = sorted({name for s in states for name in s.sensor_health})
+        return cls(
+            x=np.array([s.pose.get("x", 0.0) for s in states], dtype=np.float64),
+            y=np.array([s.pose.get("y", 0.0) for s in states], dtype=np.float64),
+            vx=np.array([s.velocity.get("vx", 0.0) for s in states], dtype=np.float64),
+            sensor_health={
+                name: np.array([s.sensor_health.get(name, True) for s in states], dtype=bool)
+                for name in sensors
+            }
+        )
+
+    def state(self, i: int) -> SystemState:
+        """Materializes one robot's state (used by validators without a vectorized check)."""
+        velocity = {"vx": float(self.vx[i])} if self.vx is not None else {}
+        return SystemState(
+            pose={"x": float(self.x[i]), "y": float(self.y[i])},
+            velocity=velocity,
+            sensor_health={name: bool(arr[i]) for name, arr in self.sensor_health.items()}
+        )
+
+@dataclass
+class ActionBatch:
+    """Struct-of-arrays velocity commands for n robots."""
+    v: np.ndarray
+    w: np.ndarray
+    # (n,) bool; defaults to all velocity commands
+    is_velocity_cmd: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        if self.is_velocity_cmd is None:
+            self.is_velocity_cmd = np.ones(len(self.v), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.v)
+
+    @classmethod
+    def from_actions(cls, actions: Sequence[ProposedAction]) -> "ActionBatch":
+        return cls(
+            v=np.array([a.payload.get("v", 0.0) for a in actions], dtype=np.float64),
+            w=np.array([a.payload.get("w", 0.0) for a in actions], dtype=np.float64),
+            is_velocity_cmd=np.array([a.type == ActionType.VELOCITY_CMD for a in actions], dtype=bool)
+        )
+
+    def action(self, i: int) -> ProposedAction:
+        action_type = ActionType.VELOCITY_CMD if self.is_velocity_cmd[i] else ActionType.TASK_COMMAND
+        return ProposedAction(action_id=str(i), type=action_type, payload={"v": float(self.v[i]), "w": float(self.w[i])})
+
+@dataclass
+class BatchViolations:
+    """Per-rule violation masks from one validator over a batch."""
+    masks: Dict[str, np.ndarray] = field(default_factory=dict)
+    # rule_id -> numeric limits, mirroring Violation.context (e.g. {"max_v": 2.0})
+    limits: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+@dataclass
+class BatchOutcome:
+    """Per-robot result of SafetySupervisor.evaluate_batch."""
+    decisions: np.ndarray           # (n,) int8 codes into DECISION_CODES
+    v: np.ndarray                   # (n,) command after clamping
+    w: np.ndarray
+    violations: Dict[str, np.ndarray]
+    processing_time_ms: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self.decisions)
+
+    def decision(self, i: int) -> Decision:
+        return DECISION_CODES[self.decisions[i]]
+
+    def violated_rules(self, i: int) -> List[str]:
+        return [rule_id for rule_id, mask in self.violations.items() if mask[i]]
@@ -1,8 +1,48 @@
 import uuid
 import hashlib
+import json
 import time
 from typing import Dict, Any
 
+def json_default(obj: Any) -> Any:
+    """`default=` hook for json.dumps: NumPy scalars/arrays (duck-typed so core stays numpy-free) and sets."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def _hash_default(obj: Any) -> Any:
+    # Anything else is hashed by its repr, tagged with its type, like the old str()-based hash
+    try:
+        return json_default(obj)
+    except TypeError:
+        return {"__repr__": [f"{type(obj).__module__}.{type(obj).__qualname__}", repr(obj)]}
+
+def _tag_keys(data: Any) -> Any:
+    # json.dumps turns 1 and "1" into the same key, so dicts with any non-str
+    # key become a tagged list of [key, value] pairs instead
+    if isinstance(data, dict):
+        if all(isinstance(k, str) for k in data):
+            return {k: _tag_keys(v) for k, v in data.items()}
+        pairs = [[_tag_keys(k), _tag_keys(v)] for k, v in data.items()]
+        return {"__items__": sorted(pairs, key=lambda p: canonical_json(p[0]))}
+    if isinstance(data, (list, tuple)):
+        return [_tag_keys(v) for v in data]
+    if isinstance(data, (set, frozenset)):
+        # Sorted by encoding so mixed-type sets still have one order
+        return sorted((_tag_keys(v) for v in data), key=canonical_json)
+    return data
+
+def canonical_json(data: Any) -> str:
+    """
+    Deterministic JSON encoding for hashing: keys sorted at every level, no
+    whitespace, tuples as lists. Equal data always gives identical text,
+    whatever the dict insertion order or nesting. Not meant to be parsed back.
+    """
+    return json.dumps(_tag_keys(data), sort_keys=True, separators=(",", ":"), ensure_ascii=False,
+                      allow_nan=True, default=_hash_default)
+
 class ExperimentConfig:
     """Tracks experiment configuration and run identifiers for reproducibility."""
     
@@ -14,9 +54,7 @@ class ExperimentConfig:
 
     def _generate_hash(self, data: Dict[str, Any]) -> str:
         """Generates a stable hash of the configuration dictionary."""
-        # Sort keys for stability
-        serialized = str(sorted(data.items())).encode('utf-8')
-        return hashlib.sha256(serialized).hexdigest()
+        return hashlib.sha256(canonical_json(data).encode('utf-8')).hexdigest()
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -1,79 +1,196 @@
 import time
-from typing import List
-from .types import SystemState, ProposedAction, SafetyMode
-from .outcome import SafetyOutcome, Decision
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .types import SystemState, ProposedAction, SafetyMode, ActionType
+from .outcome import SafetyOutcome, Decision, OutcomeRecord
 from .interfaces import SafetyValidator
+from .batch import StateBatch, ActionBatch, BatchOutcome, APPROVED, MODIFIED, REJECTED
 
 from ..telemetry.client import TelemetryBridge, ConsoleTelemetryBridge
 
+class _ValidatorSlot:
+    """Per-validator bookkeeping for ordering and the exposed timing counters."""
+    __slots__ = ("validator", "check", "calls", "violations", "rejections", "total_ns")
+
+    def __init__(self, validator: SafetyValidator):
+        self.validator = validator
+        self.check = validator.check_fast
+        self.calls = 0
+        self.violations = 0
+        self.rejections = 0
+        self.total_ns = 0
+
+    def mean_cost_us(self) -> float:
+        if self.calls == 0:
+            return self.validator.estimated_cost_us
+        return self.total_ns / self.calls / 1000
+
+    def rank(self) -> Tuple[int, float]:
+        """
+        Sort key: validators that can end evaluation come first, ordered by
+        expected cost per decisive rejection (mean cost / rejection rate, with
+        a Laplace prior so unseen validators still get tried).
+        """
+        if not self.validator.can_force_rejection:
+            return (1, self.mean_cost_us())
+        rejection_rate = (self.rejections + 1) / (self.calls + 2)
+        return (0, self.mean_cost_us() / rejection_rate)
+
 class SafetySupervisor:
-    def __init__(self, telemetry_bridge: TelemetryBridge = None):
+    def __init__(self, telemetry_bridge: TelemetryBridge = None, short_circuit: bool = True,
+                 adaptive_ordering: bool = True, reorder_interval: int = 256):
         self.validators: List[SafetyValidator] = []
         self.mode = SafetyMode.NORMAL
         self.telemetry = telemetry_bridge or ConsoleTelemetryBridge()
+        # Stop at the first violation that forces REJECTED. The decision is
+        # unchanged, but the outcome then only lists violations found so far.
+        self.short_circuit = short_circuit
+        self.adaptive_ordering = adaptive_ordering
+        self.reorder_interval = reorder_interval
+        self._slots: Tuple[_ValidatorSlot, ...] = ()
+        self._evaluations = 0
 
     def register_validator(self, validator: SafetyValidator):
         self.validators.append(validator)
+        self._slots = self._slots + (_ValidatorSlot(validator),)
+        self._reorder()
+
+    def _reorder(self):
+        # sorted() is stable, so ties keep registration order
+        self._slots = tuple(sorted(self._slots, key=_ValidatorSlot.rank))
+
+    def validator_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-validator call/violation counters and measured cost, in current evaluation order."""
+        return {
+            slot.validator.name: {
+                "calls": slot.calls,
+                "violations": slot.violations,
+                "rejections": slot.rejections,
+                "total_ms": slot.total_ns / 1e6,
+                "mean_cost_us": slot.mean_cost_us()
+            }
+            for slot in self._slots
+        }
 
     def evaluate(self, state: SystemState, action: ProposedAction) -> SafetyOutcome:
-        start_time = time.time()
-        violations = []
+        """Evaluates an action and returns a pydantic SafetyOutcome (see evaluate_fast for the hot path)."""
+        return self.evaluate_fast(state, action).to_model()
+
+    def evaluate_fast(self, state: SystemState, action: ProposedAction) -> OutcomeRecord:
+        """
+        Control-loop variant of evaluate(). Returns a slotted OutcomeRecord;
+        no pydantic models are built and no strings are formatted unless a
+        consumer reads them.
+        """
+        start_time = time.perf_counter()
+        violations = None
+        clampable = action.type == ActionType.VELOCITY_CMD
+        clock = time.perf_counter_ns
 
-        # 1. Run all validators
-        for v in self.validators:
-            violation = v.check(state, action)
-            if violation:
+        # 1. Run validators, cheapest likely rejector first
+        for slot in self._slots:
+            t0 = clock()
+            violation = slot.check(state, action)
+            slot.total_ns += clock() - t0
+            slot.calls += 1
+            if violation is not None:
+                slot.violations += 1
+                if violations is None:
+                    violations = []
                 violations.append(violation)
+                if not (clampable and violation.rule_id.startswith("PHYS")):
+                    # Nothing later can turn this back into APPROVED or MODIFIED
+                    slot.rejections += 1
+                    if self.short_circuit:
+                        break
+
+        self._evaluations += 1
+        if self.adaptive_ordering and self._evaluations % self.reorder_interval == 0:
+            self._reorder()
 
         # 2. Determine Decision
-        decision = Decision.APPROVED
-        reason = "Safe"
-        
-        if violations:
-            # 3. Attempt Intervention (Clamping)
-            if action.type == "velocity_cmd" and all(v.rule_id.startswith("PHYS") for v in violations):
-                # Simple Logic: If only Physical violations, try to clamp
-                # In a real system, we'd iterate through specialized Modifiers
-                # Here we just hardcode a 'safe' clamp for the demo
-                modified_payload = action.payload.copy()
-                
-                # Check for specific violations
-                for v in violations:
-                     if "exceeds limit" in v.description:
-                         # Extraction logic would be more robust in prod
-                         # context={"current_v": v, "max_v": self.max_v}
-                         if "max_v" in v.context:
-                             modified_payload["v"] = v.context["max_v"]
-                         if "max_w" in v.context:
-                             modified_payload["w"] = v.context["max_w"]
-
-                decision = Decision.MODIFIED
-                reason = "Action Clamped to Limits"
-                return SafetyOutcome(
-                    decision=decision,
-                    modified_action=ProposedAction(
-                        action_id=action.action_id,
-                        type=action.type,
-                        payload=modified_payload,
-                        source="FlowGuardModifier"
-                    ),
-                    violations=violations,
-                    reason=reason,
-                    processing_time_ms=(time.time() - start_time) * 1000
-                )
-            
-            # Default to REJECT if we can't safely modify
-            decision = Decision.REJECTED
-            reason = f"Blocked by {len(violations)} checks"
-
-        result = SafetyOutcome(
-            decision=decision,
-            violations=violations,
-            reason=reason,
-            processing_time_ms=(time.time() - start_time) * 1000
-        )
-        
+        if violations is None:
+            result = OutcomeRecord(Decision.APPROVED, processing_time_ms=(time.perf_counter() - start_time) * 1000)
+            self.telemetry.log_decision(state, action, result)
+            return result
+
+        # 3. Attempt Intervention (Clamping)
+        if clampable and all(v.rule_id.startswith("PHYS") for v in violations):
+            # Simple Logic: If only Physical violations, try to clamp
+            # In a real system, we'd iterate through specialized Modifiers
+            # Here we just hardcode a 'safe' clamp for the demo
+            modified_payload = action.payload.copy()
+            for v in violations:
+                # Limit violations carry the limit in their context,
+                # e.g. context={"current_v": v, "max_v": self.max_v}
+                if "max_v" in v.context:
+                    modified_payload["v"] = v.context["max_v"]
+                if "max_w" in v.context:
+                    modified_payload["w"] = v.context["max_w"]
+
+            return OutcomeRecord(
+                Decision.MODIFIED,
+                violations,
+                (time.perf_counter() - start_time) * 1000,
+                action=action,
+                modified_payload=modified_payload
+            )
+
+        # Default to REJECT if we can't safely modify
+        result = OutcomeRecord(Decision.REJECTED, violations, (time.perf_counter() - start_time) * 1000)
+
         # Log to telemetry
         self.telemetry.log_decision(state, action, result)
-        
+
         return result
+
+    def evaluate_batch(self, states: StateBatch, actions: ActionBatch) -> BatchOutcome:
+        """
+        Evaluates one command per robot for a whole fleet using the validators'
+        vectorized check_batch(). Decisions and clamping follow evaluate() row
+        for row. Per-robot telemetry is not emitted on this path.
+        """
+        start_time = time.perf_counter()
+        n = len(states)
+        if len(actions) != n:
+            raise ValueError(f"State batch has {n} robots but action batch has {len(actions)}")
+
+        violations = {}
+        limits = {}
+        for validator in self.validators:
+            result = validator.check_batch(states, actions)
+            for rule_id, mask in result.masks.items():
+                violations[rule_id] = violations[rule_id] | mask if rule_id in violations else mask
+            limits.update(result.limits)
+
+        any_violation = np.zeros(n, dtype=bool)
+        non_physical = np.zeros(n, dtype=bool)
+        for rule_id, mask in violations.items():
+            any_violation |= mask
+            if not rule_id.startswith("PHYS"):
+                non_physical |= mask
+
+        # Only-physical violations on velocity commands get clamped, everything else is rejected
+        modified = any_violation & ~non_physical & actions.is_velocity_cmd
+        decisions = np.full(n, APPROVED, dtype=np.int8)
+        decisions[any_violation] = REJECTED
+        decisions[modified] = MODIFIED
+
+        v = actions.v.copy()
+        w = actions.w.copy()
+        for rule_id, rule_limits in limits.items():
+            clamp_rows = modified & violations[rule_id]
+            if "max_v" in rule_limits:
+                v[clamp_rows] = rule_limits["max_v"]
+            if "max_w" in rule_limits:
+                w[clamp_rows] = rule_limits["max_w"]
+
+        return BatchOutcome(
+            decisions=decisions,
+            v=v,
+            w=w,
+            violations=violations,
+            processing_time_ms=(time.perf_counter() - start_time) * 1000
+        )
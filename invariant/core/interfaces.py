@@ -1,12 +1,23 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
+
+import numpy as np
+
 from .types import SystemState, ProposedAction
-from .outcome import Violation
+from .outcome import Violation, ViolationRecord
+from .batch import StateBatch, ActionBatch, BatchViolations
 
 class SafetyValidator(ABC):
     """
     Interface for any safety check module (Constraint or Policy).
     """
+
+    # Rough per-call cost, used to order validators until real timings exist
+    estimated_cost_us: float = 1.0
+    # Whether a violation from this validator can decide REJECTED on its own.
+    # Validators whose violations are always clampable should set this False
+    # so the supervisor runs them after the ones that can end evaluation early.
+    can_force_rejection: bool = True
     
     @property
     @abstractmethod
@@ -22,6 +33,32 @@ class SafetyValidator(ABC):
         """
         pass
 
+    def check_fast(self, state: SystemState, action: ProposedAction) -> Optional[ViolationRecord]:
+        """
+        Hot-path variant of check() returning a ViolationRecord.
+        Override to avoid building pydantic models; the default wraps check().
+        """
+        violation = self.check(state, action)
+        return ViolationRecord.from_model(violation) if violation is not None else None
+
+    def check_batch(self, states: StateBatch, actions: ActionBatch) -> BatchViolations:
+        """
+        Vectorized check over a fleet. The default materializes each robot and
+        calls check_fast(), so override it for anything on a fleet-sized path.
+        """
+        result = BatchViolations()
+        for i in range(len(states)):
+            violation = self.check_fast(states.state(i), actions.action(i))
+            if violation is None:
+                continue
+            if violation.rule_id not in result.masks:
+                result.masks[violation.rule_id] = np.zeros(len(states), dtype=bool)
+                result.limits[violation.rule_id] = {
+                    k: v for k, v in violation.context.items() if isinstance(v, (int, float))
+                }
+            result.masks[violation.rule_id][i] = True
+        return result
+
 class ComponentInterface(ABC):
     """
     Base for larger subsystems found in robotic stacks if needed.
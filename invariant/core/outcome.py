@@ -30,3 +30,90 @@ class SafetyOutcome(BaseModel):
     
     def is_safe(self) -> bool:
         return self.decision == Decision.APPROVED
+
+# --- Hot-path records -------------------------------------------------------
+# The supervisor runs at control rate, so internally it passes around these
+# slotted records instead of pydantic models. Descriptions and reasons are
+# only formatted when read, and models are built only at the telemetry/API
+# boundary via to_model().
+
+class ViolationRecord:
+    """Lightweight Violation; the description is formatted on first access."""
+    __slots__ = ("rule_id", "severity", "context", "_template", "_args", "_description")
+
+    def __init__(self, rule_id: str, severity: str, template: str, args: tuple = (), context: Optional[Dict[str, Any]] = None):
+        self.rule_id = rule_id
+        self.severity = severity
+        self.context = context if context is not None else {}
+        self._template = template
+        self._args = args
+        self._description: Optional[str] = None
+
+    @property
+    def description(self) -> str:
+        if self._description is None:
+            self._description = self._template.format(*self._args)
+        return self._description
+
+    @classmethod
+    def from_model(cls, violation: Violation) -> "ViolationRecord":
+        record = cls(violation.rule_id, violation.severity, "", context=violation.context)
+        record._description = violation.description
+        return record
+
+    def to_model(self) -> Violation:
+        return Violation(
+            rule_id=self.rule_id,
+            description=self.description,
+            severity=self.severity,
+            context=self.context
+        )
+
+_NO_VIOLATIONS: tuple = ()
+
+class OutcomeRecord:
+    """Lightweight SafetyOutcome produced by SafetySupervisor.evaluate_fast."""
+    __slots__ = ("decision", "violations", "processing_time_ms", "action", "modified_payload", "_reason")
+
+    def __init__(self, decision: Decision, violations=_NO_VIOLATIONS, processing_time_ms: float = 0.0,
+                 action: Optional[ProposedAction] = None, modified_payload: Optional[Dict[str, Any]] = None):
+        self.decision = decision
+        self.violations = violations
+        self.processing_time_ms = processing_time_ms
+        self.action = action
+        self.modified_payload = modified_payload
+        self._reason: Optional[str] = None
+
+    @property
+    def reason(self) -> str:
+        if self._reason is None:
+            if self.decision == Decision.MODIFIED:
+                self._reason = "Action Clamped to Limits"
+            elif self.violations:
+                self._reason = f"Blocked by {len(self.violations)} checks"
+            else:
+                self._reason = "Safe"
+        return self._reason
+
+    @property
+    def modified_action(self) -> Optional[ProposedAction]:
+        if self.modified_payload is None:
+            return None
+        return ProposedAction(
+            action_id=self.action.action_id,
+            type=self.action.type,
+            payload=self.modified_payload,
+            source="FlowGuardModifier"
+        )
+
+    def is_safe(self) -> bool:
+        return self.decision == Decision.APPROVED
+
+    def to_model(self) -> SafetyOutcome:
+        return SafetyOutcome(
+            decision=self.decision,
+            modified_action=self.modified_action,
+            violations=[v.to_model() for v in self.violations],
+            reason=self.reason,
+            processing_time_ms=self.processing_time_ms
+        )
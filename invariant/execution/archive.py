@@ -0,0 +1,281 @@
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .signals import WorkflowExecutionTrace, TraceBatch, FLAG_STARVED
+
+# File layout (all little-endian, every block 8-byte aligned):
+#
+#   header  : magic "INVTRACE", u32 version, u32 reserved
+#   block*  : tag (4 bytes), u32 count, u64 payload length, payload
+#
+#   "STRS" block: `count` new entries of the node-id string table, each
+#                 u32 id length, u32 type length, id bytes, type bytes
+#   "RUN " block: one run; u32 run-id length, u32 reserved, f64 timestamp,
+#                 run-id bytes (padded), then `count` fixed-width signal records
+#                 (flags carry FLAG_* drop bits; starved nodes get a record with
+#                 FLAG_STARVED and NaN times)
+#
+# Blocks are only ever appended, so an archive can be extended across
+# processes and a torn write at the tail is simply ignored on read.
+
+MAGIC = b"INVTRACE"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sII")
+_BLOCK = struct.Struct("<4sIQ")
+_STRING_ENTRY = struct.Struct("<II")
+_RUN_HEADER = struct.Struct("<IId")
+
+TAG_STRINGS = b"STRS"
+TAG_RUN = b"RUN "
+
+RECORD_DTYPE = np.dtype([
+    ("node", "<i4"),
+    ("flags", "<u4"),
+    ("start", "<f8"),
+    ("end", "<f8"),
+])
+
+def _pad(length: int) -> int:
+    return (-length) % 8
+
+class TraceArchiveWriter:
+    """Appends traces to a binary archive, interning node ids into a shared string table."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._node_lookup: Dict[str, int] = {}
+        # Last table remapped, its length then, and the remap. Holding the table
+        # itself keeps its id from being reused; traces of a batch share one table.
+        self._remap_cache: Optional[Tuple[List[str], int, np.ndarray]] = None
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            # Resume: reuse the existing string table so indices stay valid
+            with TraceArchive(path) as existing:
+                self._node_lookup = {node_id: i for i, node_id in enumerate(existing.node_table)}
+                valid_end = existing.valid_end
+            self._file = open(path, "r+b")
+            self._file.truncate(valid_end)
+            self._file.seek(valid_end)
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_HEADER.pack(MAGIC, VERSION, 0))
+
+    def __enter__(self) -> "TraceArchiveWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write_block(self, tag: bytes, count: int, payload: bytes):
+        padding = _pad(len(payload))
+        self._file.write(_BLOCK.pack(tag, count, len(payload) + padding))
+        self._file.write(payload)
+        self._file.write(b"\0" * padding)
+
+    def _remap(self, node_table: List[str], node_types: List[Optional[str]]) -> np.ndarray:
+        """Maps a trace's local node table onto archive indices, writing new strings first."""
+        cached = self._remap_cache
+        if cached is not None and cached[0] is node_table and cached[1] == len(node_table):
+            return cached[2]
+
+        remap = np.empty(len(node_table), dtype=np.int32)
+        new_entries = []
+        for i, node_id in enumerate(node_table):
+            idx = self._node_lookup.get(node_id)
+            if idx is None:
+                idx = len(self._node_lookup)
+                self._node_lookup[node_id] = idx
+                encoded_id = node_id.encode("utf-8")
+                encoded_type = (node_types[i] or "").encode("utf-8") if i < len(node_types) else b""
+                new_entries.append(_STRING_ENTRY.pack(len(encoded_id), len(encoded_type)) + encoded_id + encoded_type)
+            remap[i] = idx
+        if new_entries:
+            self._write_block(TAG_STRINGS, len(new_entries), b"".join(new_entries))
+
+        self._remap_cache = (node_table, len(node_table), remap)
+        return remap
+
+    def _write_run(self, run_id: str, timestamp: float, node_index: np.ndarray,
+                   start_times: np.ndarray, end_times: np.ndarray, flags: Optional[np.ndarray] = None):
+        records = np.empty(len(node_index), dtype=RECORD_DTYPE)
+        records["node"] = node_index
+        records["flags"] = 0 if flags is None else flags
+        records["start"] = start_times
+        records["end"] = end_times
+
+        encoded_id = run_id.encode("utf-8")
+        header = _RUN_HEADER.pack(len(encoded_id), 0, timestamp) + encoded_id
+        header += b"\0" * _pad(len(header))
+        self._write_block(TAG_RUN, len(records), header + records.tobytes())
+
+    def append(self, trace: WorkflowExecutionTrace):
+        remap = self._remap(trace.node_table, trace.node_types)
+        if not trace.has_drops:
+            self._write_run(trace.run_id, trace.timestamp, remap[trace.node_index], trace.start_times, trace.end_times)
+            return
+        starved = trace.starved_index
+        missing = np.full(len(starved), np.nan)
+        self._write_run(
+            trace.run_id, trace.timestamp,
+            np.concatenate((remap[trace.node_index], remap[starved])),
+            np.concatenate((trace.start_times, missing)),
+            np.concatenate((trace.end_times, missing)),
+            np.concatenate((trace.flags, np.full(len(starved), FLAG_STARVED, dtype=np.uint32)))
+        )
+
+    def append_batch(self, batch: TraceBatch):
+        remap = self._remap(batch.node_ids, batch.node_types)
+        for i in range(batch.n_runs):
+            flags = None if batch.flags is None else batch.flags[i]
+            self._write_run(batch.run_id, batch.timestamp, remap, batch.start_times[i], batch.end_times[i], flags)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+class TraceArchive:
+    """Read-only, memory-mapped view of a trace archive. Signal columns are zero-copy NumPy views."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an Invariant trace archive")
+        if version != VERSION:
+            raise ValueError(f"Unsupported trace archive version {version} in {path}")
+
+        self.node_table: List[str] = []
+        self.node_types: List[Optional[str]] = []
+        self.run_ids: List[str] = []
+        offsets, counts, timestamps = [], [], []
+
+        pos = _HEADER.size
+        size = len(self._mm)
+        while pos + _BLOCK.size <= size:
+            tag, count, length = _BLOCK.unpack_from(self._mm, pos)
+            payload = pos + _BLOCK.size
+            if payload + length > size:
+                break # torn tail write
+            if tag == TAG_STRINGS:
+                self._read_strings(payload, count)
+            elif tag == TAG_RUN:
+                id_len, _, timestamp = _RUN_HEADER.unpack_from(self._mm, payload)
+                id_start = payload + _RUN_HEADER.size
+                self.run_ids.append(self._mm[id_start:id_start + id_len].decode("utf-8"))
+                offsets.append(id_start + id_len + _pad(_RUN_HEADER.size + id_len))
+                counts.append(count)
+                timestamps.append(timestamp)
+            else:
+                raise ValueError(f"Corrupt trace archive {path}: unknown block {tag!r} at offset {pos}")
+            pos = payload + length
+
+        # Per-run index
+        self.valid_end = pos
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.counts = np.array(counts, dtype=np.int64)
+        self.timestamps = np.array(timestamps, dtype=np.float64)
+
+    def _read_strings(self, pos: int, count: int):
+        for _ in range(count):
+            id_len, type_len = _STRING_ENTRY.unpack_from(self._mm, pos)
+            pos += _STRING_ENTRY.size
+            self.node_table.append(self._mm[pos:pos + id_len].decode("utf-8"))
+            pos += id_len
+            node_type = self._mm[pos:pos + type_len].decode("utf-8")
+            self.node_types.append(node_type or None)
+            pos += type_len
+
+    def __enter__(self) -> "TraceArchive":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.run_ids)
+
+    @property
+    def total_signals(self) -> int:
+        return int(self.counts.sum())
+
+    def records(self, run_index: int) -> np.ndarray:
+        """Raw structured records of one run, mapped straight from the file."""
+        return np.frombuffer(self._mm, dtype=RECORD_DTYPE, count=int(self.counts[run_index]),
+                             offset=int(self.offsets[run_index]))
+
+    def trace(self, run_index: int) -> WorkflowExecutionTrace:
+        records = self.records(run_index)
+        flags = records["flags"]
+        if flags.any():
+            # Runs with drops: split off starved records (copies; drop-free runs stay zero-copy)
+            ran = (flags & FLAG_STARVED) == 0
+            return WorkflowExecutionTrace.from_arrays(
+                run_id=self.run_ids[run_index],
+                timestamp=float(self.timestamps[run_index]),
+                node_table=self.node_table,
+                node_index=records["node"][ran],
+                start_times=records["start"][ran],
+                end_times=records["end"][ran],
+                node_types=self.node_types,
+                flags=flags[ran],
+                starved=records["node"][~ran]
+            )
+        return WorkflowExecutionTrace.from_arrays(
+            run_id=self.run_ids[run_index],
+            timestamp=float(self.timestamps[run_index]),
+            node_table=self.node_table,
+            node_index=records["node"],
+            start_times=records["start"],
+            end_times=records["end"],
+            node_types=self.node_types
+        )
+
+    def to_batch(self, run_indices: Optional[List[int]] = None) -> TraceBatch:
+        """
+        Reassembles runs written by append_batch() back into a TraceBatch.
+        Raises ValueError if the runs don't all cover the same nodes in the same order.
+        """
+        indices = list(range(len(self))) if run_indices is None else list(run_indices)
+        if not indices:
+            raise ValueError("No runs to assemble into a batch")
+        rows = [self.records(i) for i in indices]
+        nodes = rows[0]["node"]
+        if any(len(r) != len(nodes) or not np.array_equal(r["node"], nodes) for r in rows):
+            raise ValueError("Runs don't share one node layout; read them with trace() instead")
+        records = np.stack(rows)
+        flags = records["flags"]
+        return TraceBatch(
+            run_id=self.run_ids[indices[0]],
+            timestamp=float(self.timestamps[indices[0]]),
+            node_ids=[self.node_table[i] for i in nodes.tolist()],
+            node_types=[self.node_types[i] for i in nodes.tolist()],
+            start_times=records["start"],
+            end_times=records["end"],
+            flags=flags if flags.any() else None
+        )
+
+    def __iter__(self) -> Iterator[WorkflowExecutionTrace]:
+        for i in range(len(self)):
+            yield self.trace(i)
+
+    def runs_for(self, run_id: str) -> List[int]:
+        return [i for i, rid in enumerate(self.run_ids) if rid == run_id]
+
+    def close(self):
+        # Views handed out keep the buffer alive; only close when nothing references it
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+        self._file.close()
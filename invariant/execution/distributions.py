@@ -0,0 +1,211 @@
+import math
+from abc import ABC, abstractmethod
+from statistics import NormalDist
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Inverse-CDF lookup grid: dense and uniform through the body, log-spaced into
+# both tails so heavy-tailed distributions keep their extremes. Anything beyond
+# 1e-9 from either end is clamped to the table's last entry.
+_BODY = np.linspace(1e-3, 1 - 1e-3, 4096)
+_TAIL = np.logspace(-9, -3, 64, endpoint=False)
+U_GRID = np.concatenate((_TAIL, _BODY, 1 - _TAIL[::-1]))
+_BODY_START = len(_TAIL)
+_BODY_STEP = _BODY[1] - _BODY[0]
+
+_STANDARD_NORMAL = NormalDist()
+
+class LatencyDistribution(ABC):
+    """
+    Latency distribution in milliseconds, sampled from uniforms by inverse CDF.
+    Subclasses give an exact scalar ppf(); sample() interpolates a table of it
+    built once on first use, so batched sampling is a single np.interp call
+    whatever the distribution.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def ppf(self, u: float) -> float:
+        pass
+
+    @property
+    def table(self) -> np.ndarray:
+        table = self.__dict__.get("_table")
+        if table is None:
+            table = np.array([self.ppf(float(u)) for u in U_GRID])
+            self.__dict__["_table"] = table
+        return table
+
+    def sample(self, u: np.ndarray) -> np.ndarray:
+        # The body of the grid is evenly spaced, so most cells find their slot
+        # arithmetically; only the few tail cells pay for np.interp's search.
+        u = np.asarray(u, dtype=np.float64)
+        table = self.table
+        pos = (u - _BODY[0]) * (1.0 / _BODY_STEP)
+        in_body = (pos >= 0) & (pos < len(_BODY) - 1)
+        i = np.where(in_body, pos, 0).astype(np.int64)
+        frac = np.where(in_body, pos, 0) - i
+        lo = table[_BODY_START + i]
+        out = lo + (table[_BODY_START + i + 1] - lo) * frac
+        tails = ~in_body
+        if tails.any():
+            out[tails] = np.interp(u[tails], U_GRID, table)
+        return out
+
+class Constant(LatencyDistribution):
+    name = "constant"
+
+    def __init__(self, value_ms: float):
+        self.value_ms = value_ms
+
+    def ppf(self, u: float) -> float:
+        return self.value_ms
+
+    def sample(self, u: np.ndarray) -> np.ndarray:
+        return np.full(np.shape(u), float(self.value_ms))
+
+class Uniform(LatencyDistribution):
+    name = "uniform"
+
+    def __init__(self, low_ms: float = 0.0, high_ms: float = 0.0):
+        self.low_ms = low_ms
+        self.high_ms = high_ms
+
+    def ppf(self, u: float) -> float:
+        return self.low_ms + (self.high_ms - self.low_ms) * u
+
+    def sample(self, u: np.ndarray) -> np.ndarray:
+        # Linear already; no table needed
+        return self.low_ms + (self.high_ms - self.low_ms) * np.asarray(u)
+
+class LogNormal(LatencyDistribution):
+    name = "lognormal"
+
+    def __init__(self, median_ms: float, sigma: float):
+        if median_ms <= 0 or sigma < 0:
+            raise ValueError("lognormal needs median_ms > 0 and sigma >= 0")
+        self.median_ms = median_ms
+        self.sigma = sigma
+
+    def ppf(self, u: float) -> float:
+        return self.median_ms * math.exp(self.sigma * _STANDARD_NORMAL.inv_cdf(u))
+
+class Pareto(LatencyDistribution):
+    name = "pareto"
+
+    def __init__(self, scale_ms: float, alpha: float, cap_ms: Optional[float] = None):
+        if scale_ms <= 0 or alpha <= 0:
+            raise ValueError("pareto needs scale_ms > 0 and alpha > 0")
+        self.scale_ms = scale_ms
+        self.alpha = alpha
+        self.cap_ms = cap_ms
+
+    def ppf(self, u: float) -> float:
+        value = self.scale_ms / (1.0 - u) ** (1.0 / self.alpha)
+        return min(value, self.cap_ms) if self.cap_ms is not None else value
+
+class Bimodal(LatencyDistribution):
+    """Mixture of two modes: `high` with probability p_high, else `low`."""
+
+    name = "bimodal"
+
+    def __init__(self, low: LatencyDistribution, high: LatencyDistribution, p_high: float):
+        if not 0 <= p_high <= 1:
+            raise ValueError("bimodal p_high must be in [0, 1]")
+        self.low = low
+        self.high = high
+        self.p_high = p_high
+
+    def ppf(self, u: float) -> float:
+        return float(self.sample(np.array([u]))[0])
+
+    def sample(self, u: np.ndarray) -> np.ndarray:
+        # One uniform both picks the mode and, rescaled, samples within it
+        u = np.asarray(u, dtype=np.float64)
+        split = 1.0 - self.p_high
+        if split <= 0:
+            return self.high.sample(u)
+        if split >= 1:
+            return self.low.sample(u)
+        in_high = u >= split
+        out = self.low.sample(np.minimum(u / split, 1.0))
+        if in_high.any():
+            out[in_high] = self.high.sample((u[in_high] - split) / self.p_high)
+        return out
+
+class MarkovBurst(LatencyDistribution):
+    """
+    Two-state Markov-modulated latency: runs of a node alternate between a
+    `normal` and a `burst` regime. Each run draws one extra uniform v: v <
+    p_enter forces the burst state, v >= 1 - p_exit forces the normal state,
+    anything in between keeps the previous run's state. That gives
+    P(normal -> burst) = p_enter and P(burst -> normal) = p_exit, and the
+    state of any run only depends on the last forcing draw before it.
+    """
+
+    name = "burst"
+
+    def __init__(self, normal: LatencyDistribution, burst: LatencyDistribution, p_enter: float, p_exit: float):
+        if not (0 < p_enter and 0 < p_exit and p_enter + p_exit <= 1):
+            raise ValueError("burst needs p_enter, p_exit > 0 and p_enter + p_exit <= 1")
+        self.normal = normal
+        self.burst = burst
+        self.p_enter = p_enter
+        self.p_exit = p_exit
+        self.stationary = p_enter / (p_enter + p_exit)
+
+    def ppf(self, u: float) -> float:
+        return self.normal.ppf(u)
+
+    def sample(self, u: np.ndarray, state: Optional[np.ndarray] = None) -> np.ndarray:
+        out = self.normal.sample(u)
+        if state is not None and np.any(state):
+            out = np.where(state, self.burst.sample(u), out)
+        return out
+
+    def initial(self, v) -> bool:
+        """State of the very first run, drawn from the stationary distribution."""
+        return bool(v < self.stationary)
+
+    def forced(self, v: np.ndarray):
+        """(forced, value) masks: which state draws reset the chain, and to what."""
+        v = np.asarray(v)
+        return (v < self.p_enter) | (v >= 1.0 - self.p_exit), v < self.p_enter
+
+    def chain(self, v: np.ndarray, prev: Optional[bool]) -> np.ndarray:
+        """
+        Burst states for consecutive runs given their state draws v (1-D) and
+        the state of the run before them (None: v[0] belongs to the first run).
+        """
+        forced, value = self.forced(v)
+        if len(v) and prev is None:
+            forced[0] = True
+            value[0] = self.initial(v[0])
+        last = np.maximum.accumulate(np.where(forced, np.arange(len(v)), -1)) if len(v) else np.empty(0, dtype=np.int64)
+        return np.where(last >= 0, value[np.maximum(last, 0)], bool(prev))
+
+_SIMPLE = {
+    "constant": Constant,
+    "uniform": Uniform,
+    "lognormal": LogNormal,
+    "pareto": Pareto,
+}
+
+def make_distribution(spec: Dict[str, Any]) -> LatencyDistribution:
+    """
+    Builds a distribution from a declarative spec, e.g.
+    {"dist": "lognormal", "median_ms": 8, "sigma": 0.5} or
+    {"dist": "burst", "normal": {...}, "burst": {...}, "p_enter": 0.02, "p_exit": 0.2}.
+    """
+    spec = dict(spec)
+    kind = spec.pop("dist", None)
+    if kind in _SIMPLE:
+        return _SIMPLE[kind](**spec)
+    if kind == "bimodal":
+        return Bimodal(make_distribution(spec["low"]), make_distribution(spec["high"]), spec["p_high"])
+    if kind == "burst":
+        return MarkovBurst(make_distribution(spec["normal"]), make_distribution(spec["burst"]),
+                           spec["p_enter"], spec["p_exit"])
+    raise ValueError(f"Unknown latency distribution {kind!r}")
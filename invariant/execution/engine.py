@@ -1,11 +1,22 @@
 import time
 from typing import Dict, Any, List, Optional
-from .signals import ExecutionSignal, WorkflowExecutionTrace
+
+import numpy as np
+
+from .signals import ExecutionSignal, WorkflowExecutionTrace, TraceBatch, FLAG_STARVED, encode_flags
 from .perturbation import SeededPerturbator, PerturbationModel
-from .scheduler import TopologicalScheduler
+from .profiles import PerturbationProfiles
+from .scheduler import TopologicalScheduler, ExecutionPlan
 from ..workflow.graph import WorkflowGraph
 from ..core.config import ExperimentConfig
 
+# Baseline execution cost of a passive node (virtual seconds)
+BASELINE_EXECUTION_S = 0.001
+
+# Bump whenever a change makes the engines produce different traces for the
+# same workflow and config; cached results from older versions are then ignored.
+ENGINE_VERSION = 1
+
 class DeterministicEngine:
     """Executes a workflow graph deterministically with seeded perturbations."""
     
@@ -14,45 +25,185 @@ class DeterministicEngine:
         self.config = config
         self.scheduler = TopologicalScheduler(graph)
         self.perturbator: Optional[SeededPerturbator] = None
+        self.profiles: Optional[PerturbationProfiles] = None
         self.virtual_time = 0.0
+        # Index of the next run; addresses counter-mode RNG draws so run() and run_batch() agree
+        self.run_index = 0
 
-    def set_perturbation(self, model: PerturbationModel):
+    def set_perturbation(self, model: PerturbationModel, profiles: Optional[PerturbationProfiles] = None):
+        """
+        Perturbs runs with model. Per-node/per-edge profiles override it where
+        declared; by default they're read from the workflow's node metadata.
+        """
         self.perturbator = SeededPerturbator(model)
+        self.profiles = profiles if profiles is not None else PerturbationProfiles.from_graph(self.graph)
 
     def run(self) -> WorkflowExecutionTrace:
         """Runs the workflow once and captures signals."""
         self.virtual_time = self.config.timestamp # Start at experiment timestamp
+        run = self.run_index
+        self.run_index += 1
         
         trace = WorkflowExecutionTrace(
             run_id=self.config.run_id,
             timestamp=self.virtual_time
         )
         
-        plan = self.scheduler.get_execution_plan()
+        execution_plan = self.scheduler.get_plan()
+        plan = execution_plan.order
+        in_edges = None
+        if self.perturbator:
+            self.perturbator.bind(self.profiles, execution_plan)
+            if self.perturbator.edges:
+                in_edges = self.perturbator.profiles.in_edges
+        end_times = [0.0] * len(plan)
+        # should_drop() is only consulted when drops are enabled, so drop-free runs keep their RNG sequence
+        dropping = self.perturbator is not None and self.perturbator.model.drop_probability > 0
+        lost = [False] * len(plan)
         
-        for node_id in plan:
+        for i, node_id in enumerate(plan):
             node = self.graph.get_node(node_id)
+
+            if dropping and any(lost[p] for p in execution_plan.predecessors[i]):
+                # An input never arrived: the node can't run, and neither can anything it feeds
+                trace.record_starved(node_id, node.node_type)
+                lost[i] = True
+                continue
             
+            if in_edges and in_edges[i]:
+                # Wait for delayed inputs still in flight
+                arrival = max(end_times[src] + self.perturbator.edge_delay_for(run, e) for e, src in in_edges[i])
+                self.virtual_time = max(self.virtual_time, arrival)
+
             # Start signal (virtual time)
             start_t = self.virtual_time
+            retries = 0
+            dropped = False
             
-            # Apply perturbation latency (in virtual time)
-            if self.perturbator:
-                injection = self.perturbator.get_latency_injection()
-                self.virtual_time += injection
-            
-            # Simulate "execution" (passive for v1)
-            # Baseline 1ms execution (in virtual time)
-            self.virtual_time += 0.001 
+            while True:
+                # Apply perturbation latency (in virtual time)
+                if self.perturbator:
+                    injection = self.perturbator.latency_for(run, i, retries)
+                    self.virtual_time += injection
+                
+                # Simulate "execution" (passive for v1)
+                # Baseline 1ms execution (in virtual time)
+                self.virtual_time += BASELINE_EXECUTION_S
+
+                if not dropping or not self.perturbator.drop_for(run, i, retries):
+                    break
+                if retries < self.perturbator.model.retry_limit:
+                    retries += 1
+                    continue
+                dropped = True
+                break
             
             end_t = self.virtual_time
+            end_times[i] = end_t
             
-            signal = ExecutionSignal(
-                node_id=node_id,
-                start_time=start_t,
-                end_time=end_t,
-                metadata={"type": node.node_type}
-            )
-            trace.add_signal(signal)
+            trace.record(node_id, start_t, end_t, node.node_type, int(encode_flags(dropped, retries)))
+            lost[i] = dropped
             
         return trace
+
+    def run_batch(self, n_runs: int, first_run: Optional[int] = None) -> TraceBatch:
+        """
+        Runs the workflow n_runs times in one vectorized pass.
+        All perturbation samples are drawn up front as (n_runs, n_nodes) arrays,
+        so a given seed always yields the same batch. In counter RNG mode row i
+        equals what run() produces for run first_run + i (default: the next
+        run index), so a sweep can be split into independent chunks.
+        """
+        if n_runs < 0:
+            raise ValueError(f"n_runs must be non-negative, got {n_runs}")
+        first_run = self.run_index if first_run is None else first_run
+        self.run_index = first_run + n_runs
+
+        execution_plan = self.scheduler.get_plan()
+        plan = execution_plan.order
+        node_types = [self.graph.get_node(node_id).node_type for node_id in plan]
+        t0 = self.config.timestamp
+        shape = (n_runs, len(plan))
+
+        durations = np.full(shape, BASELINE_EXECUTION_S)
+        flags = None
+        if self.perturbator:
+            self.perturbator.bind(self.profiles, execution_plan)
+            durations += self.perturbator.get_latency_injections(shape, first_run)
+            if self.perturbator.model.drop_probability > 0:
+                durations, flags = self._apply_drops(durations, execution_plan, first_run)
+
+        if self.perturbator and self.perturbator.edges:
+            start_times, end_times = self._schedule_with_delays(durations, flags, t0, first_run)
+        else:
+            # Each node starts exactly where its predecessor in the plan ended
+            end_times = t0 + np.cumsum(durations, axis=1)
+            start_times = np.empty(shape)
+            if shape[1]:
+                start_times[:, 0] = t0
+                start_times[:, 1:] = end_times[:, :-1]
+
+        return TraceBatch(
+            run_id=self.config.run_id,
+            timestamp=t0,
+            node_ids=list(plan),
+            node_types=node_types,
+            start_times=start_times,
+            end_times=end_times,
+            flags=flags
+        )
+
+    def _schedule_with_delays(self, durations: np.ndarray, flags: Optional[np.ndarray], t0: float, first_run: int):
+        """
+        Start/end times when profiled edges delay messages: a node starts once
+        the previous node in the plan is done and all its delayed inputs have
+        arrived. One vectorized step per node; starved cells wait for nothing.
+        """
+        n_runs, n_nodes = durations.shape
+        delays = self.perturbator.get_edge_delays(n_runs, first_run)
+        in_edges = self.perturbator.profiles.in_edges
+        start_times = np.empty(durations.shape)
+        end_times = np.empty(durations.shape)
+        prev_end = np.full(n_runs, t0)
+        for j in range(n_nodes):
+            start = prev_end
+            if in_edges[j]:
+                arrival = np.max([end_times[:, src] + delays[:, e] for e, src in in_edges[j]], axis=0)
+                if flags is not None:
+                    arrival = np.where(flags[:, j] == FLAG_STARVED, -np.inf, arrival)
+                start = np.maximum(start, arrival)
+            start_times[:, j] = start
+            end_times[:, j] = start + durations[:, j]
+            prev_end = end_times[:, j]
+        return start_times, end_times
+
+    def _apply_drops(self, durations: np.ndarray, plan: ExecutionPlan, first_run: int = 0):
+        """
+        Samples drops/retries for a whole (n_runs, n_nodes) batch and propagates
+        lost outputs along graph edges, one vectorized step per node.
+        Returns the adjusted durations (retries add attempts, starved cells take
+        no time) and the FLAG_* matrix.
+        """
+        model = self.perturbator.model
+        shape = durations.shape
+        failures = self.perturbator.get_drop_failures(shape, first_run)
+        limit = model.retry_limit
+        retries = np.minimum(failures, limit)
+        dropped = failures > limit
+
+        if limit and retries.any():
+            # Every retry costs another full attempt
+            extra = self.perturbator.get_retry_injections(retries, first_run)
+            durations = durations + extra + retries * BASELINE_EXECUTION_S
+
+        lost = dropped.copy()
+        starved = np.zeros(shape, dtype=bool)
+        for j, preds in enumerate(plan.predecessors):
+            if preds:
+                starved[:, j] = lost[:, list(preds)].any(axis=1)
+                lost[:, j] |= starved[:, j]
+
+        durations = np.where(starved, 0.0, durations)
+        flags = encode_flags(dropped & ~starved, np.where(starved, 0, retries))
+        flags[starved] = FLAG_STARVED
+        return durations, flags
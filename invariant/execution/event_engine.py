@@ -0,0 +1,128 @@
+import heapq
+from typing import List, Optional
+
+from .signals import WorkflowExecutionTrace, encode_flags
+from .perturbation import SeededPerturbator, PerturbationModel
+from .profiles import PerturbationProfiles
+from .scheduler import TopologicalScheduler
+from .engine import BASELINE_EXECUTION_S
+from ..workflow.graph import WorkflowGraph
+from ..core.config import ExperimentConfig
+
+class EventDrivenEngine:
+    """
+    Discrete-event execution of a workflow graph.
+    A node becomes ready once all of its predecessors have finished; independent
+    branches overlap in virtual time. With max_workers set, at most that many
+    nodes execute concurrently and the rest queue for a free worker.
+    """
+
+    def __init__(self, graph: WorkflowGraph, config: ExperimentConfig, max_workers: Optional[int] = None):
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.graph = graph
+        self.config = config
+        self.max_workers = max_workers
+        self.scheduler = TopologicalScheduler(graph)
+        self.perturbator: Optional[SeededPerturbator] = None
+        self.profiles: Optional[PerturbationProfiles] = None
+        self.virtual_time = 0.0
+        self.run_index = 0
+
+    def set_perturbation(self, model: PerturbationModel, profiles: Optional[PerturbationProfiles] = None):
+        """Same as DeterministicEngine.set_perturbation."""
+        self.perturbator = SeededPerturbator(model)
+        self.profiles = profiles if profiles is not None else PerturbationProfiles.from_graph(self.graph)
+
+    def _node_duration(self, run: int, position: int, attempt: int = 0) -> float:
+        duration = BASELINE_EXECUTION_S
+        if self.perturbator:
+            duration += self.perturbator.latency_for(run, position, attempt)
+        return duration
+
+    def _execute(self, dropping: bool, run: int, position: int):
+        """Duration of one node execution including retries, the retry count, and whether its output was lost."""
+        duration = self._node_duration(run, position)
+        retries = 0
+        while dropping and self.perturbator.drop_for(run, position, retries):
+            if retries >= self.perturbator.model.retry_limit:
+                return duration, retries, True
+            retries += 1
+            duration += self._node_duration(run, position, retries)
+        return duration, retries, False
+
+    def run(self) -> WorkflowExecutionTrace:
+        """Runs the workflow once; signals are recorded in completion order."""
+        self.virtual_time = self.config.timestamp
+        run = self.run_index
+        self.run_index += 1
+        trace = WorkflowExecutionTrace(
+            run_id=self.config.run_id,
+            timestamp=self.virtual_time
+        )
+
+        execution_plan = self.scheduler.get_plan()
+        plan = execution_plan.order
+        successors = execution_plan.successors
+        pending = list(execution_plan.in_degree)
+        node_types = [self.graph.get_node(n).node_type for n in plan]
+        edge_index = {}
+        if self.perturbator:
+            self.perturbator.bind(self.profiles, execution_plan)
+            if self.perturbator.edges:
+                edge_index = self.perturbator.profiles.edge_index
+
+        # Ready queue is ordered by (ready time, plan position) so ties resolve
+        # deterministically; running queue is ordered by (finish time, plan position).
+        # A node's ready time is when the last of its (possibly delayed) inputs arrives.
+        ready = [(self.virtual_time, i) for i, count in enumerate(pending) if count == 0]
+        heapq.heapify(ready)
+        running: List[tuple] = []
+        start_times = [0.0] * len(plan)
+        outcome = [(0, False)] * len(plan)  # (retries, dropped) per plan position
+        free_workers = self.max_workers if self.max_workers is not None else len(plan)
+        dropping = self.perturbator is not None and self.perturbator.model.drop_probability > 0
+        # A node whose input was lost never becomes ready; it's starved once all its inputs have settled
+        starving = [False] * len(plan)
+        arrival = [self.virtual_time] * len(plan)
+
+        def settle(i: int, finish_t: float, lost: bool):
+            stack = [(i, lost)]
+            while stack:
+                k, k_lost = stack.pop()
+                for j in successors[k]:
+                    pending[j] -= 1
+                    starving[j] = starving[j] or k_lost
+                    if not k_lost:
+                        e = edge_index.get((k, j))
+                        delay = self.perturbator.edge_delay_for(run, e) if e is not None else 0.0
+                        arrival[j] = max(arrival[j], finish_t + delay)
+                    if pending[j] == 0:
+                        if starving[j]:
+                            trace.record_starved(plan[j], node_types[j])
+                            stack.append((j, True))
+                        else:
+                            heapq.heappush(ready, (arrival[j], j))
+
+        while ready or running:
+            while ready and free_workers > 0 and ready[0][0] <= self.virtual_time:
+                _, i = heapq.heappop(ready)
+                start_times[i] = self.virtual_time
+                duration, retries, dropped = self._execute(dropping, run, i)
+                outcome[i] = (retries, dropped)
+                heapq.heappush(running, (self.virtual_time + duration, i))
+                free_workers -= 1
+
+            if not running or (free_workers > 0 and ready and ready[0][0] < running[0][0]):
+                # Idle until the next delayed input arrives
+                self.virtual_time = ready[0][0]
+                continue
+
+            finish_t, i = heapq.heappop(running)
+            self.virtual_time = finish_t
+            free_workers += 1
+            retries, dropped = outcome[i]
+            trace.record(plan[i], start_times[i], finish_t, node_types[i], int(encode_flags(dropped, retries)))
+            settle(i, finish_t, dropped)
+
+        return trace
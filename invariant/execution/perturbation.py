@@ -1,7 +1,27 @@
 import random
-from typing import Dict, Any, Optional
+import secrets
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
+from .distributions import LatencyDistribution, MarkovBurst
+from .philox import key_from_seed, uniform_pair
+from .profiles import PerturbationProfiles, ResolvedProfiles
+from .scheduler import ExecutionPlan
+
+DROP_POLICIES = ("starve", "retry")
+RNG_MODES = ("sequential", "counter")
+
+# Philox stream ids (third counter word)
+STREAM_LATENCY = 0
+STREAM_DROP = 1
+STREAM_BURST = 2
+STREAM_EDGE = 3
+
+# How far back to look per step when recovering a burst state in counter mode
+_BURST_LOOKBACK = 64
+
 @dataclass
 class PerturbationModel:
     """Declarative perturbation model."""
@@ -10,6 +30,27 @@ class PerturbationModel:
     jitter_ms: float = 0
     drop_probability: float = 0
     seed: Optional[int] = None
+    # "starve": a dropped output starves every downstream node
+    # "retry": rerun the node up to max_retries times before giving up and starving
+    drop_policy: str = "starve"
+    max_retries: int = 3
+    # "sequential": one random.Random stream, draws depend on everything drawn before.
+    # "counter": Philox keyed on the seed; every (run, node, attempt) draw is addressable
+    # on its own, so runs can be split across workers or batched without changing results.
+    rng_mode: str = "sequential"
+
+    def __post_init__(self):
+        if self.rng_mode not in RNG_MODES:
+            raise ValueError(f"Unknown rng_mode {self.rng_mode!r}, expected one of {RNG_MODES}")
+        if self.drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop_policy {self.drop_policy!r}, expected one of {DROP_POLICIES}")
+        if not 0 <= self.drop_probability <= 1:
+            raise ValueError(f"drop_probability must be in [0, 1], got {self.drop_probability}")
+
+    @property
+    def retry_limit(self) -> int:
+        """Retries allowed per execution under this model's policy."""
+        return self.max_retries if self.drop_policy == "retry" else 0
 
 class SeededPerturbator:
     """Injects seeded, reproducible perturbations into node execution."""
@@ -17,6 +58,158 @@ class SeededPerturbator:
     def __init__(self, model: PerturbationModel):
         self.model = model
         self.rng = random.Random(model.seed)
+        # Separate stream for batched draws so run() sequences are unaffected
+        self.np_rng = np.random.default_rng(model.seed)
+        self.counter_mode = model.rng_mode == "counter"
+        self.key = key_from_seed(model.seed if model.seed is not None else secrets.randbits(64))
+        self.profiles: Optional[ResolvedProfiles] = None
+        self._bound: Tuple[Any, Any] = (None, None)
+        # Burst chain state: last state per plan position for run(), and for batches
+        self._burst_prev: Dict[int, bool] = {}
+        self._batch_burst_prev: Dict[int, bool] = {}
+        self._last_burst: Optional[np.ndarray] = None
+
+    def bind(self, profiles: Optional[PerturbationProfiles], plan: ExecutionPlan):
+        """Attaches per-node/per-edge profiles for this plan; a no-op if already bound to both."""
+        if self._bound[0] is profiles and self._bound[1] is plan:
+            return
+        self._bound = (profiles, plan)
+        self.profiles = profiles.resolve(plan) if profiles else None
+        self._burst_prev = {}
+        self._batch_burst_prev = {}
+        self._last_burst = None
+
+    @property
+    def edges(self) -> List[Tuple[int, int, LatencyDistribution]]:
+        return self.profiles.edges if self.profiles is not None else []
+
+    # --- profile sampling ------------------------------------------------
+
+    def _latency_s(self, u_base: np.ndarray, u_jitter: np.ndarray, nodes, burst=None) -> np.ndarray:
+        """Maps uniforms to latencies (seconds); nodes are plan positions broadcasting against u."""
+        model = self.model
+        if self.profiles is None:
+            base_latency = model.latency_min_ms + (model.latency_max_ms - model.latency_min_ms) * u_base
+            jitter = -model.jitter_ms + 2 * model.jitter_ms * u_jitter
+            return np.maximum(0.0, (base_latency + jitter) / 1000.0)
+
+        u_base = np.atleast_1d(u_base)
+        base_latency = model.latency_min_ms + (model.latency_max_ms - model.latency_min_ms) * u_base
+        # Whole batches come in as a (1, n_nodes) row of positions: sample column by column
+        columns = np.ndim(nodes) == 2 and np.shape(nodes)[0] == 1 and u_base.ndim == 2
+        if not columns:
+            nodes = np.broadcast_to(nodes, u_base.shape)
+            burst = np.broadcast_to(burst, u_base.shape) if burst is not None else None
+        for j, dist in self.profiles.custom:
+            cell = (slice(None), j) if columns else nodes == j
+            state = burst[cell] if burst is not None and isinstance(dist, MarkovBurst) else None
+            if state is not None:
+                base_latency[cell] = dist.sample(u_base[cell], state)
+            elif columns or cell.any():
+                base_latency[cell] = dist.sample(u_base[cell])
+        jitter_ms = np.where(np.isnan(self.profiles.jitter_ms), model.jitter_ms, self.profiles.jitter_ms)[nodes]
+        jitter = -jitter_ms + 2 * jitter_ms * u_jitter
+        return np.maximum(0.0, (base_latency + jitter) / 1000.0)
+
+    def _burst_uniforms(self, runs, node: int) -> np.ndarray:
+        return uniform_pair(self.key, runs, node, STREAM_BURST, 0)[0]
+
+    def _burst_state_at(self, run: int, node: int, dist: MarkovBurst) -> bool:
+        """Counter mode: a run's burst state is set by the last forcing draw at or before it."""
+        end = run + 1
+        while end > 0:
+            start = max(0, end - _BURST_LOOKBACK)
+            v = self._burst_uniforms(np.arange(start, end, dtype=np.int64), node)
+            forced, value = dist.forced(v)
+            if start == 0:
+                forced[0], value[0] = True, dist.initial(v[0])
+            hits = np.flatnonzero(forced)
+            if len(hits):
+                return bool(value[hits[-1]])
+            end = start
+        return False
+
+    def _batch_bursts(self, shape: Tuple[int, int], first_run: int) -> Optional[np.ndarray]:
+        """(n_runs, n_nodes) burst states for a batch, continuing each node's chain."""
+        bursts = self.profiles.bursts if self.profiles is not None else []
+        if not bursts:
+            return None
+        states = np.zeros(shape, dtype=bool)
+        for j, dist in bursts:
+            if self.counter_mode:
+                v = self._burst_uniforms(first_run + np.arange(shape[0], dtype=np.int64), j)
+                prev = self._burst_state_at(first_run - 1, j, dist) if first_run > 0 else None
+            else:
+                v = self.np_rng.random(shape[0])
+                prev = self._batch_burst_prev.get(j)
+            states[:, j] = dist.chain(v, prev)
+            if len(v):
+                self._batch_burst_prev[j] = bool(states[-1, j])
+        return states
+
+    def _burst_for(self, run: int, node: int, attempt: int) -> bool:
+        dist = self.profiles.latency[node] if self.profiles is not None else None
+        if not isinstance(dist, MarkovBurst):
+            return False
+        if self.counter_mode:
+            return self._burst_state_at(run, node, dist)
+        if attempt == 0:
+            # Retries of an execution stay in the state it started in
+            v = self.rng.random()
+            prev = self._burst_prev.get(node)
+            self._burst_prev[node] = bool(dist.chain(np.array([v]), prev)[0])
+        return self._burst_prev.get(node, False)
+
+    # --- counter mode ----------------------------------------------------
+
+    def _injections_at(self, runs, nodes, attempt, burst=None) -> np.ndarray:
+        u_base, u_jitter = uniform_pair(self.key, runs, nodes, STREAM_LATENCY, attempt)
+        return self._latency_s(u_base, u_jitter, nodes, burst)
+
+    def _drop_uniforms_at(self, runs, nodes, attempt) -> np.ndarray:
+        return uniform_pair(self.key, runs, nodes, STREAM_DROP, attempt)[0]
+
+    @staticmethod
+    def _grid(shape: Tuple[int, int], first_run: int):
+        runs = first_run + np.arange(shape[0], dtype=np.int64)[:, None]
+        nodes = np.arange(shape[1], dtype=np.int64)[None, :]
+        return runs, nodes
+
+    # --- per-execution draws (engines) -----------------------------------
+
+    def latency_for(self, run: int, node: int, attempt: int = 0) -> float:
+        """Latency in seconds for one attempt of one node; coordinates only matter in counter mode."""
+        if self.profiles is not None:
+            burst = self._burst_for(run, node, attempt)
+            if self.counter_mode:
+                return float(self._injections_at(run, node, attempt, burst)[0])
+            u_base, u_jitter = self.rng.random(), self.rng.random()
+            return float(self._latency_s(np.array([u_base]), np.array([u_jitter]), node, burst)[0])
+        if not self.counter_mode:
+            return self.get_latency_injection()
+        return float(self._injections_at(run, node, attempt))
+
+    def drop_for(self, run: int, node: int, attempt: int = 0) -> bool:
+        if not self.counter_mode:
+            return self.should_drop()
+        return bool(self._drop_uniforms_at(run, node, attempt) < self.model.drop_probability)
+
+    def edge_delay_for(self, run: int, edge: int) -> float:
+        """Transport delay in seconds on one profiled edge (index into self.edges)."""
+        u = uniform_pair(self.key, run, edge, STREAM_EDGE, 0)[0] if self.counter_mode else self.rng.random()
+        return float(max(0.0, self.edges[edge][2].sample(np.array([u]))[0]) / 1000.0)
+
+    def get_edge_delays(self, n_runs: int, first_run: int = 0) -> np.ndarray:
+        """(n_runs, n_edges) transport delays in seconds for every profiled edge."""
+        shape = (n_runs, len(self.edges))
+        if self.counter_mode:
+            u = uniform_pair(self.key, *self._grid(shape, first_run), STREAM_EDGE, 0)[0]
+        else:
+            u = self.np_rng.random(shape)
+        delays = np.empty(shape)
+        for e, (_, _, dist) in enumerate(self.edges):
+            delays[:, e] = dist.sample(u[:, e])
+        return np.maximum(0.0, delays / 1000.0)
 
     def get_latency_injection(self) -> float:
         """Returns latency to inject in seconds."""
@@ -24,6 +217,73 @@ class SeededPerturbator:
         jitter = self.rng.uniform(-self.model.jitter_ms, self.model.jitter_ms)
         return max(0, (base_latency + jitter) / 1000.0)
 
+    def get_latency_injections(self, shape: Tuple[int, ...], first_run: int = 0) -> np.ndarray:
+        """
+        Vectorized get_latency_injection: returns an array of latencies in seconds.
+        In counter mode shape is (n_runs, n_nodes) and row i is run first_run + i.
+        """
+        if self.profiles is not None:
+            self._last_burst = self._batch_bursts(shape, first_run)
+            if not self.counter_mode:
+                u_base, u_jitter = self.np_rng.random(shape), self.np_rng.random(shape)
+                return self._latency_s(u_base, u_jitter, np.arange(shape[1])[None, :], self._last_burst)
+        if self.counter_mode:
+            return self._injections_at(*self._grid(shape, first_run), 0, self._last_burst)
+        base_latency = self.np_rng.uniform(self.model.latency_min_ms, self.model.latency_max_ms, shape)
+        jitter = self.np_rng.uniform(-self.model.jitter_ms, self.model.jitter_ms, shape)
+        return np.maximum(0.0, (base_latency + jitter) / 1000.0)
+
     def should_drop(self) -> bool:
         """Determines if a message/execution should be dropped."""
         return self.rng.random() < self.model.drop_probability
+
+    def get_drop_failures(self, shape: Tuple[int, ...], first_run: int = 0) -> np.ndarray:
+        """
+        Vectorized should_drop: consecutive failed attempts per execution.
+        P(failures >= k) = p**k, i.e. the number of should_drop() hits before a
+        success, drawn by inverse CDF from one uniform per cell. Counter mode
+        walks the same per-attempt draws as drop_for(), capped at
+        retry_limit + 1 failures.
+        """
+        p = self.model.drop_probability
+        if p <= 0:
+            return np.zeros(shape, dtype=np.int64)
+        if self.counter_mode:
+            runs, nodes = np.broadcast_arrays(*self._grid(shape, first_run))
+            failures = np.zeros(shape, dtype=np.int64)
+            alive = np.ones(shape, dtype=bool)
+            for attempt in range(self.model.retry_limit + 1):
+                idx = np.nonzero(alive)
+                failed = self._drop_uniforms_at(runs[idx], nodes[idx], attempt) < p
+                alive[idx] = failed
+                failures[idx] += failed
+                if not failed.any():
+                    break
+            return failures
+        if p >= 1:
+            return np.full(shape, np.iinfo(np.int32).max, dtype=np.int64)
+        u = 1.0 - self.np_rng.random(shape)  # (0, 1]
+        return np.floor(np.log(u) / np.log(p)).astype(np.int64)
+
+    def get_retry_injections(self, retries: np.ndarray, first_run: int = 0) -> np.ndarray:
+        """Summed latency (seconds) of the extra attempts behind each cell's retry count."""
+        extra = np.zeros(retries.shape)
+        if not retries.any():
+            return extra
+        if self.counter_mode:
+            runs, nodes = np.broadcast_arrays(*self._grid(retries.shape, first_run))
+            for attempt in range(1, int(retries.max()) + 1):
+                idx = np.nonzero(retries >= attempt)
+                burst = self._last_burst[idx] if self._last_burst is not None else None
+                extra[idx] += self._injections_at(runs[idx], nodes[idx], attempt, burst)
+            return extra
+        # Only draw the attempts that actually happen
+        cells = np.repeat(np.arange(retries.size), retries.ravel())
+        if self.profiles is not None:
+            # Retried attempts follow their node's profile and burst state
+            u_base, u_jitter = self.np_rng.random(cells.shape), self.np_rng.random(cells.shape)
+            burst = self._last_burst.ravel()[cells] if self._last_burst is not None else None
+            injected = self._latency_s(u_base, u_jitter, cells % retries.shape[1], burst)
+            return np.bincount(cells, weights=injected, minlength=retries.size).reshape(retries.shape)
+        injected = self.get_latency_injections(cells.shape)
+        return np.bincount(cells, weights=injected, minlength=retries.size).reshape(retries.shape)
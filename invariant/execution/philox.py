@@ -0,0 +1,51 @@
+from typing import Tuple
+
+import numpy as np
+
+# Philox4x32-10 (Salmon et al., "Parallel Random Numbers: As Easy as 1, 2, 3", SC'11).
+# A counter-based generator: output = bijection(counter, key), so any element of
+# a stream can be computed directly from its coordinates, in any order, in bulk.
+
+_M0 = np.uint64(0xD2511F53)
+_M1 = np.uint64(0xCD9E8D57)
+_LO = np.uint64(0xFFFFFFFF)
+_SHIFT = np.uint64(32)
+
+def _rounds(c0, c1, c2, c3, key: Tuple[int, int], rounds: int):
+    # Work in uint64 throughout: 32x32 products fit, and it saves a cast per round.
+    # Inputs broadcast against each other, so scalar counter words stay scalars.
+    k0, k1 = int(key[0]), int(key[1])
+    for r in range(rounds):
+        if r:
+            k0 = (k0 + 0x9E3779B9) & 0xFFFFFFFF
+            k1 = (k1 + 0xBB67AE85) & 0xFFFFFFFF
+        p0 = c0 * _M0
+        p1 = c2 * _M1
+        c0, c1, c2, c3 = (p1 >> _SHIFT) ^ c1 ^ np.uint64(k0), p1 & _LO, (p0 >> _SHIFT) ^ c3 ^ np.uint64(k1), p0 & _LO
+    return c0, c1, c2, c3
+
+def philox4x32(counter: np.ndarray, key: Tuple[int, int], rounds: int = 10) -> np.ndarray:
+    """
+    Vectorized Philox4x32: counter is a (..., 4) uint32 array, key two 32-bit words.
+    Returns the (..., 4) uint32 output block for every counter.
+    """
+    counter = np.asarray(counter, dtype=np.uint32).astype(np.uint64)
+    words = _rounds(*(counter[..., i] for i in range(4)), key, rounds)
+    return np.stack(words, axis=-1).astype(np.uint32)
+
+def key_from_seed(seed: int) -> Tuple[int, int]:
+    """Splits a seed into the two 32-bit key words (low word first)."""
+    seed &= 0xFFFFFFFFFFFFFFFF
+    return seed & 0xFFFFFFFF, seed >> 32
+
+def uniform_pair(key: Tuple[int, int], *coords) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two independent doubles in [0, 1) for each counter (c0, c1, c2, c3).
+    Coordinates broadcast against each other; each word of the output block
+    pair supplies 53 bits, like NumPy's own double conversion.
+    """
+    words = _rounds(*(np.asarray(x, dtype=np.uint64) for x in coords), key, 10)
+    scale = 1.0 / 9007199254740992.0  # 2**-53
+    a = ((words[0] >> np.uint64(5)) * np.uint64(67108864) + (words[1] >> np.uint64(6))) * scale
+    b = ((words[2] >> np.uint64(5)) * np.uint64(67108864) + (words[3] >> np.uint64(6))) * scale
+    return a, b
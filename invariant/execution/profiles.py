@@ -0,0 +1,142 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .distributions import LatencyDistribution, MarkovBurst, make_distribution
+from .scheduler import ExecutionPlan
+from ..workflow.graph import WorkflowGraph
+
+# Key under Node.metadata holding a node's profile
+METADATA_KEY = "perturbation"
+
+@dataclass
+class NodeProfile:
+    """Per-node override of the global PerturbationModel; None fields fall back to it."""
+    latency: Optional[Dict[str, Any]] = None
+    jitter_ms: Optional[float] = None
+
+@dataclass
+class ResolvedProfiles:
+    """Profiles bound to an execution plan, indexed by plan position."""
+    latency: List[Optional[LatencyDistribution]]
+    jitter_ms: np.ndarray                                    # NaN = model default
+    edges: List[Tuple[int, int, LatencyDistribution]]        # (source, target, delay)
+    in_edges: List[List[Tuple[int, int]]]                    # per target: (edge index, source)
+    edge_index: Dict[Tuple[int, int], int] = field(default_factory=dict)
+
+    @property
+    def custom(self) -> List[Tuple[int, LatencyDistribution]]:
+        return [(j, dist) for j, dist in enumerate(self.latency) if dist is not None]
+
+    @property
+    def bursts(self) -> List[Tuple[int, MarkovBurst]]:
+        return [(j, dist) for j, dist in self.custom if isinstance(dist, MarkovBurst)]
+
+class PerturbationProfiles:
+    """
+    Per-node latency distributions and per-edge transport delays.
+
+    Declared either on the workflow itself:
+
+        metadata:
+          perturbation:
+            latency: {dist: lognormal, median_ms: 8, sigma: 0.6}
+            jitter_ms: 1.0
+            edges:
+              planner: {dist: constant, value_ms: 2}
+
+    or in a separate file with the same per-node entries:
+
+        nodes:
+          camera: {latency: {dist: pareto, scale_ms: 2, alpha: 1.5, cap_ms: 200}}
+        edges:
+          - {source: camera, target: planner, delay: {dist: uniform, low_ms: 1, high_ms: 4}}
+    """
+
+    def __init__(self, nodes: Optional[Dict[str, NodeProfile]] = None,
+                 edges: Optional[Dict[Tuple[str, str], Dict[str, Any]]] = None):
+        self.nodes = nodes or {}
+        self.edges = edges or {}
+
+    def __bool__(self) -> bool:
+        return bool(self.nodes or self.edges)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PerturbationProfiles":
+        nodes = {}
+        edges = {}
+        for node_id, entry in (data.get("nodes") or {}).items():
+            node_profile, node_edges = cls._parse_entry(node_id, entry)
+            nodes[node_id] = node_profile
+            edges.update(node_edges)
+        for e in data.get("edges") or []:
+            edges[(e["source"], e["target"])] = e["delay"]
+        return cls(nodes, edges)
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "PerturbationProfiles":
+        import yaml
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(yaml.safe_load(f) or {})
+
+    @classmethod
+    def from_graph(cls, graph: WorkflowGraph) -> "PerturbationProfiles":
+        """Profiles declared in node metadata."""
+        nodes = {}
+        edges = {}
+        for node_id in graph.graph.nodes:
+            entry = graph.get_node(node_id).metadata.get(METADATA_KEY)
+            if entry:
+                node_profile, node_edges = cls._parse_entry(node_id, entry)
+                nodes[node_id] = node_profile
+                edges.update(node_edges)
+        return cls(nodes, edges)
+
+    @staticmethod
+    def _parse_entry(node_id: str, entry: Dict[str, Any]):
+        profile = NodeProfile(latency=entry.get("latency"), jitter_ms=entry.get("jitter_ms"))
+        edges = {(node_id, target): spec for target, spec in (entry.get("edges") or {}).items()}
+        return profile, edges
+
+    def merged(self, other: "PerturbationProfiles") -> "PerturbationProfiles":
+        """These profiles with other's entries taking precedence."""
+        nodes = dict(self.nodes)
+        for node_id, profile in other.nodes.items():
+            base = nodes.get(node_id, NodeProfile())
+            nodes[node_id] = NodeProfile(
+                latency=profile.latency if profile.latency is not None else base.latency,
+                jitter_ms=profile.jitter_ms if profile.jitter_ms is not None else base.jitter_ms
+            )
+        return PerturbationProfiles(nodes, {**self.edges, **other.edges})
+
+    def resolve(self, plan: ExecutionPlan) -> ResolvedProfiles:
+        """Builds the distributions and maps node ids/edges onto plan positions."""
+        n = len(plan)
+        latency: List[Optional[LatencyDistribution]] = [None] * n
+        jitter = np.full(n, np.nan)
+        for node_id, profile in self.nodes.items():
+            if node_id not in plan.order:
+                raise ValueError(f"Perturbation profile for unknown node {node_id!r}")
+            j = plan.position(node_id)
+            if profile.latency is not None:
+                latency[j] = make_distribution(profile.latency)
+            if profile.jitter_ms is not None:
+                jitter[j] = profile.jitter_ms
+
+        edges = []
+        in_edges: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        edge_index = {}
+        for (source, target), spec in sorted(self.edges.items()):
+            src = plan.position(source) if source in plan.order else None
+            dst = plan.position(target) if target in plan.order else None
+            if src is None or dst is None or dst not in plan.successors[src]:
+                raise ValueError(f"Perturbation profile for unknown edge {source!r} -> {target!r}")
+            delay = make_distribution(spec)
+            if isinstance(delay, MarkovBurst):
+                raise ValueError(f"Burst distributions are only supported for node latency, not edge {source!r} -> {target!r}")
+            edge_index[(src, dst)] = len(edges)
+            in_edges[dst].append((len(edges), src))
+            edges.append((src, dst, delay))
+
+        return ResolvedProfiles(latency, jitter, edges, in_edges, edge_index)
@@ -0,0 +1,166 @@
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from .archive import TraceArchive, TraceArchiveWriter
+from .engine import ENGINE_VERSION
+from .signals import TraceBatch, WorkflowExecutionTrace
+from ..core.config import canonical_json, json_default
+from ..validation.base import ValidationResult
+from ..workflow.cache import default_cache_dir
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+def result_key(workflow_hash: str, config_hash: str, engine_version: int = ENGINE_VERSION) -> str:
+    """Cache key of one experiment: what ran, how it was perturbed, and which engine ran it."""
+    payload = canonical_json({"workflow": workflow_hash, "config": config_hash, "engine": engine_version})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+@dataclass
+class CachedResult:
+    """A cache hit. Traces stay on disk until asked for."""
+    key: str
+    config: Dict[str, Any]
+    results: List[ValidationResult]
+    archive_path: str
+
+    def traces(self) -> List[WorkflowExecutionTrace]:
+        with TraceArchive(self.archive_path) as archive:
+            return list(archive)
+
+    def batch(self) -> TraceBatch:
+        """The runs as a TraceBatch; only for entries stored from one."""
+        with TraceArchive(self.archive_path) as archive:
+            return archive.to_batch()
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of experiment results: each entry holds the
+    executed traces (trace archive format) and the ValidationResults computed
+    from them. The engines are deterministic, so an entry is valid for as long
+    as its key is. Entries are evicted least-recently-used first once the
+    cache grows past max_bytes.
+
+    Layout: <cache_dir>/results/<key>.itrace and <key>.json. The JSON file is
+    written last and marks the entry complete; its mtime is the entry's last use.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), "results")
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        index_path = self._path(key, ".json")
+        archive_path = self._path(key, ".itrace")
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if not os.path.exists(archive_path):
+                return None
+            results = [ValidationResult(**r) for r in entry["results"]]
+            # Touch: mtime orders entries for eviction
+            os.utime(index_path)
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, partial or corrupt entries are misses
+            return None
+        return CachedResult(key=key, config=entry.get("config", {}), results=results, archive_path=archive_path)
+
+    def put(self, key: str, runs: Union[TraceBatch, List[WorkflowExecutionTrace]],
+            results: List[ValidationResult], config: Optional[Dict[str, Any]] = None) -> bool:
+        """Stores an entry, then evicts down to max_bytes. Returns False if it couldn't be written."""
+        entry = {
+            "key": key,
+            "engine_version": ENGINE_VERSION,
+            "created_at": time.time(),
+            "config": config or {},
+            "results": [dataclasses.asdict(r) for r in results],
+        }
+        tmp_paths = []
+        try:
+            index = json.dumps(entry, sort_keys=True, allow_nan=True, default=json_default)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write-then-rename both files, index last, so readers never see a partial entry
+            fd, tmp_archive = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            os.close(fd)
+            tmp_paths.append(tmp_archive)
+            with TraceArchiveWriter(tmp_archive) as writer:
+                if isinstance(runs, TraceBatch):
+                    writer.append_batch(runs)
+                else:
+                    for trace in runs:
+                        writer.append(trace)
+
+            fd, tmp_index = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            tmp_paths.append(tmp_index)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(index)
+            os.replace(tmp_archive, self._path(key, ".itrace"))
+            os.replace(tmp_index, self._path(key, ".json"))
+        except (OSError, TypeError, ValueError):
+            for path in tmp_paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            return False
+        self.evict()
+        return True
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Complete entries, least recently used first: key, size in bytes and last-use time."""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            key = name[:-len(".json")]
+            try:
+                index = os.stat(self._path(key, ".json"))
+                size = index.st_size
+                if os.path.exists(self._path(key, ".itrace")):
+                    size += os.path.getsize(self._path(key, ".itrace"))
+            except OSError:
+                continue
+            entries.append({"key": key, "size": size, "last_used": index.st_mtime})
+        entries.sort(key=lambda e: (e["last_used"], e["key"]))
+        return entries
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(e["size"] for e in self.entries())
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Drops least-recently-used entries until the cache fits in max_bytes. Returns bytes freed."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(e["size"] for e in entries)
+        freed = 0
+        for e in entries:
+            if total <= limit:
+                break
+            try:
+                # Archive first: get() already treats an index without one as a miss
+                os.remove(self._path(e["key"], ".itrace"))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # e.g. still memory-mapped on Windows; keep the entry for a later pass
+                continue
+            try:
+                os.remove(self._path(e["key"], ".json"))
+            except OSError:
+                pass
+            total -= e["size"]
+            freed += e["size"]
+        return freed
@@ -1,12 +1,108 @@
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from ..workflow.graph import WorkflowGraph
 
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """
+    Immutable, precomputed schedule of a workflow graph.
+    Levels are antichains: every node sits one level after its deepest
+    predecessor, so nodes within a level are independent of each other.
+    Slack counts how many levels a node can slip (unit cost per node)
+    without lengthening the critical path.
+    """
+    graph_version: int
+    order: Tuple[str, ...]
+    levels: Tuple[Tuple[str, ...], ...]
+    level: Tuple[int, ...]                    # aligned with order
+    slack: Tuple[int, ...]                    # aligned with order
+    critical_path: Tuple[str, ...]
+    successors: Tuple[Tuple[int, ...], ...]   # plan positions, aligned with order
+    in_degree: Tuple[int, ...]                # aligned with order
+    predecessors: Tuple[Tuple[int, ...], ...] = ()  # plan positions, aligned with order
+    _position: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def position(self, node_id: str) -> int:
+        return self._position[node_id]
+
+    def slack_of(self, node_id: str) -> int:
+        return self.slack[self._position[node_id]]
+
+    def level_of(self, node_id: str) -> int:
+        return self.level[self._position[node_id]]
+
+    @property
+    def depth(self) -> int:
+        return len(self.levels)
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @classmethod
+    def build(cls, graph: WorkflowGraph) -> "ExecutionPlan":
+        order = graph.get_topological_order()
+        position = {node_id: i for i, node_id in enumerate(order)}
+        nx_graph = graph.graph
+        successors = tuple(tuple(position[s] for s in nx_graph.successors(n)) for n in order)
+        predecessors: List[List[int]] = [[] for _ in order]
+        for i, succ in enumerate(successors):
+            for j in succ:
+                predecessors[j].append(i)
+
+        # Earliest level: longest path from any source (forward pass)
+        earliest = [0] * len(order)
+        for i in range(len(order)):
+            if predecessors[i]:
+                earliest[i] = max(earliest[p] for p in predecessors[i]) + 1
+        last_level = max(earliest, default=-1)
+
+        # Latest level that keeps the overall depth (backward pass)
+        latest = [last_level] * len(order)
+        for i in range(len(order) - 1, -1, -1):
+            if successors[i]:
+                latest[i] = min(latest[s] for s in successors[i]) - 1
+        slack = tuple(l - e for e, l in zip(earliest, latest))
+
+        levels: List[List[str]] = [[] for _ in range(last_level + 1)]
+        for i, node_id in enumerate(order):
+            levels[earliest[i]].append(node_id)
+
+        # Walk zero-slack nodes level by level, preferring plan order on ties
+        critical: List[str] = []
+        current: Optional[int] = next((i for i in range(len(order)) if earliest[i] == 0 and slack[i] == 0), None)
+        while current is not None:
+            critical.append(order[current])
+            current = next(
+                (s for s in sorted(successors[current]) if slack[s] == 0 and earliest[s] == earliest[current] + 1),
+                None
+            )
+
+        return cls(
+            graph_version=graph.version,
+            order=tuple(order),
+            levels=tuple(tuple(level) for level in levels),
+            level=tuple(earliest),
+            slack=slack,
+            critical_path=tuple(critical),
+            successors=successors,
+            in_degree=tuple(len(p) for p in predecessors),
+            predecessors=tuple(tuple(p) for p in predecessors),
+            _position=position
+        )
+
 class TopologicalScheduler:
-    """Simple scheduler that respects node dependencies."""
+    """Scheduler that respects node dependencies, caching its plan until the graph changes."""
     
     def __init__(self, graph: WorkflowGraph):
         self.graph = graph
+        self._plan: Optional[ExecutionPlan] = None
+
+    def get_plan(self) -> ExecutionPlan:
+        """Returns the cached plan, rebuilding it only if the graph was mutated."""
+        if self._plan is None or self._plan.graph_version != self.graph.version:
+            self._plan = ExecutionPlan.build(self.graph)
+        return self._plan
 
     def get_execution_plan(self) -> List[str]:
         """Returns the topological order of node IDs."""
-        return self.graph.get_topological_order()
+        return list(self.get_plan().order)
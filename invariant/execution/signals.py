@@ -1,7 +1,19 @@
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 import time
 
+import numpy as np
+
+# Per-execution flags, also stored verbatim in trace archives
+FLAG_DROPPED = 0x1      # executed, but its output message was lost
+FLAG_STARVED = 0x2      # never executed because an upstream output was lost
+RETRY_SHIFT = 8         # bits 8-15: retries spent before the final attempt
+RETRY_MASK = 0xFF << RETRY_SHIFT
+
+def encode_flags(dropped, retries):
+    """Packs drop state and retry count (saturating at 255) into FLAG_* bits; works on scalars and arrays."""
+    return (np.asarray(dropped, dtype=np.uint32) * FLAG_DROPPED) | (np.minimum(retries, 0xFF).astype(np.uint32) << RETRY_SHIFT)
+
 @dataclass
 class ExecutionSignal:
     """Captured signal from a single node execution."""
@@ -16,16 +28,336 @@ class ExecutionSignal:
     def duration_ms(self) -> float:
         return (self.end_time - self.start_time) * 1000
 
-@dataclass
 class WorkflowExecutionTrace:
-    """Full trace of a workflow execution run."""
-    run_id: str
-    timestamp: float
-    signals: List[ExecutionSignal] = field(default_factory=list)
-    perturbations_applied: List[Dict[str, Any]] = field(default_factory=list)
+    """
+    Full trace of a workflow execution run.
+    Signals are stored column-wise (node index / start / end arrays plus an
+    interned node-id table); ExecutionSignal objects are only built when
+    `signals` is read.
+    """
+
+    _INITIAL_CAPACITY = 16
+
+    def __init__(self, run_id: str, timestamp: float,
+                 signals: Optional[List[ExecutionSignal]] = None,
+                 perturbations_applied: Optional[List[Dict[str, Any]]] = None):
+        self.run_id = run_id
+        self.timestamp = timestamp
+        self._perturbations: List[Dict[str, Any]] = perturbations_applied if perturbations_applied is not None else []
+
+        # Interned node table: node_table[i] is the id behind node index i
+        self.node_table: List[str] = []
+        self.node_types: List[Optional[str]] = []
+        self._node_lookup: Dict[str, int] = {}
+
+        self._node_index = np.empty(self._INITIAL_CAPACITY, dtype=np.int32)
+        self._start_times = np.empty(self._INITIAL_CAPACITY, dtype=np.float64)
+        self._end_times = np.empty(self._INITIAL_CAPACITY, dtype=np.float64)
+        # Drop/retry flags per execution; only allocated once something is flagged
+        self._flags: Optional[np.ndarray] = None
+        self._size = 0
+        # Nodes that never ran in this trace (upstream output lost)
+        self._starved = np.empty(0, dtype=np.int32)
+
+        # Hashes/metadata for the rare signals that carry more than a node type
+        self._extras: Dict[int, Tuple[Dict[str, str], Dict[str, str], Dict[str, Any]]] = {}
+        # True while columns and node table are borrowed from someone else (see from_arrays)
+        self._borrowed = False
+        self._signal_cache: Optional[List[ExecutionSignal]] = None
+
+        for signal in signals or []:
+            self.add_signal(signal)
+
+    @classmethod
+    def from_arrays(cls, run_id: str, timestamp: float, node_table: List[str],
+                    node_index: np.ndarray, start_times: np.ndarray, end_times: np.ndarray,
+                    node_types: Optional[List[Optional[str]]] = None, flags: Optional[np.ndarray] = None,
+                    starved: Optional[np.ndarray] = None) -> "WorkflowExecutionTrace":
+        """Wraps existing columns without copying them (the node table is shared, not copied)."""
+        trace = cls(run_id=run_id, timestamp=timestamp)
+        trace.node_table = node_table
+        trace.node_types = node_types if node_types is not None else [None] * len(node_table)
+        trace._node_lookup = {node_id: i for i, node_id in enumerate(node_table)}
+        trace._node_index = np.asarray(node_index, dtype=np.int32)
+        trace._start_times = np.asarray(start_times, dtype=np.float64)
+        trace._end_times = np.asarray(end_times, dtype=np.float64)
+        trace._size = len(trace._node_index)
+        if flags is not None:
+            trace._flags = np.asarray(flags, dtype=np.uint32)
+        if starved is not None:
+            trace._starved = np.asarray(starved, dtype=np.int32)
+        trace._borrowed = True
+        return trace
+
+    # --- columnar access -------------------------------------------------
+
+    @property
+    def node_index(self) -> np.ndarray:
+        return self._node_index[:self._size]
+
+    @property
+    def start_times(self) -> np.ndarray:
+        return self._start_times[:self._size]
+
+    @property
+    def end_times(self) -> np.ndarray:
+        return self._end_times[:self._size]
+
+    @property
+    def flags(self) -> np.ndarray:
+        if self._flags is None:
+            return np.zeros(self._size, dtype=np.uint32)
+        return self._flags[:self._size]
+
+    @property
+    def has_drops(self) -> bool:
+        return len(self._starved) > 0 or (self._flags is not None and bool(self._flags[:self._size].any()))
+
+    @property
+    def starved_nodes(self) -> List[str]:
+        return [self.node_table[i] for i in self._starved.tolist()]
+
+    @property
+    def starved_index(self) -> np.ndarray:
+        return self._starved
+
+    def durations_ms(self) -> np.ndarray:
+        return (self.end_times - self.start_times) * 1000
+
+    def __len__(self) -> int:
+        return self._size
+
+    # --- recording -------------------------------------------------------
+
+    def _intern(self, node_id: str, node_type: Optional[str]) -> int:
+        idx = self._node_lookup.get(node_id)
+        if idx is None:
+            idx = len(self.node_table)
+            self._node_lookup[node_id] = idx
+            self.node_table.append(node_id)
+            self.node_types.append(node_type)
+        elif self.node_types[idx] is None and node_type is not None:
+            self.node_types[idx] = node_type
+        return idx
+
+    def _grow(self):
+        capacity = max(self._INITIAL_CAPACITY, 2 * self._size)
+        for name in ("_node_index", "_start_times", "_end_times", "_flags"):
+            old = getattr(self, name)
+            if old is None:
+                continue
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _own(self):
+        # Copy-on-write: never mutate columns or a node table shared with a batch
+        if self._borrowed:
+            self.node_table = list(self.node_table)
+            self.node_types = list(self.node_types)
+            self._starved = self._starved.copy()
+            self._grow()
+            self._borrowed = False
+
+    def record(self, node_id: str, start_time: float, end_time: float, node_type: Optional[str] = None,
+               flags: int = 0):
+        """Appends one execution without building an ExecutionSignal."""
+        if self._borrowed:
+            self._own()
+        elif self._size == len(self._node_index):
+            self._grow()
+        if flags and self._flags is None:
+            self._flags = np.zeros(len(self._node_index), dtype=np.uint32)
+        idx = self._intern(node_id, node_type)
+        self._node_index[self._size] = idx
+        self._start_times[self._size] = start_time
+        self._end_times[self._size] = end_time
+        if self._flags is not None:
+            self._flags[self._size] = flags
+        self._size += 1
+        self._signal_cache = None
+
+    def record_starved(self, node_id: str, node_type: Optional[str] = None):
+        """Notes a node that never ran because one of its inputs was lost."""
+        self._own()
+        self._starved = np.append(self._starved, np.int32(self._intern(node_id, node_type)))
 
     def add_signal(self, signal: ExecutionSignal):
-        self.signals.append(signal)
+        node_type = signal.metadata.get("type")
+        position = self._size
+        self.record(signal.node_id, signal.start_time, signal.end_time, node_type)
+        plain = (
+            not signal.input_data_hashes
+            and not signal.output_data_hashes
+            and signal.metadata == ({"type": node_type} if node_type is not None else {})
+            and self.node_types[self._node_lookup[signal.node_id]] == node_type
+        )
+        if not plain:
+            self._extras[position] = (signal.input_data_hashes, signal.output_data_hashes, signal.metadata)
+
+    # --- object views ----------------------------------------------------
+
+    def _materialize(self, position: int, node_idx: int, start_t: float, end_t: float) -> ExecutionSignal:
+        extras = self._extras.get(position)
+        if extras is not None:
+            inputs, outputs, metadata = extras
+            return ExecutionSignal(self.node_table[node_idx], start_t, end_t, inputs, outputs, metadata)
+        node_type = self.node_types[node_idx]
+        return ExecutionSignal(
+            node_id=self.node_table[node_idx],
+            start_time=start_t,
+            end_time=end_t,
+            metadata={"type": node_type} if node_type is not None else {}
+        )
+
+    @property
+    def signals(self) -> List[ExecutionSignal]:
+        """ExecutionSignal views of the columns, built on first access."""
+        if self._signal_cache is None:
+            self._signal_cache = [
+                self._materialize(i, n, s, e)
+                for i, (n, s, e) in enumerate(zip(self.node_index.tolist(), self.start_times.tolist(), self.end_times.tolist()))
+            ]
+        return self._signal_cache
+
+    @property
+    def perturbations_applied(self) -> List[Dict[str, Any]]:
+        """Explicitly attached perturbations plus drop/retry/starve events, materialized from the flag columns."""
+        events = list(self._perturbations)
+        if self._flags is not None:
+            flags = self.flags
+            for pos in np.flatnonzero(flags).tolist():
+                flag = int(flags[pos])
+                node_id = self.node_table[self._node_index[pos]]
+                retries = (flag & RETRY_MASK) >> RETRY_SHIFT
+                if retries:
+                    events.append({"type": "retry", "node_id": node_id, "retries": retries})
+                if flag & FLAG_DROPPED:
+                    events.append({"type": "drop", "node_id": node_id})
+        events.extend({"type": "starved", "node_id": node_id} for node_id in self.starved_nodes)
+        return events
+
+    @perturbations_applied.setter
+    def perturbations_applied(self, value: List[Dict[str, Any]]):
+        self._perturbations = value
 
     def get_node_latencies(self) -> Dict[str, float]:
-        return {s.node_id: s.duration_ms for s in self.signals}
+        """Latency per node in ms; for repeated executions the last one wins."""
+        node_index = self.node_index
+        if not len(node_index):
+            return {}
+        durations = self.durations_ms()
+        # Position of the last execution of every node, in order of appearance
+        _, reversed_pos = np.unique(node_index[::-1], return_index=True)
+        last_pos = np.sort(len(node_index) - 1 - reversed_pos)
+        return {self.node_table[n]: d for n, d in zip(node_index[last_pos].tolist(), durations[last_pos].tolist())}
+
+@dataclass
+class SignalColumns:
+    """Signals of several traces flattened into shared columns."""
+    node_ids: List[str]          # global node table
+    node_index: np.ndarray       # int32 index into node_ids, per signal
+    run_index: np.ndarray        # int32 position of the source trace, per signal
+    durations_ms: np.ndarray     # float64, per signal
+    start_times: Optional[np.ndarray] = None  # float64, per signal
+
+def concat_traces(traces: Iterable[WorkflowExecutionTrace]) -> SignalColumns:
+    """Flattens traces into columns with a single node table (ids ordered by first appearance)."""
+    node_ids: List[str] = []
+    lookup: Dict[str, int] = {}
+    node_parts, run_parts, duration_parts, start_parts = [], [], [], []
+    # id -> (table, remap). Holding the table keeps its id from being reused
+    # when `traces` is a generator that frees earlier traces.
+    remap_cache: Dict[int, Tuple[List[str], np.ndarray]] = {}
+
+    for run, trace in enumerate(traces):
+        # Traces from one batch share a node table; remap it only once
+        cached = remap_cache.get(id(trace.node_table))
+        remap = cached[1] if cached is not None and cached[0] is trace.node_table else None
+        if remap is None or len(remap) != len(trace.node_table):
+            remap = np.empty(len(trace.node_table), dtype=np.int32)
+            for i, node_id in enumerate(trace.node_table):
+                if node_id not in lookup:
+                    lookup[node_id] = len(node_ids)
+                    node_ids.append(node_id)
+                remap[i] = lookup[node_id]
+            remap_cache[id(trace.node_table)] = (trace.node_table, remap)
+        node_parts.append(remap[trace.node_index])
+        run_parts.append(np.full(len(trace), run, dtype=np.int32))
+        duration_parts.append(trace.durations_ms())
+        start_parts.append(trace.start_times)
+
+    if not node_parts:
+        empty_i = np.empty(0, dtype=np.int32)
+        return SignalColumns(node_ids, empty_i, empty_i.copy(), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
+    return SignalColumns(
+        node_ids=node_ids,
+        node_index=np.concatenate(node_parts),
+        run_index=np.concatenate(run_parts),
+        durations_ms=np.concatenate(duration_parts),
+        start_times=np.concatenate(start_parts)
+    )
+
+@dataclass
+class TraceBatch:
+    """Columnar batch of runs: one row per run, one column per node in plan order."""
+    run_id: str
+    timestamp: float
+    node_ids: List[str]
+    node_types: List[str]
+    start_times: np.ndarray  # (n_runs, n_nodes) float64, virtual seconds
+    end_times: np.ndarray    # (n_runs, n_nodes) float64, virtual seconds
+    # (n_runs, n_nodes) uint32 FLAG_* bits, None when nothing was dropped.
+    # Starved cells have zero duration and are left out of per-run traces.
+    flags: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.start_times.shape[0]
+
+    @property
+    def n_runs(self) -> int:
+        return self.start_times.shape[0]
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_ids)
+
+    def durations_ms(self) -> np.ndarray:
+        return (self.end_times - self.start_times) * 1000
+
+    @property
+    def executed(self) -> np.ndarray:
+        """(n_runs, n_nodes) bool mask of cells that actually ran."""
+        if self.flags is None:
+            return np.ones(self.start_times.shape, dtype=bool)
+        return (self.flags & FLAG_STARVED) == 0
+
+    def trace(self, run_index: int) -> WorkflowExecutionTrace:
+        """Returns a single run as a trace viewing this batch's rows (no copy unless the run had drops)."""
+        if self.flags is not None and self.flags[run_index].any():
+            row = self.flags[run_index]
+            ran = (row & FLAG_STARVED) == 0
+            positions = np.arange(self.n_nodes, dtype=np.int32)
+            return WorkflowExecutionTrace.from_arrays(
+                run_id=self.run_id,
+                timestamp=self.timestamp,
+                node_table=self.node_ids,
+                node_index=positions[ran],
+                start_times=self.start_times[run_index][ran],
+                end_times=self.end_times[run_index][ran],
+                node_types=self.node_types,
+                flags=row[ran],
+                starved=positions[~ran]
+            )
+        return WorkflowExecutionTrace.from_arrays(
+            run_id=self.run_id,
+            timestamp=self.timestamp,
+            node_table=self.node_ids,
+            node_index=np.arange(self.n_nodes, dtype=np.int32),
+            start_times=self.start_times[run_index],
+            end_times=self.end_times[run_index],
+            node_types=self.node_types
+        )
+
+    def to_traces(self) -> List[WorkflowExecutionTrace]:
+        return [self.trace(i) for i in range(self.n_runs)]
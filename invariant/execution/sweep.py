@@ -0,0 +1,184 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .engine import DeterministicEngine
+from .perturbation import PerturbationModel
+from .signals import TraceBatch
+from .result_cache import ResultCache, result_key
+from ..core.config import ExperimentConfig
+from ..workflow.graph import WorkflowGraph
+from ..workflow.cache import graph_hash
+from ..validation.base import ValidationResult
+from ..validation.structural import StructuralValidator
+from ..validation.temporal import TemporalValidator
+from ..validation.behavioral import BehavioralValidator
+from ..validation.metrics import StabilityMetrics
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """A single perturbation configuration in a parameter sweep."""
+    seed: int
+    latency_max_ms: float
+    jitter_ms: float = 0.0
+    drop_probability: float = 0.0
+
+    def to_model(self) -> PerturbationModel:
+        return PerturbationModel(
+            latency_max_ms=self.latency_max_ms,
+            jitter_ms=self.jitter_ms,
+            drop_probability=self.drop_probability,
+            seed=self.seed
+        )
+
+    def to_config_data(self, workflow_hash: str, runs: int) -> Dict[str, Any]:
+        # The workflow's content hash, not its path: the same file reached by
+        # another path must give the same config hash (and cache key)
+        return {
+            "workflow": workflow_hash,
+            "runs": runs,
+            "seed": self.seed,
+            "latency_max_ms": self.latency_max_ms,
+            "jitter_ms": self.jitter_ms,
+            "drop_probability": self.drop_probability
+        }
+
+@dataclass
+class SweepResult:
+    """Validation outcome of one sweep point."""
+    config_hash: str
+    point: SweepPoint
+    results: List[ValidationResult]
+    stability_score: float
+    batch: Optional[TraceBatch] = None
+    # Served from the result cache instead of executed
+    cached: bool = False
+
+def build_grid(seeds: Sequence[int],
+               latency_max_ms: Sequence[float],
+               jitter_ms: Sequence[float] = (0.0,),
+               drop_probability: Sequence[float] = (0.0,)) -> List[SweepPoint]:
+    """Cartesian product of the given parameter values, in a stable order."""
+    return [
+        SweepPoint(seed=s, latency_max_ms=l, jitter_ms=j, drop_probability=d)
+        for s, l, j, d in itertools.product(seeds, latency_max_ms, jitter_ms, drop_probability)
+    ]
+
+# Per-process graph, installed once by the pool initializer instead of pickled per task
+_WORKER_GRAPH: Optional[WorkflowGraph] = None
+
+def _init_worker(graph: WorkflowGraph):
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = graph
+
+def _point_config(point: SweepPoint, workflow_hash: str, runs: int, timestamp: float) -> ExperimentConfig:
+    config = ExperimentConfig(point.to_config_data(workflow_hash, runs), timestamp=timestamp)
+    # Derive the run id from the config so results don't depend on which worker ran them
+    config.run_id = f"sweep-{config.config_hash[:12]}"
+    return config
+
+def _run_point(graph: WorkflowGraph, point: SweepPoint, workflow_hash: str, runs: int, timestamp: float,
+               keep_traces: bool = False) -> SweepResult:
+    config = _point_config(point, workflow_hash, runs, timestamp)
+
+    engine = DeterministicEngine(graph, config)
+    engine.set_perturbation(point.to_model())
+    batch = engine.run_batch(runs)
+    traces = batch.to_traces()
+
+    validators = [StructuralValidator(), TemporalValidator(), BehavioralValidator()]
+    results = [v.validate(graph, traces) for v in validators]
+
+    return SweepResult(
+        config_hash=config.config_hash,
+        point=point,
+        results=results,
+        stability_score=StabilityMetrics.compute_stability_score(results),
+        batch=batch if keep_traces else None
+    )
+
+def _run_point_in_worker(point: SweepPoint, workflow_hash: str, runs: int, timestamp: float,
+                         keep_traces: bool) -> SweepResult:
+    return _run_point(_WORKER_GRAPH, point, workflow_hash, runs, timestamp, keep_traces)
+
+class SweepExecutor:
+    """Fans a grid of perturbation configurations out across a process pool."""
+
+    def __init__(self, graph: WorkflowGraph, workflow: str, runs: int = 5,
+                 workers: Optional[int] = None, timestamp: Optional[float] = None,
+                 keep_traces: bool = False, result_cache: Optional[ResultCache] = None):
+        self.graph = graph
+        # Display name only; configs record the graph's content hash
+        self.workflow = workflow
+        self.runs = runs
+        self.workers = workers or os.cpu_count() or 1
+        # One shared virtual start time so every worker produces identical traces
+        self.timestamp = time.time() if timestamp is None else timestamp
+        # Ship each point's TraceBatch back to the parent (e.g. for archiving)
+        self.keep_traces = keep_traces
+        # Points already computed for this graph are served from here; new ones are added
+        self.result_cache = result_cache
+        self._graph_hash = graph_hash(graph)
+
+    def _from_cache(self, point: SweepPoint) -> Optional[SweepResult]:
+        config_hash = _point_config(point, self._graph_hash, self.runs, self.timestamp).config_hash
+        hit = self.result_cache.get(result_key(self._graph_hash, config_hash))
+        if hit is None:
+            return None
+        try:
+            batch = hit.batch() if self.keep_traces else None
+        except (OSError, ValueError):
+            return None
+        return SweepResult(
+            config_hash=config_hash,
+            point=point,
+            results=hit.results,
+            stability_score=StabilityMetrics.compute_stability_score(hit.results),
+            batch=batch,
+            cached=True
+        )
+
+    def _store(self, res: SweepResult) -> SweepResult:
+        self.result_cache.put(result_key(self._graph_hash, res.config_hash), res.batch, res.results,
+                              res.point.to_config_data(self._graph_hash, self.runs))
+        if not self.keep_traces:
+            res.batch = None
+        return res
+
+    def iter_results(self, points: Iterable[SweepPoint]) -> Iterator[SweepResult]:
+        """Yields results as they complete. Completion order depends on scheduling; content does not."""
+        points = list(dict.fromkeys(points))
+        # The cache needs every computed batch, whether or not the caller keeps it
+        keep_traces = self.keep_traces or self.result_cache is not None
+        finish = self._store if self.result_cache is not None else (lambda res: res)
+        if self.result_cache is not None:
+            pending = []
+            for point in points:
+                res = self._from_cache(point)
+                if res is None:
+                    pending.append(point)
+                else:
+                    yield res
+            points = pending
+
+        if self.workers <= 1 or len(points) <= 1:
+            for point in points:
+                yield finish(_run_point(self.graph, point, self._graph_hash, self.runs, self.timestamp, keep_traces))
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.graph,)) as pool:
+            futures = [
+                pool.submit(_run_point_in_worker, point, self._graph_hash, self.runs, self.timestamp, keep_traces)
+                for point in points
+            ]
+            for future in as_completed(futures):
+                yield finish(future.result())
+
+    def run(self, points: Iterable[SweepPoint]) -> Dict[str, SweepResult]:
+        """Runs the full sweep and returns results keyed by config hash, in grid order."""
+        points = list(dict.fromkeys(points))
+        collected = {r.point: r for r in self.iter_results(points)}
+        return {collected[p].config_hash: collected[p] for p in points}
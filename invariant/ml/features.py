@@ -21,11 +21,10 @@ class AggregatedFeatureExtractor:
         if not traces:
              return np.array(graph_feats + [0, 0, 0, 0])
              
-        all_latencies = []
-        for trace in traces:
-            for signal in trace.signals:
-                all_latencies.append(signal.duration_ms)
-        
+        all_latencies = np.concatenate([trace.durations_ms() for trace in traces])
+        if not len(all_latencies):
+             return np.array(graph_feats + [0, 0, 0, len(traces)], dtype=np.float32)
+
         temporal_feats = [
             np.mean(all_latencies),
             np.std(all_latencies),
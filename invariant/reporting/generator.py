@@ -34,7 +34,8 @@ class ReportGenerator:
                     "validator_id": r.validator_id,
                     "pass": r.pass_status,
                     "message": r.message,
-                    "metrics": r.metrics
+                    "metrics": r.metrics,
+                    "run_metrics": r.run_metrics
                 } for r in results
             ]
         }
@@ -1,19 +1,151 @@
-import requests
-import time
+import atexit
+import gzip
 import json
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
 from ..core.outcome import SafetyOutcome, Decision
 from ..core.types import SystemState, ProposedAction
 
 class TelemetryBridge:
-    def __init__(self, endpoint: str = "http://localhost:8000"):
+    """
+    Ships safety decisions to the telemetry backend without blocking the caller.
+    log_decision() only appends to a bounded ring buffer; a background thread
+    drains it, batches decisions into one newline-delimited JSON request and
+    posts it over a pooled keep-alive session. When the buffer is full the
+    oldest pending decision is discarded and counted in `dropped`.
+    """
+
+    BATCH_PATH = "/api/v1/telemetry/decisions:batch"
+
+    def __init__(self, endpoint: str = "http://localhost:8000", capacity: int = 4096,
+                 max_batch: int = 256, flush_interval_s: float = 0.05, compress: bool = False):
         self.endpoint = endpoint
         self.enabled = True
+        self.capacity = capacity
+        self.max_batch = max_batch
+        self.flush_interval_s = flush_interval_s
+        self.compress = compress
+
+        # deque append/popleft are atomic, so producers never take a lock
+        self._queue: deque = deque(maxlen=capacity)
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._in_flight = 0
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self._atexit_registered = False
+        self._session = None
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
 
     def log_decision(self, state: SystemState, action: ProposedAction, outcome: SafetyOutcome):
         if not self.enabled:
             return
+        if self._worker is None:
+            self._start()
+
+        # Serialization happens on the sender thread; only references are queued
+        if len(self._queue) >= self.capacity:
+            self.dropped += 1
+        self._queue.append((action, outcome))
+        self.enqueued += 1
+        if len(self._queue) >= self.max_batch:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "pending": len(self._queue),
+        }
+
+    def flush(self, timeout: float = 1.0) -> bool:
+        """Blocks until everything queued so far has been sent (or failed). Returns False on timeout."""
+        if self._worker is None:
+            return not self._queue
+        deadline = time.monotonic() + timeout
+        while self._queue or self._in_flight:
+            self._wakeup.set()
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout: float = 1.0):
+        """Flushes pending decisions and stops the sender thread."""
+        if self._worker is None:
+            return
+        self.flush(timeout)
+        self._stopping = True
+        self._wakeup.set()
+        self._worker.join(timeout)
+        self._worker = None
+        self._stopping = False
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    # --- sender thread ---------------------------------------------------
+
+    def _start(self):
+        with self._worker_lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, name="invariant-telemetry", daemon=True)
+            self._worker.start()
+            # close() leaves the bridge restartable; one exit hook covers every restart
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.flush_interval_s)
+            self._wakeup.clear()
+            while self._queue:
+                self._send_batch()
 
-        payload = {
+    def _send_batch(self):
+        batch = []
+        self._in_flight = 1
+        try:
+            while self._queue and len(batch) < self.max_batch:
+                batch.append(self._queue.popleft())
+            if not batch:
+                return
+
+            body = "\n".join(json.dumps(self._to_payload(a, o)) for a, o in batch).encode("utf-8")
+            headers = {"Content-Type": "application/x-ndjson"}
+            if self.compress:
+                body = gzip.compress(body)
+                headers["Content-Encoding"] = "gzip"
+
+            try:
+                if self._session is None:
+                    # Imported here so loading the supervisor doesn't pull in requests
+                    import requests
+                    self._session = requests.Session()
+                response = self._session.post(f"{self.endpoint}{self.BATCH_PATH}", data=body, headers=headers, timeout=1.0)
+                if response.status_code >= 400:
+                    self.failed += len(batch)
+                else:
+                    self.sent += len(batch)
+            except Exception:
+                # Fail silently to not crash the robot
+                self.failed += len(batch)
+        finally:
+            self._in_flight = 0
+
+    @staticmethod
+    def _to_payload(action: ProposedAction, outcome: SafetyOutcome) -> Dict[str, Any]:
+        return {
             "decision": outcome.decision.value,
             "reason": outcome.reason,
             "violations": [
@@ -26,19 +158,6 @@ class TelemetryBridge:
             "original_action_id": action.action_id,
             "processing_time_ms": outcome.processing_time_ms
         }
-        
-        try:
-            # In a real high-frequency loop, this MUST be async or off-thread.
-            # detailed implementation would use a Queue + Worker Thread.
-            # sending sync for prototype simplicity (with short timeout)
-            requests.post(
-                f"{self.endpoint}/api/v1/telemetry/decision", 
-                json=payload,
-                timeout=0.1
-            )
-        except Exception:
-            # Fail silently to not crash the robot
-            pass
 
 class ConsoleTelemetryBridge(TelemetryBridge):
     def log_decision(self, state, action, outcome):
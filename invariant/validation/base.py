@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 from dataclasses import dataclass
 from ..execution.signals import WorkflowExecutionTrace
 from ..workflow.graph import WorkflowGraph
@@ -10,8 +10,50 @@ class ValidationResult:
     validator_id: str
     message: str
     metrics: Dict[str, Any] = None
+    # Metrics of whole runs rather than of single nodes, kept apart so they
+    # can't collide with node ids in `metrics` (e.g. behavioral divergence)
+    run_metrics: Dict[str, Any] = None
+
+class IncrementalValidator(ABC):
+    """Validator fed one trace at a time; memory stays bounded however long the stream runs."""
+
+    validator_id: str = ""
+
+    @abstractmethod
+    def update(self, trace: WorkflowExecutionTrace):
+        pass
+
+    @abstractmethod
+    def result(self) -> ValidationResult:
+        pass
+
+    def update_many(self, traces: Iterable[WorkflowExecutionTrace]):
+        for trace in traces:
+            self.update(trace)
 
 class BaseValidator(ABC):
     @abstractmethod
     def validate(self, graph: WorkflowGraph, traces: List[WorkflowExecutionTrace]) -> ValidationResult:
         pass
+
+    def incremental(self, graph: WorkflowGraph) -> IncrementalValidator:
+        """
+        Streaming counterpart of this validator, for sweeps or live systems too long to buffer.
+        The default buffers every trace and calls validate() on result(); built-in
+        validators override it with bounded-memory versions.
+        """
+        return BufferedValidator(self, graph)
+
+class BufferedValidator(IncrementalValidator):
+    """Adapts a batch-only validator to the incremental interface by keeping every trace."""
+
+    def __init__(self, validator: BaseValidator, graph: WorkflowGraph):
+        self.validator = validator
+        self.graph = graph
+        self.traces: List[WorkflowExecutionTrace] = []
+
+    def update(self, trace: WorkflowExecutionTrace):
+        self.traces.append(trace)
+
+    def result(self) -> ValidationResult:
+        return self.validator.validate(self.graph, self.traces)
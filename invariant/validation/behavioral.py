@@ -1,49 +1,115 @@
 import numpy as np
-from .base import BaseValidator, ValidationResult
+from .base import BaseValidator, IncrementalValidator, ValidationResult
 from ..workflow.graph import WorkflowGraph
-from ..execution.signals import WorkflowExecutionTrace
-from typing import List, Dict
+from ..execution.signals import WorkflowExecutionTrace, concat_traces
+from typing import List, Dict, Optional
+
+def divergence_from_moments(run_mean: np.ndarray, run_var: np.ndarray) -> Dict[str, float]:
+    """
+    Spread of whole per-run timing vectors around their centroid.
+    Mean squared pairwise distance between runs is 2 * sum(var), so this needs
+    no pairwise matrix. `divergence` is that spread relative to the centroid's norm.
+    """
+    total_var = float(np.sum(run_var))
+    norm = float(np.linalg.norm(run_mean))
+    return {
+        "divergence": float(np.sqrt(total_var) / norm) if norm > 0 else 0.0,
+        "pairwise_rms_ms": float(np.sqrt(2 * total_var)),
+    }
+
+def rank_instability_from_var(rank_var: np.ndarray) -> float:
+    """Mean variance of node ranks across runs, scaled so 0 = same ordering every run and 1 = random ordering."""
+    n = len(rank_var)
+    if n < 2:
+        return 0.0
+    return float(np.mean(rank_var) / ((n * n - 1) / 12.0))
+
+def node_stats(node_ids: List[str], means: np.ndarray, variances: np.ndarray, cv_threshold: float):
+    stats = {}
+    high_variance_nodes = []
+    for node_id, mean, variance in zip(node_ids, means.tolist(), variances.tolist()):
+        cv = variance / (mean**2) if mean > 0 else 0 # coefficient of variation squared
+        stats[node_id] = {
+            "mean": mean,
+            "variance": variance,
+            "cv": cv
+        }
+        # arbitrary threshold for v1 "instability"
+        if cv > cv_threshold:
+            high_variance_nodes.append(node_id)
+    return stats, high_variance_nodes
+
+def build_result(stats: Dict, high_variance_nodes: List[str], run_metrics: Dict[str, float],
+                 divergence_threshold: Optional[float], rank_instability_threshold: Optional[float]) -> ValidationResult:
+    problems = []
+    if high_variance_nodes:
+        problems.append(f"High divergence in nodes: {', '.join(high_variance_nodes)}")
+    if divergence_threshold is not None and run_metrics["divergence"] > divergence_threshold:
+        problems.append(f"Run-to-run divergence {run_metrics['divergence']:.3f} exceeds {divergence_threshold}")
+    if rank_instability_threshold is not None and run_metrics["rank_instability"] > rank_instability_threshold:
+        problems.append(f"Rank instability {run_metrics['rank_instability']:.3f} exceeds {rank_instability_threshold}")
+
+    pass_status = len(problems) == 0
+    message = "Behavioral stability confirmed" if pass_status else "; ".join(problems)
+    return ValidationResult(
+        pass_status=pass_status,
+        validator_id="behavioral",
+        message=message,
+        metrics=stats,
+        run_metrics=run_metrics
+    )
 
 class BehavioralValidator(BaseValidator):
     # this class was defined to analyze the divergence across multiple execution runs.
-    
+
+    def __init__(self, cv_threshold: float = 0.5, divergence_threshold: Optional[float] = None,
+                 rank_instability_threshold: Optional[float] = None):
+        self.cv_threshold = cv_threshold
+        self.divergence_threshold = divergence_threshold
+        self.rank_instability_threshold = rank_instability_threshold
+
     def validate(self, graph: WorkflowGraph, traces: List[WorkflowExecutionTrace]) -> ValidationResult:
         if len(traces) < 2:
             return ValidationResult(True, "behavioral", "Insufficient traces for behavioral analysis (need at least 2)")
-        
-        # Aggregate latencies per node across all traces
-        node_latencies: Dict[str, List[float]] = {}
-        for trace in traces:
-            for signal in trace.signals:
-                if signal.node_id not in node_latencies:
-                    node_latencies[signal.node_id] = []
-                node_latencies[signal.node_id].append(signal.duration_ms)
-                
-        # calculate the variance and entropy (simplified) per node
-        stats = {}
-        high_variance_nodes = []
-        
-        for node_id, latencies in node_latencies.items():
-            variance = float(np.var(latencies))
-            mean = float(np.mean(latencies))
-            cv = variance / (mean**2) if mean > 0 else 0 # coefficient of variation squared
-            
-            stats[node_id] = {
-                "mean": mean,
-                "variance": variance,
-                "cv": cv
-            }
-            
-            # arbitrary threshold for v1 "instability"
-            if cv > 0.5:
-                high_variance_nodes.append(node_id)
-                
-        pass_status = len(high_variance_nodes) == 0
-        message = "Behavioral stability confirmed" if pass_status else f"High divergence in nodes: {', '.join(high_variance_nodes)}"
-        
-        return ValidationResult(
-            pass_status=pass_status,
-            validator_id="behavioral",
-            message=message,
-            metrics=stats
-        )
+
+        # Group latencies per node across all traces in one columnar pass
+        columns = concat_traces(traces)
+        n_nodes = len(columns.node_ids)
+        n_runs = len(traces)
+        counts = np.bincount(columns.node_index, minlength=n_nodes)
+        means = np.bincount(columns.node_index, weights=columns.durations_ms, minlength=n_nodes) / np.maximum(counts, 1)
+        deviations = columns.durations_ms - means[columns.node_index]
+        variances = np.bincount(columns.node_index, weights=deviations * deviations, minlength=n_nodes) / np.maximum(counts, 1)
+
+        stats, high_variance_nodes = node_stats(columns.node_ids, means, variances, self.cv_threshold)
+        return build_result(stats, high_variance_nodes, self.run_metrics(self.latency_matrix(columns, n_runs)),
+                            self.divergence_threshold, self.rank_instability_threshold)
+
+    @staticmethod
+    def latency_matrix(columns, n_runs: int) -> np.ndarray:
+        """runs x nodes matrix of mean latency per run (NaN where a node didn't run), built in one bincount."""
+        n_nodes = len(columns.node_ids)
+        cell = columns.run_index.astype(np.int64) * n_nodes + columns.node_index
+        cell_n = np.bincount(cell, minlength=n_runs * n_nodes).reshape(n_runs, n_nodes)
+        cell_sum = np.bincount(cell, weights=columns.durations_ms, minlength=n_runs * n_nodes).reshape(n_runs, n_nodes)
+        return np.divide(cell_sum, cell_n, out=np.full((n_runs, n_nodes), np.nan), where=cell_n > 0)
+
+    @staticmethod
+    def run_metrics(matrix: np.ndarray) -> Dict[str, float]:
+        present = ~np.isnan(matrix)
+        n_present = np.maximum(present.sum(axis=0), 1)
+        run_mean = np.where(present, matrix, 0.0).sum(axis=0) / n_present
+        run_var = np.where(present, (matrix - run_mean) ** 2, 0.0).sum(axis=0) / n_present
+
+        # Missing cells take the node's mean so they don't move its rank
+        filled = np.where(present, matrix, run_mean)
+        ranks = np.argsort(np.argsort(filled, axis=1, kind="stable"), axis=1).astype(np.float64)
+
+        metrics = divergence_from_moments(run_mean, run_var)
+        metrics["rank_instability"] = rank_instability_from_var(ranks.var(axis=0))
+        return metrics
+
+    def incremental(self, graph: WorkflowGraph) -> IncrementalValidator:
+        from .streaming import StreamingBehavioralValidator
+        return StreamingBehavioralValidator(graph, self.cv_threshold, self.divergence_threshold,
+                                            self.rank_instability_threshold)
@@ -0,0 +1,345 @@
+from bisect import insort
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .base import IncrementalValidator, ValidationResult
+from .behavioral import divergence_from_moments, rank_instability_from_var, node_stats
+from .behavioral import build_result as build_behavioral_result
+from .temporal import REPORTED_PERCENTILES, parse_percentile, check_node, build_result
+from ..workflow.graph import WorkflowGraph
+from ..execution.signals import WorkflowExecutionTrace
+
+class P2Quantile:
+    """
+    P² streaming quantile estimator (Jain & Chlamtac, 1985).
+    Tracks one quantile with five markers, so memory is constant however many
+    observations arrive. Exact for the first five samples.
+    """
+
+    __slots__ = ("p", "count", "_q", "_n", "_np", "_dn")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self._q: List[float] = []
+        self._n = [0, 1, 2, 3, 4]
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float):
+        self.count += 1
+        q = self._q
+        if self.count <= 5:
+            insort(q, x)
+            return
+
+        n = self._n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._np[i] += self._dn[i]
+
+        # Nudge the three middle markers towards their desired positions
+        for i in (1, 2, 3):
+            d = self._np[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    # Parabolic step would break monotonicity; fall back to linear
+                    candidate = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = candidate
+                n[i] += step
+
+    def value(self) -> float:
+        if self.count == 0:
+            return 0.0
+        if self.count <= 5:
+            return float(np.percentile(self._q, self.p * 100))
+        return self._q[2]
+
+class NodeStreamStats:
+    """
+    Per-node running statistics over a stream of traces.
+    Mean/variance use Welford's algorithm, merged one trace at a time with
+    Chan's parallel update so each trace is a handful of vectorized ops.
+    Quantiles come from P² sketches. Memory is O(nodes), independent of the
+    number of traces.
+    """
+
+    QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+    def __init__(self, quantiles: Sequence[float] = QUANTILES):
+        self.quantiles = tuple(quantiles)
+        self.node_ids: List[str] = []
+        self._lookup: Dict[str, int] = {}
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0, dtype=np.float64)
+        self.m2 = np.zeros(0, dtype=np.float64)
+        self.max = np.zeros(0, dtype=np.float64)
+        self._sketches: List[Tuple[P2Quantile, ...]] = []
+        self.traces_seen = 0
+
+    def _index(self, node_id: str) -> int:
+        idx = self._lookup.get(node_id)
+        if idx is None:
+            idx = len(self.node_ids)
+            self._lookup[node_id] = idx
+            self.node_ids.append(node_id)
+            self._sketches.append(tuple(P2Quantile(q) for q in self.quantiles))
+            self.count = np.append(self.count, 0)
+            self.mean = np.append(self.mean, 0.0)
+            self.m2 = np.append(self.m2, 0.0)
+            self.max = np.append(self.max, -np.inf)
+        return idx
+
+    def update(self, trace: WorkflowExecutionTrace):
+        self.traces_seen += 1
+        if len(trace) == 0:
+            return
+        # Map the trace's local node table onto ours once, then work on columns
+        local_to_global = np.array([self._index(n) for n in trace.node_table], dtype=np.int64)
+        nodes = local_to_global[trace.node_index]
+        durations = trace.durations_ms()
+        size = len(self.node_ids)
+
+        n_b = np.bincount(nodes, minlength=size)
+        touched = n_b > 0
+        batch_mean = np.bincount(nodes, weights=durations, minlength=size) / np.maximum(n_b, 1)
+        dev = durations - batch_mean[nodes]
+        m2_b = np.bincount(nodes, weights=dev * dev, minlength=size)[touched]
+        mean_b = batch_mean[touched]
+
+        n_a = self.count[touched]
+        n_b = n_b[touched]
+        total = n_a + n_b
+        delta = mean_b - self.mean[touched]
+        self.mean[touched] += delta * n_b / total
+        self.m2[touched] += m2_b + delta * delta * n_a * n_b / total
+        self.count[touched] = total
+        np.maximum.at(self.max, nodes, durations)
+
+        for idx, value in zip(nodes.tolist(), durations.tolist()):
+            for sketch in self._sketches[idx]:
+                sketch.add(value)
+
+    def variance(self) -> np.ndarray:
+        # Population variance, matching np.var's default
+        return np.divide(self.m2, self.count, out=np.zeros_like(self.m2), where=self.count > 0)
+
+    def quantile(self, node_id: str, q: float) -> float:
+        return self._sketches[self._lookup[node_id]][self.quantiles.index(q)].value()
+
+    def node_summary(self, node_id: str) -> Dict[str, float]:
+        idx = self._lookup[node_id]
+        summary = {
+            "count": int(self.count[idx]),
+            "mean": float(self.mean[idx]),
+            "variance": float(self.m2[idx] / self.count[idx]) if self.count[idx] else 0.0,
+            "max": float(self.max[idx]),
+        }
+        for sketch in self._sketches[idx]:
+            summary[f"p{sketch.p * 100:g}"] = sketch.value()
+        return summary
+
+class _ColumnWelford:
+    """Welford mean/variance per column, for vectors whose columns may grow and may be partially observed."""
+
+    def __init__(self):
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0, dtype=np.float64)
+        self.m2 = np.zeros(0, dtype=np.float64)
+
+    def update(self, columns: np.ndarray, values: np.ndarray, size: int):
+        if len(self.count) < size:
+            grow = size - len(self.count)
+            self.count = np.concatenate((self.count, np.zeros(grow, dtype=np.int64)))
+            self.mean = np.concatenate((self.mean, np.zeros(grow)))
+            self.m2 = np.concatenate((self.m2, np.zeros(grow)))
+        self.count[columns] += 1
+        delta = values - self.mean[columns]
+        self.mean[columns] += delta / self.count[columns]
+        self.m2[columns] += delta * (values - self.mean[columns])
+
+    def variance(self) -> np.ndarray:
+        return np.divide(self.m2, self.count, out=np.zeros_like(self.m2), where=self.count > 0)
+
+class StreamingBehavioralValidator(IncrementalValidator):
+    """
+    BehavioralValidator over an unbounded stream of traces.
+    Run-vector divergence and rank instability come from Welford moments of
+    each run's per-node mean latency and node ranks. Ranks are taken over the
+    nodes present in each run.
+    """
+
+    validator_id = "behavioral"
+
+    def __init__(self, graph: WorkflowGraph, cv_threshold: float = 0.5, divergence_threshold: Optional[float] = None,
+                 rank_instability_threshold: Optional[float] = None):
+        self.graph = graph
+        self.cv_threshold = cv_threshold
+        self.divergence_threshold = divergence_threshold
+        self.rank_instability_threshold = rank_instability_threshold
+        self.stats = NodeStreamStats()
+        self._run_latency = _ColumnWelford()
+        self._run_rank = _ColumnWelford()
+
+    def update(self, trace: WorkflowExecutionTrace):
+        self.stats.update(trace)
+        if len(trace) == 0:
+            return
+        local_counts = np.bincount(trace.node_index, minlength=len(trace.node_table))
+        local_sums = np.bincount(trace.node_index, weights=trace.durations_ms(), minlength=len(trace.node_table))
+        present = np.flatnonzero(local_counts)
+        run_vector = local_sums[present] / local_counts[present]
+        columns = np.array([self.stats._index(trace.node_table[i]) for i in present], dtype=np.int64)
+        size = len(self.stats.node_ids)
+        self._run_latency.update(columns, run_vector, size)
+        ranks = np.argsort(np.argsort(run_vector, kind="stable")).astype(np.float64)
+        self._run_rank.update(columns, ranks, size)
+
+    def result(self) -> ValidationResult:
+        if self.stats.traces_seen < 2:
+            return ValidationResult(True, "behavioral", "Insufficient traces for behavioral analysis (need at least 2)")
+
+        stats, high_variance_nodes = node_stats(self.stats.node_ids, self.stats.mean, self.stats.variance(), self.cv_threshold)
+        for node_id, node in stats.items():
+            summary = self.stats.node_summary(node_id)
+            node.update({k: v for k, v in summary.items() if k not in node})
+
+        run_metrics = divergence_from_moments(self._run_latency.mean, self._run_latency.variance())
+        run_metrics["rank_instability"] = rank_instability_from_var(self._run_rank.variance())
+        return build_behavioral_result(stats, high_variance_nodes, run_metrics,
+                            self.divergence_threshold, self.rank_instability_threshold)
+
+class StreamingTemporalValidator(IncrementalValidator):
+    """
+    TemporalValidator over a stream: same budgets and report, with
+    percentiles (including percentile budgets) estimated by P² sketches.
+    """
+
+    validator_id = "temporal"
+
+    def __init__(self, graph: WorkflowGraph):
+        self.graph = graph
+        budget_quantiles = {
+            parse_percentile(key) / 100
+            for node in graph.nodes_map.values()
+            for key in node.constraints.percentile_budgets_ms
+        }
+        reported = tuple(q / 100 for q in REPORTED_PERCENTILES)
+        self.stats = NodeStreamStats(reported + tuple(sorted(budget_quantiles - set(reported))))
+        self._counters: Dict[str, Dict[str, float]] = {}
+        self._latest: Dict[str, float] = {}
+
+    def _counter(self, node_id: str) -> Dict[str, float]:
+        counter = self._counters.get(node_id)
+        if counter is None:
+            counter = {"breaches": 0, "timeouts": 0, "runs_seen": 0, "runs_breached": 0,
+                       "rate_checked": 0, "rate_violations": 0, "min_rate_hz": float("nan")}
+            self._counters[node_id] = counter
+        return counter
+
+    def update(self, trace: WorkflowExecutionTrace):
+        self.stats.update(trace)
+        # Group the trace's signals by node once; each node is then a contiguous slice
+        order = np.argsort(trace.node_index, kind="stable")
+        counts = np.bincount(trace.node_index, minlength=len(trace.node_table))
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        durations = trace.durations_ms()[order]
+        starts = trace.start_times[order]
+        for local in np.flatnonzero(counts).tolist():
+            node_id = trace.node_table[local]
+            rows = slice(bounds[local], bounds[local + 1])
+            constraints = self.graph.get_node(node_id).constraints
+            counter = self._counter(node_id)
+            latencies = durations[rows]
+            counter["runs_seen"] += 1
+            if constraints.max_latency_ms is not None:
+                breaches = int((latencies > constraints.max_latency_ms).sum())
+                counter["breaches"] += breaches
+                counter["runs_breached"] += breaches > 0
+            if constraints.timeout_ms is not None:
+                counter["timeouts"] += int((latencies > constraints.timeout_ms).sum())
+            if constraints.min_rate_hz is not None and latencies.size >= 2:
+                span = starts[rows].max() - starts[rows].min()
+                if span > 0:
+                    rate = (latencies.size - 1) / span
+                    counter["rate_checked"] += 1
+                    counter["rate_violations"] += rate < constraints.min_rate_hz
+                    counter["min_rate_hz"] = rate if np.isnan(counter["min_rate_hz"]) else min(counter["min_rate_hz"], rate)
+        self._latest = trace.get_node_latencies()
+
+    def result(self) -> ValidationResult:
+        if self.stats.traces_seen == 0:
+            return ValidationResult(False, "temporal", "No execution traces found")
+
+        node_metrics: Dict[str, Dict] = {}
+        violations: List[str] = []
+        not_executed: List[str] = []
+        for node_id in self.stats.node_ids:
+            summary = self.stats.node_summary(node_id)
+            if summary["count"] == 0:
+                not_executed.append(node_id)
+                continue
+            counter = self._counter(node_id)
+            stats = {
+                "count": summary["count"],
+                "mean": summary["mean"],
+                "max": summary["max"],
+                "breaches": int(counter["breaches"]),
+                "timeouts": int(counter["timeouts"]),
+                "violation_rate": counter["runs_breached"] / counter["runs_seen"] if counter["runs_seen"] else 0.0,
+                "timeout_rate": counter["timeouts"] / summary["count"] if summary["count"] else 0.0,
+                "rate_checked": int(counter["rate_checked"]),
+                "rate_violations": int(counter["rate_violations"]),
+            }
+            for q in REPORTED_PERCENTILES:
+                stats[f"p{q}"] = self.stats.quantile(node_id, q / 100)
+            constraints = self.graph.get_node(node_id).constraints
+            if constraints.min_rate_hz is not None:
+                stats["min_rate_hz"] = counter["min_rate_hz"]
+            node_metrics[node_id] = stats
+            percentile = lambda q, n=node_id: self.stats.quantile(n, q / 100)
+            violations.extend(check_node(node_id, constraints, stats, percentile))
+
+        return build_result(node_metrics, violations, dict(self._latest), self.stats.traces_seen, not_executed)
+
+class StreamingStructuralValidator(IncrementalValidator):
+    """Structural checks don't depend on traces; this only counts them, so its verdict matches StructuralValidator's."""
+
+    validator_id = "structural"
+
+    def __init__(self, graph: WorkflowGraph):
+        self.graph = graph
+        self.traces_seen = 0
+
+    def update(self, trace: WorkflowExecutionTrace):
+        self.traces_seen += 1
+
+    def result(self) -> ValidationResult:
+        invariants = self.graph.get_invariants()
+        errors = []
+        if not invariants["is_dag"]:
+            errors.append("Graph is not a DAG")
+        if invariants["num_nodes"] == 0:
+            errors.append("Graph has no nodes")
+
+        pass_status = len(errors) == 0
+        message = "Structural validation passed" if pass_status else f"Structural errors: {', '.join(errors)}"
+        return ValidationResult(pass_status, "structural", message, metrics=invariants)
@@ -1,4 +1,4 @@
-from .base import BaseValidator, ValidationResult
+from .base import BaseValidator, IncrementalValidator, ValidationResult
 from ..workflow.graph import WorkflowGraph
 from ..execution.signals import WorkflowExecutionTrace
 from typing import List
@@ -25,3 +25,7 @@ class StructuralValidator(BaseValidator):
             message=message,
             metrics=invariants
         )
+
+    def incremental(self, graph: WorkflowGraph) -> IncrementalValidator:
+        from .streaming import StreamingStructuralValidator
+        return StreamingStructuralValidator(graph)
@@ -1,39 +1,153 @@
-from .base import BaseValidator, ValidationResult
+import numpy as np
+from .base import BaseValidator, IncrementalValidator, ValidationResult
 from ..workflow.graph import WorkflowGraph
-from ..execution.signals import WorkflowExecutionTrace
-from typing import List, Dict
+from ..workflow.node import NodeConstraints
+from ..execution.signals import WorkflowExecutionTrace, concat_traces
+from typing import Callable, Dict, List, Union
+
+REPORTED_PERCENTILES = (50, 95, 99)
+
+def parse_percentile(key: Union[str, float]) -> float:
+    """'p95' / '95' / 95 -> 95.0"""
+    value = float(key[1:] if isinstance(key, str) and key.lower().startswith("p") else key)
+    if not 0 <= value <= 100:
+        raise ValueError(f"Percentile out of range: {key}")
+    return value
+
+def check_node(node_id: str, constraints: NodeConstraints, stats: Dict[str, float],
+               percentile: Callable[[float], float]) -> List[str]:
+    """Turns one node's aggregated stats into violation messages. Shared by the batch and streaming validators."""
+    violations = []
+    if constraints.max_latency_ms is not None and stats["breaches"]:
+        violations.append(
+            f"{node_id} latency exceeds budget {constraints.max_latency_ms}ms in "
+            f"{stats['breaches']}/{stats['count']} executions (max {stats['max']:.2f}ms)"
+        )
+    if constraints.timeout_ms is not None and stats["timeouts"]:
+        violations.append(
+            f"{node_id} timed out (> {constraints.timeout_ms}ms) in {stats['timeouts']}/{stats['count']} executions"
+        )
+    for key, budget in constraints.percentile_budgets_ms.items():
+        q = parse_percentile(key)
+        value = percentile(q)
+        if value > budget:
+            violations.append(f"{node_id} p{q:g} latency {value:.2f}ms exceeds budget {budget}ms")
+    if constraints.min_rate_hz is not None and stats["rate_violations"]:
+        violations.append(
+            f"{node_id} rate below {constraints.min_rate_hz}Hz in {stats['rate_violations']}/{stats['rate_checked']} runs "
+            f"(min {stats['min_rate_hz']:.2f}Hz)"
+        )
+    return violations
+
+def build_result(node_metrics: Dict[str, Dict], violations: List[str], latest: Dict[str, float], n_runs: int,
+                 not_executed: List[str] = ()) -> ValidationResult:
+    pass_status = len(violations) == 0
+    message = "Temporal constraints satisfied" if pass_status else f"Temporal violations: {len(violations)}"
+    return ValidationResult(
+        pass_status=pass_status,
+        validator_id="temporal",
+        message=message,
+        metrics={
+            "latencies": latest,
+            "nodes": node_metrics,
+            "runs": n_runs,
+            "violation_count": len(violations),
+            "violations": violations,
+            # Nodes that appear in the traces but never ran (starved in every run); no timing to check
+            "not_executed": list(not_executed)
+        }
+    )
 
 class TemporalValidator(BaseValidator):
-    """Validates execution timing against node-level constraints."""
-    
+    """Validates execution timing against node-level constraints, across every trace."""
+
     def validate(self, graph: WorkflowGraph, traces: List[WorkflowExecutionTrace]) -> ValidationResult:
         if not traces:
             return ValidationResult(False, "temporal", "No execution traces found")
-        
-        # Analyze the latest trace
-        trace = traces[-1]
-        violations = []
-        node_stats = {}
-        
-        for signal in trace.signals:
-            node = graph.get_node(signal.node_id)
-            latency = signal.duration_ms
-            node_stats[signal.node_id] = latency
-            
-            if node.constraints.max_latency_ms is not None:
-                if latency > node.constraints.max_latency_ms:
-                    violations.append(f"{signal.node_id} latency {latency:.2f}ms exceeds budget {node.constraints.max_latency_ms}ms")
-                    
-        pass_status = len(violations) == 0
-        message = "Temporal constraints satisfied" if pass_status else f"Temporal violations: {len(violations)}"
-        
-        return ValidationResult(
-            pass_status=pass_status,
-            validator_id="temporal",
-            message=message,
-            metrics={
-                "latencies": node_stats,
-                "violation_count": len(violations),
-                "violations": violations
+
+        columns = concat_traces(traces)
+        n_nodes = len(columns.node_ids)
+        n_runs = len(traces)
+        node_idx = columns.node_index
+        runs = columns.run_index
+        durations = columns.durations_ms
+
+        # One graph lookup per node rather than per signal
+        constraints = [graph.get_node(node_id).constraints for node_id in columns.node_ids]
+        max_budget = np.array([np.inf if c.max_latency_ms is None else c.max_latency_ms for c in constraints])
+        timeout = np.array([np.inf if c.timeout_ms is None else c.timeout_ms for c in constraints])
+
+        counts = np.bincount(node_idx, minlength=n_nodes)
+        breach = durations > max_budget[node_idx]
+        breaches = np.bincount(node_idx, weights=breach, minlength=n_nodes).astype(np.int64)
+        timeouts = np.bincount(node_idx, weights=durations > timeout[node_idx], minlength=n_nodes).astype(np.int64)
+
+        # Runs in which each node executed / breached at least once, from a runs x nodes count grid
+        cell = runs.astype(np.int64) * n_nodes + node_idx
+        runs_seen = (np.bincount(cell, minlength=n_runs * n_nodes).reshape(n_runs, n_nodes) > 0).sum(axis=0)
+        runs_breached = (np.bincount(cell, weights=breach, minlength=n_runs * n_nodes)
+                         .reshape(n_runs, n_nodes) > 0).sum(axis=0)
+
+        # Group by node once (an integer sort, much cheaper than a lexsort on durations);
+        # each node's signals are then a contiguous slice, sorted on their own below
+        order = np.argsort(node_idx, kind="stable")
+        grouped_durations = durations[order]
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        # Rate checks reuse the same slices; only gathered when some node has a minimum rate
+        if any(c.min_rate_hz is not None for c in constraints):
+            grouped_runs = runs[order]
+            grouped_starts = columns.start_times[order]
+
+        node_metrics: Dict[str, Dict] = {}
+        violations: List[str] = []
+        not_executed: List[str] = []
+        for j, node_id in enumerate(columns.node_ids):
+            if counts[j] == 0:
+                not_executed.append(node_id)
+                continue
+            rows = slice(bounds[j], bounds[j + 1])
+            segment = np.sort(grouped_durations[rows])
+            percentile = lambda q, seg=segment: float(np.percentile(seg, q))
+            stats = {
+                "count": int(counts[j]),
+                "mean": float(segment.mean()),
+                "max": float(segment[-1]),
+                "breaches": int(breaches[j]),
+                "timeouts": int(timeouts[j]),
+                "violation_rate": float(runs_breached[j] / runs_seen[j]),
+                "timeout_rate": float(timeouts[j] / counts[j]),
             }
-        )
+            for q, value in zip(REPORTED_PERCENTILES, np.percentile(segment, REPORTED_PERCENTILES).tolist()):
+                stats[f"p{q}"] = value
+            if constraints[j].min_rate_hz is None:
+                stats.update(rate_checked=0, rate_violations=0)
+            else:
+                stats.update(self._rate_stats(constraints[j].min_rate_hz, grouped_runs[rows], grouped_starts[rows]))
+
+            node_metrics[node_id] = stats
+            violations.extend(check_node(node_id, constraints[j], stats, percentile))
+
+        return build_result(node_metrics, violations, traces[-1].get_node_latencies(), n_runs, not_executed)
+
+    @staticmethod
+    def _rate_stats(min_rate_hz: float, node_runs: np.ndarray, starts: np.ndarray) -> Dict[str, float]:
+        """
+        Per-run execution rate of one node from its signals' runs and start times;
+        needs at least two executions in a run to measure. Linear in the node's signals.
+        """
+        run_ids, inverse, n = np.unique(node_runs, return_inverse=True, return_counts=True)
+        first = np.full(len(run_ids), np.inf)
+        last = np.full(len(run_ids), -np.inf)
+        np.minimum.at(first, inverse, starts)
+        np.maximum.at(last, inverse, starts)
+        measurable = (n >= 2) & (last > first)
+        rates = (n[measurable] - 1) / (last[measurable] - first[measurable])
+        return {
+            "rate_checked": int(measurable.sum()),
+            "rate_violations": int((rates < min_rate_hz).sum()),
+            "min_rate_hz": float(rates.min()) if rates.size else float("nan"),
+        }
+
+    def incremental(self, graph: WorkflowGraph) -> IncrementalValidator:
+        from .streaming import StreamingTemporalValidator
+        return StreamingTemporalValidator(graph)
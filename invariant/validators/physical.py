@@ -1,9 +1,16 @@
 from typing import Optional, Dict
+
+import numpy as np
+
 from ..core.interfaces import SafetyValidator
 from ..core.types import SystemState, ProposedAction, ActionType
-from ..core.outcome import Violation
+from ..core.outcome import Violation, ViolationRecord
+from ..core.batch import StateBatch, ActionBatch, BatchViolations
 
 class PhysicalConstraintValidator(SafetyValidator):
+    # Velocity limit violations are clamped rather than rejected
+    can_force_rejection = False
+
     def __init__(self, max_linear_velocity: float = 2.0, max_angular_velocity: float = 1.0):
         self.max_v = max_linear_velocity
         self.max_w = max_angular_velocity
@@ -13,6 +20,10 @@ class PhysicalConstraintValidator(SafetyValidator):
         return "PhysicalConstraints"
 
     def check(self, state: SystemState, action: ProposedAction) -> Optional[Violation]:
+        record = self.check_fast(state, action)
+        return record.to_model() if record is not None else None
+
+    def check_fast(self, state: SystemState, action: ProposedAction) -> Optional[ViolationRecord]:
         # Only check velocity commands for now
         if action.type != ActionType.VELOCITY_CMD:
             return None
@@ -23,19 +34,26 @@ class PhysicalConstraintValidator(SafetyValidator):
         w = abs(payload.get("w", 0.0))
 
         if v > self.max_v:
-            return Violation(
-                rule_id="PHYS_001",
-                description=f"Linear velocity {v:.2f} exceeds limit {self.max_v}",
-                severity="critical",
+            return ViolationRecord(
+                "PHYS_001", "critical",
+                "Linear velocity {:.2f} exceeds limit {}", (v, self.max_v),
                 context={"current_v": v, "max_v": self.max_v}
             )
         
         if w > self.max_w:
-            return Violation(
-                rule_id="PHYS_002",
-                description=f"Angular velocity {w:.2f} exceeds limit {self.max_w}",
-                severity="critical",
+            return ViolationRecord(
+                "PHYS_002", "critical",
+                "Angular velocity {:.2f} exceeds limit {}", (w, self.max_w),
                 context={"current_w": w, "max_w": self.max_w}
             )
             
         return None
+
+    def check_batch(self, states: StateBatch, actions: ActionBatch) -> BatchViolations:
+        # Same precedence as check_fast: angular only reported when linear is within limits
+        linear = actions.is_velocity_cmd & (np.abs(actions.v) > self.max_v)
+        angular = actions.is_velocity_cmd & ~linear & (np.abs(actions.w) > self.max_w)
+        return BatchViolations(
+            masks={"PHYS_001": linear, "PHYS_002": angular},
+            limits={"PHYS_001": {"max_v": self.max_v}, "PHYS_002": {"max_w": self.max_w}}
+        )
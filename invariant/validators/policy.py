@@ -1,7 +1,11 @@
 from typing import Optional
+
+import numpy as np
+
 from ..core.interfaces import SafetyValidator
 from ..core.types import SystemState, ProposedAction
-from ..core.outcome import Violation
+from ..core.outcome import Violation, ViolationRecord
+from ..core.batch import StateBatch, ActionBatch, BatchViolations
 
 class GeofenceValidator(SafetyValidator):
     def __init__(self, x_limit: float = 10.0, y_limit: float = 10.0):
@@ -13,6 +17,10 @@ class GeofenceValidator(SafetyValidator):
         return "GeofencePolicy"
 
     def check(self, state: SystemState, action: ProposedAction) -> Optional[Violation]:
+        record = self.check_fast(state, action)
+        return record.to_model() if record is not None else None
+
+    def check_fast(self, state: SystemState, action: ProposedAction) -> Optional[ViolationRecord]:
         # Simple check: If robot is OUTSIDE bounds, block any motion that moves FURTHER away
         # For simplicity in this demo, we just fault if specific zones are entered or if state says we are OOB
         
@@ -20,11 +28,14 @@ class GeofenceValidator(SafetyValidator):
         y = state.pose.get("y", 0.0)
 
         if abs(x) > self.x_limit or abs(y) > self.y_limit:
-            return Violation(
-                rule_id="GEO_001",
-                description=f"System outside operational area ({x}, {y})",
-                severity="critical",
+            return ViolationRecord(
+                "GEO_001", "critical",
+                "System outside operational area ({}, {})", (x, y),
                 context={"pose": state.pose, "limits": [self.x_limit, self.y_limit]}
             )
             
         return None
+
+    def check_batch(self, states: StateBatch, actions: ActionBatch) -> BatchViolations:
+        outside = (np.abs(states.x) > self.x_limit) | (np.abs(states.y) > self.y_limit)
+        return BatchViolations(masks={"GEO_001": outside})
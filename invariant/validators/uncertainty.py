@@ -1,9 +1,15 @@
 from typing import Optional
+
+import numpy as np
+
 from ..core.interfaces import SafetyValidator
 from ..core.types import SystemState, ProposedAction
-from ..core.outcome import Violation
+from ..core.outcome import Violation, ViolationRecord
+from ..core.batch import StateBatch, ActionBatch, BatchViolations
 
 class UncertaintyValidator(SafetyValidator):
+    estimated_cost_us = 2.0
+
     def __init__(self, required_sensors: list[str] = None):
         self.required_sensors = required_sensors or ["lidar", "imu"]
 
@@ -12,16 +18,27 @@ class UncertaintyValidator(SafetyValidator):
         return "UncertaintyCheck"
 
     def check(self, state: SystemState, action: ProposedAction) -> Optional[Violation]:
+        record = self.check_fast(state, action)
+        return record.to_model() if record is not None else None
+
+    def check_fast(self, state: SystemState, action: ProposedAction) -> Optional[ViolationRecord]:
         # Check if critical sensors are healthy
         if not state.sensor_health:
             return None # Assume healthy if not reported, or handle strict mode
             
         for sensor in self.required_sensors:
             if not state.sensor_health.get(sensor, True):
-                return Violation(
-                    rule_id="UNCERT_001",
-                    description=f"Critical sensor '{sensor}' reported unhealthy",
-                    severity="critical",
+                return ViolationRecord(
+                    "UNCERT_001", "critical",
+                    "Critical sensor '{}' reported unhealthy", (sensor,),
                     context={"sensor_health": state.sensor_health}
                 )
         return None
+
+    def check_batch(self, states: StateBatch, actions: ActionBatch) -> BatchViolations:
+        unhealthy = np.zeros(len(states), dtype=bool)
+        for sensor in self.required_sensors:
+            health = states.sensor_health.get(sensor)
+            if health is not None:
+                unhealthy |= ~health
+        return BatchViolations(masks={"UNCERT_001": unhealthy})
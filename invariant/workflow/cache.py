@@ -0,0 +1,128 @@
+import dataclasses
+import hashlib
+import marshal
+import os
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+from .graph import WorkflowGraph
+from .node import Node, Port, PortType, NodeConstraints
+from ..core.config import canonical_json
+
+# Bump whenever the compiled layout or graph construction semantics change
+CACHE_FORMAT_VERSION = 1
+
+def default_cache_dir() -> str:
+    """INVARIANT_CACHE_DIR, else $XDG_CACHE_HOME/invariant, else ~/.cache/invariant."""
+    explicit = os.environ.get("INVARIANT_CACHE_DIR")
+    if explicit:
+        return explicit
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "invariant")
+
+def source_hash(source: bytes) -> str:
+    """Content hash of a workflow definition, independent of where it lives on disk."""
+    return hashlib.sha256(source).hexdigest()
+
+def graph_hash(graph: WorkflowGraph) -> str:
+    """
+    Content hash of a built graph (nodes, ports, constraints, metadata, edges)
+    that ignores source formatting and also covers graphs that never came from
+    a file. Declaration order is part of the hash: it decides the topological
+    order, and with it the execution plan and which RNG draws each node gets.
+    """
+    nodes = [
+        [
+            node.id,
+            node.node_type,
+            [[p.name, p.port_type.value, p.data_type, p.metadata] for p in node.ports],
+            dataclasses.asdict(node.constraints),
+            node.metadata
+        ]
+        for node in graph.nodes_map.values()
+    ]
+    edges = [
+        [source, target, data["source_port"], data["target_port"]]
+        for source, target, data in graph.graph.edges(data=True)
+    ]
+    order = graph.get_topological_order()
+    return hashlib.sha256(canonical_json([nodes, edges, order]).encode("utf-8")).hexdigest()
+
+def compile_graph(graph: WorkflowGraph) -> bytes:
+    """
+    Serializes a graph together with its topological order and structural
+    invariants. Only plain builtins are written (via marshal), so loading a
+    compiled file never executes code. Raises ValueError if node metadata
+    holds values marshal can't represent.
+    """
+    nodes = tuple(
+        (
+            node.id,
+            node.node_type,
+            tuple((p.name, p.port_type.value, p.data_type, p.metadata) for p in node.ports),
+            dataclasses.asdict(node.constraints),
+            node.metadata
+        )
+        for node in graph.nodes_map.values()
+    )
+    edges = tuple(
+        (source, target, data["source_port"], data["target_port"])
+        for source, target, data in graph.graph.edges(data=True)
+    )
+    state = graph.get_state()
+    structure = (tuple(state["longest_to"]), state["fan_in_max"], state["fan_out_max"])
+    return marshal.dumps((CACHE_FORMAT_VERSION, nodes, edges, tuple(state["order"]), structure))
+
+def load_compiled(data: bytes) -> WorkflowGraph:
+    """Rebuilds a graph from compile_graph() output without re-validating acyclicity."""
+    version, nodes, edges, order, (longest_to, fan_in_max, fan_out_max) = marshal.loads(data)
+    if version != CACHE_FORMAT_VERSION:
+        raise ValueError(f"Compiled workflow format {version} != {CACHE_FORMAT_VERSION}")
+
+    return WorkflowGraph.from_state(
+        (
+            Node(
+                id=node_id,
+                node_type=node_type,
+                ports=[Port(name=n, port_type=PortType(t), data_type=d, metadata=m) for n, t, d, m in ports],
+                constraints=NodeConstraints(**constraints),
+                metadata=metadata
+            )
+            for node_id, node_type, ports, constraints, metadata in nodes
+        ),
+        edges,
+        {"order": order, "longest_to": longest_to, "fan_in_max": fan_in_max, "fan_out_max": fan_out_max}
+    )
+
+class CompiledWorkflowCache:
+    """On-disk cache of compiled workflows keyed by source content hash."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = os.path.join(cache_dir or default_cache_dir(), "workflows")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.wfc")
+
+    def load(self, key: str) -> Optional[WorkflowGraph]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return load_compiled(f.read())
+        except (OSError, ValueError, EOFError, TypeError):
+            # Missing, stale or corrupt entries are treated as misses
+            return None
+
+    def store(self, key: str, graph: WorkflowGraph) -> bool:
+        try:
+            data = compile_graph(graph)
+        except ValueError:
+            return False
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            return False
+        return True
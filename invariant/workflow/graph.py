@@ -1,5 +1,6 @@
+import heapq
 import networkx as nx
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
 from .node import Node
 
 class WorkflowGraph:
@@ -8,21 +9,185 @@ class WorkflowGraph:
     def __init__(self):
         self.graph = nx.DiGraph()
         self.nodes_map: Dict[str, Node] = {}
+        # Bumped on every mutation so derived data (plans, caches) can detect staleness
+        self.version = 0
+        # Maintained topological order (Pearce-Kelly): _topo[i] is the node at
+        # position i and _position is its inverse.
+        self._topo: List[str] = []
+        self._position: Dict[str, int] = {}
+        # Incrementally maintained structure: longest path (in edges) ending at
+        # each node, plus degree maxima. Insert-only, so these never shrink.
+        self._longest_to: Dict[str, int] = {}
+        self._depth = 0
+        self._fan_in_max = 0
+        self._fan_out_max = 0
+        # (version, value) memos for the derived views
+        self._invariants_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+        self._critical_path_cache: Optional[Tuple[int, List[str]]] = None
 
     def add_node(self, node: Node):
+        if node.id not in self._position:
+            self._position[node.id] = len(self._topo)
+            self._topo.append(node.id)
+            self._longest_to[node.id] = 0
         self.nodes_map[node.id] = node
         self.graph.add_node(node.id, node=node)
+        self.version += 1
 
     def add_edge(self, source_id: str, target_id: str, source_port: str, target_port: str):
-        """Adds an edge between two nodes and checks for cycles."""
+        """
+        Adds an edge between two nodes and checks for cycles.
+        Only the region between the two endpoints in the current topological
+        order is searched and reordered, so insertion cost is proportional to
+        the affected subgraph rather than the whole graph.
+        """
         if source_id not in self.nodes_map or target_id not in self.nodes_map:
             raise ValueError(f"One or both nodes {source_id}, {target_id} not found")
-        
+
+        lower = self._position[target_id]
+        upper = self._position[source_id]
+        if lower <= upper and not self.graph.has_edge(source_id, target_id):
+            # Target precedes source: anything reachable from the target that
+            # sits before the source may need to move behind it.
+            forward = self._reach(target_id, upper, forward=True, stop_at=source_id)
+            if forward is None:
+                raise ValueError(f"Adding edge {source_id} -> {target_id} would create a cycle")
+            backward = self._reach(source_id, lower, forward=False)
+            self._reorder(backward, forward)
+
+        is_new = not self.graph.has_edge(source_id, target_id)
         self.graph.add_edge(source_id, target_id, source_port=source_port, target_port=target_port)
-        
-        if not nx.is_directed_acyclic_graph(self.graph):
-            self.graph.remove_edge(source_id, target_id)
-            raise ValueError(f"Adding edge {source_id} -> {target_id} would create a cycle")
+        if is_new:
+            self._fan_out_max = max(self._fan_out_max, self.graph.out_degree(source_id))
+            self._fan_in_max = max(self._fan_in_max, self.graph.in_degree(target_id))
+            self._propagate_depth(source_id)
+        self.version += 1
+
+    def add_edges(self, edges: Iterable[Tuple[str, str, str, str]]):
+        """
+        Adds many (source, target, source_port, target_port) edges and checks
+        acyclicity once at the end. Either all edges are added or none are.
+        """
+        edges = list(edges)
+        for source_id, target_id, _, _ in edges:
+            if source_id not in self.nodes_map or target_id not in self.nodes_map:
+                raise ValueError(f"One or both nodes {source_id}, {target_id} not found")
+
+        previous: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
+        for source_id, target_id, source_port, target_port in edges:
+            key = (source_id, target_id)
+            if key not in previous:
+                existing = self.graph.get_edge_data(source_id, target_id)
+                previous[key] = dict(existing) if existing is not None else None
+            self.graph.add_edge(source_id, target_id, source_port=source_port, target_port=target_port)
+
+        try:
+            order = list(nx.topological_sort(self.graph))
+        except nx.NetworkXUnfeasible:
+            cycle = nx.find_cycle(self.graph)
+            # Roll back to the state before this call
+            for (source_id, target_id), attrs in previous.items():
+                if attrs is None:
+                    self.graph.remove_edge(source_id, target_id)
+                else:
+                    self.graph.edges[source_id, target_id].clear()
+                    self.graph.edges[source_id, target_id].update(attrs)
+            path = " -> ".join([u for u, _ in cycle] + [cycle[-1][1]])
+            raise ValueError(f"Adding edges would create a cycle: {path}")
+
+        self._topo = order
+        self._position = {node_id: i for i, node_id in enumerate(order)}
+        self._recompute_structure()
+        self.version += 1
+
+    def _propagate_depth(self, start: str):
+        """Pushes longest-path lengths forward from start, in topological order, only where they grow."""
+        heap = [(self._position[start], start)]
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            candidate = self._longest_to[node_id] + 1
+            for succ in self.graph.successors(node_id):
+                if self._longest_to[succ] < candidate:
+                    self._longest_to[succ] = candidate
+                    self._depth = max(self._depth, candidate)
+                    heapq.heappush(heap, (self._position[succ], succ))
+
+    def _recompute_structure(self):
+        """Full O(V + E) rebuild of the incrementally maintained structure."""
+        longest_to = {}
+        for node_id in self._topo:
+            longest_to[node_id] = max((longest_to[p] + 1 for p in self.graph.predecessors(node_id)), default=0)
+        self._longest_to = longest_to
+        self._depth = max(longest_to.values(), default=0)
+        self._fan_in_max = max((d for _, d in self.graph.in_degree()), default=0)
+        self._fan_out_max = max((d for _, d in self.graph.out_degree()), default=0)
+
+    def _reach(self, start: str, bound: int, forward: bool, stop_at: Optional[str] = None) -> Optional[Set[str]]:
+        """
+        Nodes reachable from start whose position is within bound (<= bound when
+        searching forward, >= bound when searching backward). Returns None if
+        stop_at is reached, which means the new edge closes a cycle.
+        """
+        if start == stop_at:
+            return None
+        neighbors = self.graph.successors if forward else self.graph.predecessors
+        visited = {start}
+        stack = [start]
+        while stack:
+            for w in neighbors(stack.pop()):
+                if w == stop_at:
+                    return None
+                if w in visited:
+                    continue
+                pos = self._position[w]
+                if (pos < bound) if forward else (pos > bound):
+                    visited.add(w)
+                    stack.append(w)
+        return visited
+
+    def _reorder(self, backward: Set[str], forward: Set[str]):
+        """Reuses the affected positions: ancestors of the source first, then descendants of the target."""
+        by_position = lambda node_id: self._position[node_id]
+        moved = sorted(backward, key=by_position) + sorted(forward, key=by_position)
+        slots = sorted(self._position[n] for n in moved)
+        for node_id, slot in zip(moved, slots):
+            self._position[node_id] = slot
+            self._topo[slot] = node_id
+
+    def get_state(self) -> Dict[str, Any]:
+        """Topological order and the incrementally maintained structure, as plain values."""
+        return {
+            "order": list(self._topo),
+            "longest_to": [self._longest_to[n] for n in self._topo],
+            "fan_in_max": self._fan_in_max,
+            "fan_out_max": self._fan_out_max,
+        }
+
+    @classmethod
+    def from_state(cls, nodes: Iterable[Node], edges: Iterable[Tuple[str, str, str, str]],
+                   state: Dict[str, Any]) -> "WorkflowGraph":
+        """
+        Rebuilds a graph from get_state() output without re-checking acyclicity,
+        so `state` must come from a graph with these same nodes and edges.
+        """
+        graph = cls()
+        for node in nodes:
+            graph.nodes_map[node.id] = node
+            graph.graph.add_node(node.id, node=node)
+        graph.graph.add_edges_from(
+            (source, target, {"source_port": sp, "target_port": tp}) for source, target, sp, tp in edges
+        )
+        order = list(state["order"])
+        if set(order) != set(graph.nodes_map) or len(order) != len(graph.nodes_map):
+            raise ValueError("State order doesn't cover the graph's nodes")
+        graph._topo = order
+        graph._position = {node_id: i for i, node_id in enumerate(order)}
+        graph._longest_to = dict(zip(order, state["longest_to"]))
+        graph._depth = max(graph._longest_to.values(), default=0)
+        graph._fan_in_max = state["fan_in_max"]
+        graph._fan_out_max = state["fan_out_max"]
+        graph.version = 1
+        return graph
 
     def get_node(self, node_id: str) -> Node:
         return self.nodes_map[node_id]
@@ -32,27 +197,40 @@ class WorkflowGraph:
         return list(self.nodes_map.keys())
 
     def get_topological_order(self) -> List[str]:
-        return list(nx.topological_sort(self.graph))
+        return list(self._topo)
 
     def get_invariants(self) -> Dict[str, Any]:
-        """Exposes graph-level invariants for analysis and ML features."""
-        return {
-            "num_nodes": self.graph.number_of_nodes(),
-            "num_edges": self.graph.number_of_edges(),
-            "depth": self._calculate_depth(),
-            "fan_in_max": max([d for _, d in self.graph.in_degree()] or [0]),
-            "fan_out_max": max([d for _, d in self.graph.out_degree()] or [0]),
-            "is_dag": nx.is_directed_acyclic_graph(self.graph)
-        }
-
-    def _calculate_depth(self) -> int:
-        if not self.graph.nodes:
-            return 0
-        try:
-            return nx.dag_longest_path_length(self.graph)
-        except nx.NetworkXError:
-            return 0
+        """
+        Exposes graph-level invariants for analysis and ML features.
+        Memoized per graph version; the graph must only be mutated through
+        WorkflowGraph methods for the cache to stay valid.
+        """
+        if self._invariants_cache is None or self._invariants_cache[0] != self.version:
+            self._invariants_cache = (self.version, {
+                "num_nodes": self.graph.number_of_nodes(),
+                "num_edges": self.graph.number_of_edges(),
+                "depth": self._depth,
+                "fan_in_max": self._fan_in_max,
+                "fan_out_max": self._fan_out_max,
+                "is_dag": nx.is_directed_acyclic_graph(self.graph)
+            })
+        # Copy so callers can't corrupt the cached entry
+        return dict(self._invariants_cache[1])
 
     def get_critical_path(self) -> List[str]:
         """Returns the longest path in the DAG."""
-        return nx.dag_longest_path(self.graph)
+        if self._critical_path_cache is None or self._critical_path_cache[0] != self.version:
+            path: List[str] = []
+            if self._topo:
+                # Walk back from the deepest node along predecessors one step shallower
+                node_id = max(self._topo, key=lambda n: self._longest_to[n])
+                path.append(node_id)
+                while self._longest_to[node_id] > 0:
+                    node_id = next(
+                        p for p in self.graph.predecessors(node_id)
+                        if self._longest_to[p] == self._longest_to[node_id] - 1
+                    )
+                    path.append(node_id)
+                path.reverse()
+            self._critical_path_cache = (self.version, path)
+        return list(self._critical_path_cache[1])
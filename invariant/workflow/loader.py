@@ -1,17 +1,39 @@
 import yaml
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from .graph import WorkflowGraph
 from .node import Node, Port, PortType, NodeConstraints
+from .cache import CompiledWorkflowCache, source_hash
+
+# libyaml-backed loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 class WorkflowLoader:
     """Loads workflow definitions from YAML or JSON."""
     
     @staticmethod
-    def from_yaml(path: str) -> WorkflowGraph:
-        with open(path, 'r') as f:
-            data = yaml.safe_load(f)
-        return WorkflowLoader.from_dict(data)
+    def from_yaml(path: str, use_cache: bool = False, cache_dir: Optional[str] = None) -> WorkflowGraph:
+        """
+        Loads a YAML workflow. With use_cache, the compiled graph is looked up
+        by the file's content hash and only rebuilt when the source changed.
+        Off by default: callers opt in to writing the on-disk cache.
+        """
+        with open(path, 'rb') as f:
+            source = f.read()
+
+        cache = None
+        if use_cache:
+            cache = CompiledWorkflowCache(cache_dir)
+            key = source_hash(source)
+            graph = cache.load(key)
+            if graph is not None:
+                return graph
+
+        data = yaml.load(source, Loader=_YamlLoader)
+        graph = WorkflowLoader.from_dict(data)
+        if cache is not None:
+            cache.store(key, graph)
+        return graph
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> WorkflowGraph:
@@ -39,13 +61,10 @@ class WorkflowLoader:
             )
             graph.add_node(node)
             
-        # Add edges
-        for edge_data in data.get("edges", []):
-            graph.add_edge(
-                source_id=edge_data["source"],
-                target_id=edge_data["target"],
-                source_port=edge_data["source_port"],
-                target_port=edge_data["target_port"]
-            )
+        # Add edges (acyclicity is checked once for the whole set)
+        graph.add_edges(
+            (e["source"], e["target"], e["source_port"], e["target_port"])
+            for e in data.get("edges", [])
+        )
             
         return graph
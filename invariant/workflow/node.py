@@ -18,6 +18,8 @@ class NodeConstraints:
     min_rate_hz: Optional[float] = None
     max_latency_ms: Optional[float] = None
     timeout_ms: Optional[float] = None
+    # e.g. {"p95": 30.0, "p99": 45.0}: the given latency percentile across runs must stay within budget
+    percentile_budgets_ms: Dict[str, float] = field(default_factory=dict)
 
 @dataclass
 class Node:
@@ -0,0 +1,15 @@
+"""Shared fixtures for the engine tests."""
+from invariant.workflow.loader import WorkflowLoader
+from invariant.execution.engine import DeterministicEngine, PerturbationModel
+from invariant.execution.profiles import PerturbationProfiles
+from invariant.core.config import ExperimentConfig
+
+WORKFLOW_PATH = "examples/simple_workflow.yaml"
+
+def make_engine(engine_cls=DeterministicEngine, seed=7, profiles=None, latency_max_ms=5.0, **model):
+    """An engine over the example workflow; `profiles` is a profiles dict, `model` goes to PerturbationModel."""
+    graph = WorkflowLoader.from_yaml(WORKFLOW_PATH)
+    engine = engine_cls(graph, ExperimentConfig({"seed": seed}, timestamp=1000.0))
+    engine.set_perturbation(PerturbationModel(latency_max_ms=latency_max_ms, seed=seed, **model),
+                            None if profiles is None else PerturbationProfiles.from_dict(profiles))
+    return engine
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from invariant.execution.archive import TraceArchive, TraceArchiveWriter
+from invariant.execution.signals import TraceBatch, WorkflowExecutionTrace
+
+class TestTraceArchive(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".itrace")
+        os.close(fd)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_round_trip_and_append(self):
+        batch = TraceBatch("sweep-a", 10.0, ["cam", "plan"], ["perception", "planning"],
+                           start_times=np.array([[0.0, 1.0], [0.0, 2.0]]),
+                           end_times=np.array([[1.0, 3.0], [2.0, 5.0]]))
+        with TraceArchiveWriter(self.path) as writer:
+            writer.append_batch(batch)
+
+        # Reopen for append: new node ids extend the existing string table
+        extra = WorkflowExecutionTrace(run_id="live", timestamp=20.0)
+        extra.record("ctrl", 0.0, 0.5, "control")
+        extra.record("cam", 0.5, 0.75, "perception")
+        with TraceArchiveWriter(self.path) as writer:
+            writer.append(extra)
+
+        with TraceArchive(self.path) as archive:
+            self.assertEqual(len(archive), 3)
+            self.assertEqual(archive.node_table, ["cam", "plan", "ctrl"])
+            self.assertEqual(archive.run_ids, ["sweep-a", "sweep-a", "live"])
+
+            second = archive.trace(1)
+            np.testing.assert_array_equal(second.durations_ms(), [2000.0, 3000.0])
+            self.assertEqual(second.signals[0].metadata, {"type": "perception"})
+
+            live = archive.trace(2)
+            self.assertEqual(live.get_node_latencies(), {"ctrl": 500.0, "cam": 250.0})
+            self.assertEqual(archive.timestamps[2], 20.0)
+
+    def test_torn_tail_is_ignored(self):
+        trace = WorkflowExecutionTrace(run_id="r", timestamp=0.0)
+        trace.record("a", 0.0, 1.0)
+        with TraceArchiveWriter(self.path) as writer:
+            writer.append(trace)
+            writer.append(trace)
+        with open(self.path, "r+b") as f:
+            f.truncate(os.path.getsize(self.path) - 5)
+
+        with TraceArchive(self.path) as archive:
+            self.assertEqual(len(archive), 1)
+
+    def test_short_lived_node_tables(self):
+        # Each trace's table is freed right after append, so its id gets reused
+        names = [f"node{i}" for i in range(20)]
+        with TraceArchiveWriter(self.path) as writer:
+            for node_id in names:
+                trace = WorkflowExecutionTrace(run_id=node_id, timestamp=0.0)
+                trace.record(node_id, 0.0, 1.0)
+                writer.append(trace)
+                del trace
+
+        with TraceArchive(self.path) as archive:
+            self.assertEqual([t.signals[0].node_id for t in archive], names)
+
+if __name__ == '__main__':
+    unittest.main()
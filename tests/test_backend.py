@@ -0,0 +1,295 @@
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import msgpack
+import zstandard
+from fastapi.testclient import TestClient
+
+from backend.src import main
+from backend.src.schemas import DecisionLog, TelemetryEvent
+from backend.src.storage import TelemetryStore, _SCHEMA
+from backend.src.aggregates import DashboardAggregates, LatencyHistogram
+from backend.src.stream import DecisionBroadcaster
+
+def decision(i=0, outcome="ALLOW", rule_ids=(), ms=1.0):
+    return {
+        "decision": outcome,
+        "reason": f"r{i}",
+        "violations": [{"rule_id": r, "description": "", "severity": "high"} for r in rule_ids],
+        "original_action_id": f"a{i}",
+        "processing_time_ms": ms,
+    }
+
+def ndjson(records):
+    return b"\n".join(json.dumps(r).encode("utf-8") for r in records)
+
+class TestBatchIngest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved = (main.store, main.aggregates, main.broadcaster)
+        main.store = TelemetryStore(os.path.join(self.tmp, "telemetry.db"), flush_interval_s=0.05)
+        main.aggregates = DashboardAggregates()
+        main.broadcaster = DecisionBroadcaster()
+        self.client = TestClient(main.app)
+        self.client.__enter__()
+
+    def tearDown(self):
+        self.client.__exit__(None, None, None)
+        main.store, main.aggregates, main.broadcaster = self.saved
+        shutil.rmtree(self.tmp)
+
+    def post(self, body, content_type="application/x-ndjson", encoding=None, kind="decisions"):
+        headers = {"Content-Type": content_type}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return self.client.post(f"/api/v1/telemetry/{kind}:batch", content=body, headers=headers)
+
+    def test_encodings(self):
+        records = [decision(i) for i in range(5)]
+        bodies = [
+            (ndjson(records), "application/x-ndjson", None),
+            (json.dumps(records).encode("utf-8"), "application/json", None),
+            (gzip.compress(ndjson(records)), "application/x-ndjson", "gzip"),
+            (zstandard.ZstdCompressor().compress(ndjson(records)), "application/x-ndjson", "zstd"),
+            (msgpack.packb(records), "application/msgpack", None),
+            (b"".join(msgpack.packb(r) for r in records), "application/msgpack", None),
+        ]
+        for n, (body, content_type, encoding) in enumerate(bodies, start=1):
+            ack = self.post(body, content_type, encoding).json()
+            self.assertEqual((ack["accepted"], ack["rejected"], ack["total"]), (5, 0, 5 * n))
+
+        stored = self.client.get("/api/v1/telemetry/decisions", params={"limit": 100}).json()
+        self.assertEqual(len(stored), 30)
+        self.assertEqual(stored[0]["original_action_id"], "a0")
+        summary = self.client.get("/api/v1/dashboard/summary").json()
+        self.assertEqual(summary["aggregates"]["since_start"]["count"], 30)
+
+    def test_events_batch(self):
+        events = [{"timestamp": 1.0, "type": "heartbeat", "data": {"i": i}} for i in range(3)]
+        ack = self.post(ndjson(events), kind="events").json()
+        self.assertEqual((ack["accepted"], ack["total"]), (3, 3))
+
+    def test_bad_records_are_rejected_individually(self):
+        good, bad = decision(0), {"decision": "ALLOW"}
+        lines = [json.dumps(good).encode(), json.dumps(bad).encode(), b"{not json",
+                 # Two values on one line must not pass as two records
+                 json.dumps(good).encode() + b", " + json.dumps(good).encode()]
+        ack = self.post(b"\n".join(lines)).json()
+        self.assertEqual((ack["accepted"], ack["rejected"]), (1, 3))
+        self.assertEqual([e["index"] for e in ack["errors"]], [1, 2, 3])
+
+        ack = self.post(msgpack.packb([good, bad, good]), "application/msgpack").json()
+        self.assertEqual((ack["accepted"], ack["rejected"]), (2, 1))
+        self.assertEqual(ack["errors"][0]["index"], 1)
+
+    def test_undecodable_bodies(self):
+        body = ndjson([decision()])
+        self.assertEqual(self.post(body, encoding="br").status_code, 415)
+        self.assertEqual(self.post(body, content_type="application/xml").status_code, 415)
+        self.assertEqual(self.post(b"not gzip", encoding="gzip").status_code, 400)
+        self.assertEqual(self.post(b"not zstd", encoding="zstd").status_code, 400)
+        self.assertEqual(self.post(b"[1, 2", content_type="application/json").status_code, 400)
+        self.assertEqual(self.post(b'[{"reason": "\xff"}]', content_type="application/json").status_code, 400)
+        self.assertEqual(self.post(gzip.compress(body)[:-4], encoding="gzip").status_code, 400)
+        self.assertEqual(main.store.total_decisions, 0)
+
+    def test_decompression_bombs(self):
+        zeros = b"0" * 100_000
+        with mock.patch.object(main.settings, "MAX_DECOMPRESSED_BYTES", 4096):
+            for body, encoding in ((gzip.compress(zeros), "gzip"),
+                                   (gzip.compress(b"0") + gzip.compress(zeros), "gzip"),
+                                   (zstandard.ZstdCompressor().compress(zeros), "zstd")):
+                self.assertEqual(self.post(body, encoding=encoding).status_code, 413)
+            # Multi-member gzip under the cap still decodes
+            body = ndjson([decision(0)])
+            ack = self.post(gzip.compress(body) + gzip.compress(b"\n" + body), encoding="gzip").json()
+            self.assertEqual(ack["accepted"], 2)
+
+class TestTelemetryStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "telemetry.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_ring_and_wal_reopen(self):
+        store = TelemetryStore(self.path, recent_capacity=3)
+        store.open()
+        self.assertEqual(store._conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+        store.add_decisions([DecisionLog(**decision(i)) for i in range(5)], received_at=10.0)
+        store.add_events([TelemetryEvent(timestamp=1.0, type="heartbeat", data={})], received_at=10.0)
+        self.assertEqual([d.reason for d in store.recent_decisions(10)], ["r2", "r3", "r4"])
+        store.close()
+
+        reopened = TelemetryStore(self.path, recent_capacity=3)
+        reopened.open()
+        self.assertEqual((reopened.total_decisions, reopened.total_events), (5, 1))
+        self.assertEqual([d.reason for d in reopened.recent_decisions(2)], ["r3", "r4"])
+        self.assertEqual(len(reopened.query_decisions(start=10.0, end=11.0)), 5)
+        reopened.close()
+
+    def test_compaction(self):
+        store = TelemetryStore(self.path, retention_s=100.0)
+        store.open()
+        store.add_decisions([DecisionLog(**decision(0))], received_at=10.0)
+        store.add_decisions([DecisionLog(**decision(1))], received_at=500.0)
+        store.flush()
+        self.assertEqual(store.compact(now=200.0), 1)
+        self.assertEqual([d.reason for d in store.query_decisions()], ["r1"])
+        self.assertEqual(store.total_decisions, 1)
+        store.close()
+
+    def test_failed_flush_requeues(self):
+        store = TelemetryStore(self.path)
+        store.open()
+        store.add_decisions([DecisionLog(**decision(i)) for i in range(3)], received_at=1.0)
+        store._conn.execute("DROP TABLE decisions")
+        with self.assertRaises(sqlite3.OperationalError):
+            store.flush()
+        self.assertEqual(store.pending_count, 3)
+
+        store.add_decisions([DecisionLog(**decision(3))], received_at=2.0)
+        store._conn.executescript(_SCHEMA)
+        store.flush()
+        self.assertEqual(store.pending_count, 0)
+        self.assertEqual([d.reason for d in store.query_decisions()], ["r0", "r1", "r2", "r3"])
+        store.close()
+
+    def test_writer_survives_flush_errors(self):
+        store = TelemetryStore(self.path, flush_interval_s=0.01)
+        store.open()
+        store._conn.execute("DROP TABLE decisions")
+
+        async def scenario():
+            task = asyncio.create_task(store.run())
+            store.add_decisions([DecisionLog(**decision(0))], received_at=1.0)
+            await asyncio.sleep(0.05)
+            self.assertFalse(task.done())
+            self.assertEqual(store.pending_count, 1)
+            store._conn.executescript(_SCHEMA)
+            await asyncio.sleep(0.05)
+            task.cancel()
+            return store.pending_count
+
+        with self.assertLogs("backend.src.storage", level="ERROR"):
+            self.assertEqual(asyncio.run(scenario()), 0)
+        self.assertEqual(len(store.query_decisions()), 1)
+        store.close()
+
+    def test_concurrent_ingest_and_flush(self):
+        store = TelemetryStore(self.path)
+        store.open()
+
+        def ingest(t):
+            for i in range(100):
+                store.add_decisions([DecisionLog(**decision(t * 100 + i))], received_at=float(i))
+
+        def flush():
+            for _ in range(50):
+                store.flush()
+
+        threads = [threading.Thread(target=ingest, args=(t,)) for t in range(4)]
+        threads += [threading.Thread(target=flush) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        reasons = [d.reason for d in store.query_decisions(limit=1000)]
+        self.assertEqual(len(reasons), 400)
+        self.assertEqual(len(set(reasons)), 400)
+        store.close()
+
+class TestAggregates(unittest.TestCase):
+    def test_tumbling_windows(self):
+        aggregates = DashboardAggregates(window_s=10.0, max_windows=2)
+        aggregates.record([DecisionLog(**decision(0, "ALLOW", ms=2.0))], 3.0)
+        aggregates.record([DecisionLog(**decision(1, "DENY", ("speed",), ms=8.0))], 12.0)
+        # Late arrival goes back into its own (still retained) window
+        aggregates.record([DecisionLog(**decision(2, "DENY", ("speed", "zone"), ms=4.0))], 7.0)
+
+        windows = aggregates.window_summaries()
+        self.assertEqual([(w["start"], w["count"]) for w in windows], [(0.0, 2), (10.0, 1)])
+        self.assertEqual(windows[0]["decisions"], {"ALLOW": 1, "DENY": 1})
+        self.assertEqual(windows[0]["violation_rates"], {"speed": 0.5, "zone": 0.5})
+
+        aggregates.record([DecisionLog(**decision(3))], 25.0)
+        self.assertEqual([w["start"] for w in aggregates.window_summaries()], [10.0, 20.0])
+        summary = aggregates.summary()
+        self.assertEqual(summary["since_start"]["count"], 4)
+        self.assertEqual(summary["current_window"]["start"], 20.0)
+
+    def test_late_arrivals(self):
+        aggregates = DashboardAggregates(window_s=10.0, max_windows=3)
+        aggregates.record([DecisionLog(**decision(0))], 15.0)
+        aggregates.record([DecisionLog(**decision(1))], 35.0)
+        # A gap window is opened in place rather than folded into the newest one
+        aggregates.record([DecisionLog(**decision(2))], 22.0)
+        self.assertEqual([(w["start"], w["count"]) for w in aggregates.window_summaries()],
+                         [(10.0, 1), (20.0, 1), (30.0, 1)])
+
+        # Older than anything retained: counted in totals, dropped from windows
+        aggregates.record([DecisionLog(**decision(i)) for i in range(2)], 5.0)
+        self.assertEqual([(w["start"], w["count"]) for w in aggregates.window_summaries()],
+                         [(10.0, 1), (20.0, 1), (30.0, 1)])
+        summary = aggregates.summary()
+        self.assertEqual((summary["since_start"]["count"], summary["late_dropped"]), (5, 2))
+
+        # A gap in a full deque evicts the oldest window
+        aggregates.record([DecisionLog(**decision(3))], 55.0)
+        aggregates.record([DecisionLog(**decision(4))], 47.0)
+        self.assertEqual([w["start"] for w in aggregates.window_summaries()], [30.0, 40.0, 50.0])
+
+    def test_histogram_percentiles(self):
+        hist = LatencyHistogram(growth=1.05)
+        for v in range(1, 1001):
+            hist.record(float(v))
+        for q in (50, 95, 99):
+            self.assertAlmostEqual(hist.percentile(q) / (q * 10), 1.0, delta=0.05)
+        self.assertEqual(hist.percentile(100), 1000.0)
+        self.assertEqual(LatencyHistogram().summary()["count"], 0)
+
+class TestBroadcaster(unittest.TestCase):
+    def test_filters_and_slow_consumers(self):
+        async def scenario():
+            broadcaster = DecisionBroadcaster(queue_size=2)
+            everything = broadcaster.subscribe()
+            denies = broadcaster.subscribe(decisions=["DENY"], rule_ids=["zone"])
+            broadcaster.publish([DecisionLog(**decision(i, "DENY" if i == 1 else "ALLOW", ("zone",)))
+                                 for i in range(4)], 5.0)
+
+            # The slow subscriber keeps the newest messages and counts what it lost
+            self.assertEqual(everything.dropped, 2)
+            latest = [json.loads(everything.queue.get_nowait().split("data: ")[1])["reason"] for _ in range(2)]
+            self.assertEqual(latest, ["r2", "r3"])
+            self.assertEqual(denies.queue.qsize(), 1)
+            message = denies.queue.get_nowait()
+            self.assertTrue(message.startswith("event: decision\n"))
+            self.assertEqual(json.loads(message.split("data: ")[1])["received_at"], 5.0)
+
+            broadcaster.unsubscribe(denies)
+            self.assertEqual(broadcaster.subscribers, [everything])
+
+        asyncio.run(scenario())
+
+    def test_aggregate_delta(self):
+        broadcaster = DecisionBroadcaster()
+        aggregates = DashboardAggregates()
+        aggregates.record([DecisionLog(**decision(0)), DecisionLog(**decision(1, "DENY"))], 1.0)
+        self.assertEqual(broadcaster.aggregate_delta(aggregates)["decisions"], {"ALLOW": 1, "DENY": 1})
+        aggregates.record([DecisionLog(**decision(2, "DENY"))], 2.0)
+        delta = broadcaster.aggregate_delta(aggregates)
+        self.assertEqual((delta["count"], delta["decisions"]), (1, {"DENY": 1}))
+        self.assertEqual(delta["processing_time_ms"]["count"], 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from invariant.execution.signals import TraceBatch
+from invariant.validation.behavioral import BehavioralValidator
+from invariant.workflow.graph import WorkflowGraph
+
+def batch_from_durations(durations_ms, node_ids=None):
+    durations = np.asarray(durations_ms, dtype=np.float64) / 1000.0
+    ends = np.cumsum(durations, axis=1)
+    n_nodes = durations.shape[1]
+    node_ids = node_ids or [f"n{j}" for j in range(n_nodes)]
+    return TraceBatch("r", 0.0, node_ids, ["stage"] * n_nodes,
+                      start_times=ends - durations, end_times=ends).to_traces()
+
+class TestBehavioralValidator(unittest.TestCase):
+    def test_identical_runs_are_stable(self):
+        traces = batch_from_durations([[1.0, 2.0, 3.0]] * 4)
+        result = BehavioralValidator().validate(WorkflowGraph(), traces)
+        self.assertEqual(result.metrics["n1"]["variance"], 0.0)
+        self.assertAlmostEqual(result.run_metrics["divergence"], 0.0)
+        self.assertAlmostEqual(result.run_metrics["rank_instability"], 0.0)
+
+    def test_divergence_matches_pairwise_distance(self):
+        durations = np.random.default_rng(1).uniform(1.0, 10.0, size=(30, 5))
+        metrics = BehavioralValidator().validate(WorkflowGraph(), batch_from_durations(durations)).run_metrics
+        diffs = durations[:, None, :] - durations[None, :, :]
+        pairwise_ms = np.sqrt((diffs ** 2).sum(axis=2).mean())
+        self.assertAlmostEqual(metrics["pairwise_rms_ms"], pairwise_ms, places=6)
+
+    def test_reordered_runs_raise_rank_instability(self):
+        traces = batch_from_durations([[1.0, 2.0, 3.0], [3.0, 2.0, 1.0]])
+        result = BehavioralValidator(rank_instability_threshold=0.5).validate(WorkflowGraph(), traces)
+        self.assertAlmostEqual(result.run_metrics["rank_instability"], 1.0)
+        self.assertFalse(result.pass_status)
+        self.assertIn("Rank instability", result.message)
+
+    def test_node_named_like_a_run_metric(self):
+        traces = batch_from_durations([[1.0, 2.0], [1.5, 2.5]], node_ids=["divergence", "rank_instability"])
+        result = BehavioralValidator().validate(WorkflowGraph(), traces)
+        self.assertEqual(set(result.metrics), {"divergence", "rank_instability"})
+        self.assertAlmostEqual(result.metrics["divergence"]["mean"], 1.25)
+        self.assertIsInstance(result.run_metrics["divergence"], float)
+
+if __name__ == '__main__':
+    unittest.main()
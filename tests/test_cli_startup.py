@@ -0,0 +1,16 @@
+import unittest
+
+from benchmarks.bench_startup import eagerly_imported, measure_startup_ms
+
+# Deliberately loose so CI noise doesn't trip it; the benchmark script enforces the real budget
+STARTUP_CEILING_MS = 2000.0
+
+class TestCLIStartup(unittest.TestCase):
+    def test_no_heavy_imports_at_startup(self):
+        self.assertEqual(eagerly_imported(), [])
+
+    def test_help_within_ceiling(self):
+        self.assertLess(measure_startup_ms(runs=3), STARTUP_CEILING_MS)
+
+if __name__ == '__main__':
+    unittest.main()
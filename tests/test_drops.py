@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from invariant.execution.engine import DeterministicEngine
+from invariant.execution.event_engine import EventDrivenEngine
+from invariant.execution.archive import TraceArchive, TraceArchiveWriter
+from invariant.execution.signals import FLAG_DROPPED, FLAG_STARVED, RETRY_SHIFT
+from invariant.validation.temporal import TemporalValidator
+
+from helpers import make_engine
+
+
+class TestDrops(unittest.TestCase):
+    def test_zero_probability_leaves_runs_untouched(self):
+        plain = make_engine().run()
+        explicit = make_engine(drop_probability=0.0, drop_policy="retry").run()
+        np.testing.assert_array_equal(plain.end_times, explicit.end_times)
+        self.assertIsNone(make_engine().run_batch(5).flags)
+        self.assertEqual(plain.perturbations_applied, [])
+
+    def test_batch_drops_starve_downstream(self):
+        batch = make_engine(drop_probability=0.3).run_batch(5000)
+        flags = batch.flags
+        camera_lost = (flags[:, 0] & FLAG_DROPPED) > 0
+        # camera -> planner -> controller: a lost camera frame starves both consumers
+        self.assertTrue(np.all(flags[camera_lost, 1:] == FLAG_STARVED))
+        self.assertAlmostEqual(camera_lost.mean(), 0.3, delta=0.03)
+        self.assertTrue(np.all(batch.durations_ms()[~batch.executed] == 0.0))
+
+        run = int(np.flatnonzero(camera_lost)[0])
+        trace = batch.trace(run)
+        self.assertEqual(trace.node_table[trace.node_index[0]], "camera")
+        self.assertEqual(trace.starved_nodes, ["planner", "controller"])
+        self.assertEqual(
+            [e["type"] for e in trace.perturbations_applied],
+            ["drop", "starved", "starved"]
+        )
+
+    def test_retry_policy(self):
+        batch = make_engine(drop_probability=0.5, drop_policy="retry", max_retries=2).run_batch(20000)
+        retries = (batch.flags >> RETRY_SHIFT) & 0xFF
+        self.assertLessEqual(retries.max(), 2)
+        # Output is only lost once all three attempts fail
+        self.assertAlmostEqual(((batch.flags[:, 0] & FLAG_DROPPED) > 0).mean(), 0.125, delta=0.01)
+        # Retried executions take longer
+        durations = batch.durations_ms()[:, 0]
+        self.assertGreater(durations[retries[:, 0] == 2].mean(), durations[retries[:, 0] == 0].mean())
+
+    def test_sequential_and_event_engines_starve(self):
+        for engine_cls in (DeterministicEngine, EventDrivenEngine):
+            engine = make_engine(engine_cls, drop_probability=1.0)
+            trace = engine.run()
+            self.assertEqual(len(trace), 1)
+            self.assertEqual(trace.starved_nodes, ["planner", "controller"])
+            self.assertEqual(int(trace.flags[0]), FLAG_DROPPED)
+
+    def test_temporal_with_nodes_never_executed(self):
+        # Every camera frame lost: planner and controller are starved in every run
+        for engine_cls in (DeterministicEngine, EventDrivenEngine):
+            engine = make_engine(engine_cls, drop_probability=1.0)
+            traces = [engine.run() for _ in range(3)]
+            if engine_cls is DeterministicEngine:
+                traces += engine.run_batch(3).to_traces()
+            streaming = TemporalValidator().incremental(engine.graph)
+            streaming.update_many(traces)
+            for result in (TemporalValidator().validate(engine.graph, traces), streaming.result()):
+                self.assertEqual(result.metrics["not_executed"], ["planner", "controller"])
+                self.assertEqual(list(result.metrics["nodes"]), ["camera"])
+
+    def test_archive_round_trip(self):
+        batch = make_engine(drop_probability=0.3, drop_policy="retry", max_retries=1).run_batch(200)
+        traces = batch.to_traces()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "drops.itrace")
+            with TraceArchiveWriter(path) as writer:
+                writer.append_batch(batch)
+                for trace in traces[:20]:
+                    writer.append(trace)
+            with TraceArchive(path) as archive:
+                for i, expected in enumerate(traces + traces[:20]):
+                    got = archive.trace(i)
+                    self.assertEqual(got.starved_nodes, expected.starved_nodes)
+                    np.testing.assert_array_equal(got.flags, expected.flags)
+                    np.testing.assert_array_equal(got.end_times, expected.end_times)
+                    self.assertEqual(got.perturbations_applied, expected.perturbations_applied)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import functools
+import unittest
+
+import numpy as np
+
+import helpers
+
+make_engine = functools.partial(helpers.make_engine, seed=42, latency_max_ms=20.0, jitter_ms=5.0)
+
+class TestRunBatch(unittest.TestCase):
+    def test_batch_is_reproducible(self):
+        b1 = make_engine().run_batch(50)
+        b2 = make_engine().run_batch(50)
+        np.testing.assert_array_equal(b1.start_times, b2.start_times)
+        np.testing.assert_array_equal(b1.end_times, b2.end_times)
+
+    def test_batch_shape_and_ordering(self):
+        engine = make_engine()
+        batch = engine.run_batch(10)
+        self.assertEqual(batch.start_times.shape, (10, 3))
+        self.assertEqual(batch.node_ids, engine.scheduler.get_execution_plan())
+        # Nodes are chained in plan order and never faster than the baseline
+        np.testing.assert_array_equal(batch.start_times[:, 1:], batch.end_times[:, :-1])
+        self.assertTrue(np.all(batch.durations_ms() >= 1.0 - 1e-9))
+
+    def test_to_traces(self):
+        batch = make_engine().run_batch(3)
+        traces = batch.to_traces()
+        self.assertEqual(len(traces), 3)
+        latencies = traces[1].get_node_latencies()
+        for j, node_id in enumerate(batch.node_ids):
+            self.assertAlmostEqual(latencies[node_id], batch.durations_ms()[1, j])
+
+if __name__ == '__main__':
+    unittest.main()
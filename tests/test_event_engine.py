@@ -0,0 +1,35 @@
+import unittest
+
+from invariant.workflow.graph import WorkflowGraph
+from invariant.workflow.node import Node
+from invariant.execution.event_engine import EventDrivenEngine
+from invariant.core.config import ExperimentConfig
+
+def diamond() -> WorkflowGraph:
+    graph = WorkflowGraph()
+    for node_id in ["src", "left", "right", "sink"]:
+        graph.add_node(Node(id=node_id, node_type="stage", ports=[]))
+    graph.add_edge("src", "left", "out", "in")
+    graph.add_edge("src", "right", "out", "in")
+    graph.add_edge("left", "sink", "out", "in")
+    graph.add_edge("right", "sink", "out", "in")
+    return graph
+
+class TestEventDrivenEngine(unittest.TestCase):
+    def test_independent_branches_overlap(self):
+        trace = EventDrivenEngine(diamond(), ExperimentConfig({}, timestamp=1.0)).run()
+        signals = {s.node_id: s for s in trace.signals}
+
+        self.assertEqual(signals["left"].start_time, signals["right"].start_time)
+        self.assertEqual(signals["sink"].start_time, max(signals["left"].end_time, signals["right"].end_time))
+        # src -> {left, right} -> sink is three baseline steps, not four
+        self.assertAlmostEqual(trace.end_times.max() - 1.0, 0.003)
+
+    def test_bounded_workers_serialize_branches(self):
+        trace = EventDrivenEngine(diamond(), ExperimentConfig({}, timestamp=1.0), max_workers=1).run()
+        self.assertAlmostEqual(trace.end_times.max() - 1.0, 0.004)
+        starts = sorted(trace.start_times.tolist())
+        self.assertEqual(len(set(starts)), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+from invariant.workflow.graph import WorkflowGraph
+from invariant.workflow.node import Node
+from invariant.execution.scheduler import TopologicalScheduler
+
+def build_graph(node_ids, edges) -> WorkflowGraph:
+    graph = WorkflowGraph()
+    for node_id in node_ids:
+        graph.add_node(Node(id=node_id, node_type="stage", ports=[]))
+    for source, target in edges:
+        graph.add_edge(source, target, "out", "in")
+    return graph
+
+class TestExecutionPlan(unittest.TestCase):
+    def setUp(self):
+        # a -> b -> c -> d is the long branch, a -> x -> d the short one
+        self.graph = build_graph(
+            ["a", "b", "c", "d", "x"],
+            [("a", "b"), ("b", "c"), ("c", "d"), ("a", "x"), ("x", "d")]
+        )
+        self.scheduler = TopologicalScheduler(self.graph)
+
+    def test_levels_slack_and_critical_path(self):
+        plan = self.scheduler.get_plan()
+        self.assertEqual(plan.levels[0], ("a",))
+        self.assertEqual(set(plan.levels[1]), {"b", "x"})
+        self.assertEqual(plan.critical_path, ("a", "b", "c", "d"))
+        self.assertEqual(plan.slack_of("x"), 1)
+        self.assertEqual(plan.slack_of("c"), 0)
+
+    def test_plan_is_cached_until_graph_changes(self):
+        plan = self.scheduler.get_plan()
+        self.assertIs(self.scheduler.get_plan(), plan)
+
+        self.graph.add_node(Node(id="y", node_type="stage", ports=[]))
+        rebuilt = self.scheduler.get_plan()
+        self.assertIsNot(rebuilt, plan)
+        self.assertIn("y", rebuilt.levels[0])
+
+if __name__ == '__main__':
+    unittest.main()
+
+class TestIncrementalCycleDetection(unittest.TestCase):
+    def assert_valid_order(self, graph):
+        position = {n: i for i, n in enumerate(graph.get_topological_order())}
+        self.assertEqual(len(position), len(graph.node_ids))
+        for source, target in graph.graph.edges:
+            self.assertLess(position[source], position[target])
+
+    def test_back_edge_reorders(self):
+        graph = build_graph(["a", "b", "c", "d"], [])
+        graph.add_edge("d", "c", "out", "in")
+        graph.add_edge("c", "b", "out", "in")
+        graph.add_edge("b", "a", "out", "in")
+        self.assertEqual(graph.get_topological_order(), ["d", "c", "b", "a"])
+
+    def test_cycle_rejected_and_graph_unchanged(self):
+        graph = build_graph(["a", "b", "c"], [("a", "b"), ("b", "c")])
+        order = graph.get_topological_order()
+        with self.assertRaises(ValueError):
+            graph.add_edge("c", "a", "out", "in")
+        with self.assertRaises(ValueError):
+            graph.add_edge("b", "b", "out", "in")
+        self.assertFalse(graph.graph.has_edge("c", "a"))
+        self.assertEqual(graph.get_topological_order(), order)
+
+    def test_random_insertions_keep_valid_order(self):
+        import random
+        rng = random.Random(7)
+        node_ids = [f"n{i}" for i in range(40)]
+        graph = build_graph(node_ids, [])
+        for _ in range(300):
+            source, target = rng.sample(node_ids, 2)
+            try:
+                graph.add_edge(source, target, "out", "in")
+            except ValueError:
+                self.assertTrue(graph.graph.has_node(source))
+        self.assert_valid_order(graph)
+
+    def test_bulk_add_edges_is_atomic(self):
+        graph = build_graph(["a", "b", "c"], [("a", "b")])
+        with self.assertRaises(ValueError):
+            graph.add_edges([("b", "c", "out", "in"), ("c", "a", "out", "in")])
+        self.assertEqual(sorted(graph.graph.edges), [("a", "b")])
+
+        graph.add_edges([("c", "a", "out", "in")])
+        self.assert_valid_order(graph)
+
+class TestCachedInvariants(unittest.TestCase):
+    def test_matches_networkx_after_incremental_edits(self):
+        import random
+        import networkx as nx
+        rng = random.Random(3)
+        node_ids = [f"n{i}" for i in range(30)]
+        graph = build_graph(node_ids, [])
+        for step in range(200):
+            source, target = rng.sample(node_ids, 2)
+            try:
+                graph.add_edge(source, target, "out", "in")
+            except ValueError:
+                pass
+            if step % 25 == 0:
+                invariants = graph.get_invariants()
+                self.assertEqual(invariants["depth"], nx.dag_longest_path_length(graph.graph))
+                self.assertEqual(invariants["fan_in_max"], max(d for _, d in graph.graph.in_degree()))
+                self.assertEqual(invariants["fan_out_max"], max(d for _, d in graph.graph.out_degree()))
+                self.assertEqual(len(graph.get_critical_path()) - 1, invariants["depth"])
+
+    def test_cache_invalidated_on_mutation(self):
+        graph = build_graph(["a", "b"], [])
+        self.assertEqual(graph.get_invariants()["depth"], 0)
+        graph.get_invariants()["depth"] = 99
+        self.assertEqual(graph.get_invariants()["depth"], 0)
+
+        graph.add_edges([("a", "b", "out", "in")])
+        self.assertEqual(graph.get_invariants()["depth"], 1)
+        self.assertEqual(graph.get_critical_path(), ["a", "b"])
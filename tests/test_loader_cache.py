@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from invariant.workflow.loader import WorkflowLoader
+from invariant.workflow.cache import CompiledWorkflowCache, source_hash
+
+WORKFLOW_PATH = "examples/simple_workflow.yaml"
+
+class TestCompiledWorkflowCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_cached_graph_matches_fresh_load(self):
+        fresh = WorkflowLoader.from_yaml(WORKFLOW_PATH)
+        WorkflowLoader.from_yaml(WORKFLOW_PATH, use_cache=True, cache_dir=self.cache_dir)
+
+        with open(WORKFLOW_PATH, "rb") as f:
+            key = source_hash(f.read())
+        cached = CompiledWorkflowCache(self.cache_dir).load(key)
+        self.assertIsNotNone(cached)
+
+        self.assertEqual(cached.get_topological_order(), fresh.get_topological_order())
+        self.assertEqual(cached.get_invariants(), fresh.get_invariants())
+        self.assertEqual(cached.get_node("camera"), fresh.get_node("camera"))
+        self.assertEqual(sorted(cached.graph.edges(data=True)), sorted(fresh.graph.edges(data=True)))
+
+        # The restored graph keeps working incrementally
+        with self.assertRaises(ValueError):
+            cached.add_edge("controller", "camera", "out", "in")
+
+    def test_cache_is_opt_in(self):
+        with mock.patch.dict(os.environ, {"INVARIANT_CACHE_DIR": self.cache_dir}):
+            WorkflowLoader.from_yaml(WORKFLOW_PATH)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = CompiledWorkflowCache(self.cache_dir)
+        os.makedirs(cache.cache_dir, exist_ok=True)
+        with open(os.path.join(cache.cache_dir, "deadbeef.wfc"), "wb") as f:
+            f.write(b"not a compiled workflow")
+        self.assertIsNone(cache.load("deadbeef"))
+
+if __name__ == '__main__':
+    unittest.main()
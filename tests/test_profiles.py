@@ -0,0 +1,102 @@
+import functools
+import unittest
+
+import numpy as np
+
+from invariant.workflow.loader import WorkflowLoader
+from invariant.execution.engine import DeterministicEngine, PerturbationModel
+from invariant.execution.event_engine import EventDrivenEngine
+from invariant.execution.distributions import LogNormal, Pareto, MarkovBurst, Constant, make_distribution
+from invariant.core.config import ExperimentConfig
+
+import helpers
+
+PROFILES = {
+    "nodes": {
+        "camera": {"latency": {"dist": "lognormal", "median_ms": 8, "sigma": 0.5}, "jitter_ms": 0},
+        "planner": {"latency": {"dist": "burst", "normal": {"dist": "constant", "value_ms": 5},
+                                "burst": {"dist": "pareto", "scale_ms": 20, "alpha": 1.5, "cap_ms": 500},
+                                "p_enter": 0.05, "p_exit": 0.2}},
+    },
+    "edges": [{"source": "camera", "target": "planner", "delay": {"dist": "constant", "value_ms": 3}}],
+}
+
+make_engine = functools.partial(helpers.make_engine, seed=5, profiles=PROFILES, jitter_ms=1.0)
+
+class TestDistributions(unittest.TestCase):
+    def test_table_sampling_matches_ppf(self):
+        u = np.random.default_rng(0).random(200000)
+        for dist in (LogNormal(8, 0.5), Pareto(2, 1.5, cap_ms=200)):
+            for q in (0.5, 0.99):
+                self.assertAlmostEqual(np.quantile(dist.sample(u), q) / dist.ppf(q), 1.0, delta=0.02)
+
+    def test_bimodal_mixture(self):
+        dist = make_distribution({"dist": "bimodal", "low": {"dist": "constant", "value_ms": 1},
+                                  "high": {"dist": "constant", "value_ms": 30}, "p_high": 0.1})
+        samples = dist.sample(np.random.default_rng(1).random(50000))
+        self.assertAlmostEqual((samples == 30).mean(), 0.1, delta=0.01)
+
+    def test_burst_chain_transition_rates(self):
+        dist = MarkovBurst(Constant(1), Constant(50), p_enter=0.05, p_exit=0.2)
+        states = dist.chain(np.random.default_rng(2).random(200000), None)
+        self.assertAlmostEqual(states.mean(), dist.stationary, delta=0.01)
+        self.assertAlmostEqual((states[:-1] & ~states[1:]).sum() / states[:-1].sum(), 0.2, delta=0.01)
+
+    def test_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            make_distribution({"dist": "weibull"})
+        with self.assertRaises(ValueError):
+            make_distribution({"dist": "lognormal", "median_ms": 0, "sigma": 1})
+
+class TestProfiles(unittest.TestCase):
+    def test_profiles_shape_latencies(self):
+        batch = make_engine().run_batch(20000)
+        durations = batch.durations_ms()
+        # lognormal median + 1ms baseline, no jitter on the camera
+        self.assertAlmostEqual(np.median(durations[:, 0]), 9.0, delta=0.2)
+        # planner is 5ms (+1ms baseline, +-1ms jitter) outside bursts
+        self.assertAlmostEqual((durations[:, 1] > 19).mean(), 0.2, delta=0.03)
+        # every planner waits 3ms for the camera's message
+        np.testing.assert_allclose(batch.start_times[:, 1] - batch.end_times[:, 0], 0.003)
+
+    def test_counter_mode_agrees_across_engines(self):
+        model = dict(rng_mode="counter", drop_probability=0.2, drop_policy="retry", max_retries=2)
+        batch = make_engine(**model).run_batch(200)
+        sequential = make_engine(**model)
+        event = make_engine(EventDrivenEngine, **model)
+        chunked = make_engine(**model)
+        chunks = np.vstack([chunked.run_batch(120).end_times, chunked.run_batch(80).end_times])
+        np.testing.assert_allclose(chunks, batch.end_times, rtol=0, atol=1e-9)
+        for i in range(200):
+            expected = batch.trace(i)
+            for engine in (sequential, event):
+                trace = engine.run()
+                self.assertEqual(trace.starved_nodes, expected.starved_nodes)
+                np.testing.assert_allclose(trace.end_times, expected.end_times, rtol=0, atol=1e-9)
+
+    def test_profiles_from_node_metadata(self):
+        graph = WorkflowLoader.from_dict({
+            "nodes": [
+                {"id": "a", "type": "sensor", "metadata": {"perturbation": {
+                    "latency": {"dist": "constant", "value_ms": 4}, "jitter_ms": 0,
+                    "edges": {"b": {"dist": "constant", "value_ms": 2}}}}},
+                {"id": "b", "type": "actuator"},
+            ],
+            "edges": [{"source": "a", "target": "b", "source_port": "out", "target_port": "in"}],
+        })
+        for engine_cls in (DeterministicEngine, EventDrivenEngine):
+            engine = engine_cls(graph, ExperimentConfig({"seed": 1}, timestamp=1000.0))
+            engine.set_perturbation(PerturbationModel(seed=1))
+            trace = engine.run()
+            np.testing.assert_allclose(trace.start_times, [1000.0, 1000.007])
+            np.testing.assert_allclose(trace.end_times, [1000.005, 1000.008])
+
+    def test_unknown_node_or_edge(self):
+        with self.assertRaises(ValueError):
+            make_engine(profiles={"nodes": {"lidar": {"jitter_ms": 1}}}).run()
+        with self.assertRaises(ValueError):
+            make_engine(profiles={"edges": [{"source": "camera", "target": "controller",
+                                             "delay": {"dist": "constant", "value_ms": 1}}]}).run()
+
+if __name__ == '__main__':
+    unittest.main()
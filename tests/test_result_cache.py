@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+from click.testing import CliRunner
+
+from invariant.workflow.loader import WorkflowLoader
+from invariant.workflow.cache import graph_hash
+from invariant.execution.engine import DeterministicEngine, PerturbationModel
+from invariant.execution.result_cache import ResultCache, result_key
+from invariant.execution.sweep import SweepExecutor, build_grid
+from invariant.core.config import ExperimentConfig
+from invariant.cli import main
+from invariant.validation.temporal import TemporalValidator
+
+WORKFLOW_PATH = "examples/simple_workflow.yaml"
+
+class TestConfigHash(unittest.TestCase):
+    def test_hash_ignores_nested_key_order(self):
+        a = ExperimentConfig({"seed": 1, "model": {"latency": 5.0, "profile": {"a": 1, "b": [1, 2]}}})
+        b = ExperimentConfig({"model": {"profile": {"b": [1, 2], "a": 1}, "latency": 5.0}, "seed": 1})
+        c = ExperimentConfig({"seed": 1, "model": {"latency": 5.0, "profile": {"a": 2, "b": [1, 2]}}})
+        self.assertEqual(a.config_hash, b.config_hash)
+        self.assertNotEqual(a.config_hash, c.config_hash)
+
+    def test_hash_keeps_key_types_and_odd_values(self):
+        self.assertNotEqual(ExperimentConfig({1: "a"}).config_hash, ExperimentConfig({"1": "a"}).config_hash)
+        self.assertEqual(ExperimentConfig({"m": {2: 0, "x": 1}}).config_hash,
+                         ExperimentConfig({"m": {"x": 1, 2: 0}}).config_hash)
+        # Non-JSON values hash by their repr instead of raising
+        a = ExperimentConfig({"gain": complex(1, 2), "ids": {3, "a"}})
+        b = ExperimentConfig({"ids": {"a", 3}, "gain": complex(1, 2)})
+        self.assertEqual(a.config_hash, b.config_hash)
+        self.assertNotEqual(a.config_hash, ExperimentConfig({"gain": complex(1, 3), "ids": {3, "a"}}).config_hash)
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.graph = WorkflowLoader.from_yaml(WORKFLOW_PATH)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def run_batch(self, seed, n_runs=50, **model):
+        config = ExperimentConfig({"seed": seed}, timestamp=1000.0)
+        engine = DeterministicEngine(self.graph, config)
+        engine.set_perturbation(PerturbationModel(latency_max_ms=20.0, seed=seed, **model))
+        batch = engine.run_batch(n_runs)
+        return config, batch, [TemporalValidator().validate(self.graph, batch.to_traces())]
+
+    def test_round_trip(self):
+        cache = ResultCache(self.cache_dir)
+        config, batch, results = self.run_batch(1, drop_probability=0.2)
+        key = result_key(graph_hash(self.graph), config.config_hash)
+        self.assertIsNone(cache.get(key))
+        self.assertTrue(cache.put(key, batch, results, config.config_data))
+
+        hit = cache.get(key)
+        self.assertEqual(hit.config, {"seed": 1})
+        self.assertEqual(hit.results[0].pass_status, results[0].pass_status)
+        self.assertEqual(hit.results[0].metrics["violation_count"], results[0].metrics["violation_count"])
+        cached = hit.batch()
+        np.testing.assert_array_equal(cached.end_times, batch.end_times)
+        np.testing.assert_array_equal(cached.flags, batch.flags)
+        self.assertEqual(cached.node_ids, batch.node_ids)
+        self.assertEqual([t.starved_nodes for t in hit.traces()], [t.starved_nodes for t in batch.to_traces()])
+
+        # Another engine version never sees this entry
+        self.assertIsNone(cache.get(result_key(graph_hash(self.graph), config.config_hash, engine_version=-1)))
+
+    def test_reordered_workflow_misses(self):
+        nodes = [{"id": "a", "type": "sensor"}, {"id": "b", "type": "sensor"}]
+        forward = WorkflowLoader.from_dict({"nodes": nodes})
+        backward = WorkflowLoader.from_dict({"nodes": nodes[::-1]})
+        # Same content, but the plan (and so each node's RNG draws) differs
+        self.assertNotEqual(forward.get_topological_order(), backward.get_topological_order())
+        self.assertNotEqual(graph_hash(forward), graph_hash(backward))
+        self.assertEqual(graph_hash(forward), graph_hash(WorkflowLoader.from_dict({"nodes": nodes})))
+
+        cache = ResultCache(self.cache_dir)
+        points = build_grid([1], [10.0])
+        SweepExecutor(forward, "ab", runs=3, workers=1, timestamp=100.0, result_cache=cache).run(points)
+        results = SweepExecutor(backward, "ab", runs=3, workers=1, timestamp=100.0, result_cache=cache).run(points)
+        self.assertFalse(any(r.cached for r in results.values()))
+
+    def test_lru_eviction(self):
+        cache = ResultCache(self.cache_dir)
+        keys = []
+        for seed in range(3):
+            config, batch, results = self.run_batch(seed)
+            keys.append(result_key(graph_hash(self.graph), config.config_hash))
+            cache.put(keys[-1], batch, results)
+            # Distinct mtimes whatever the filesystem's timestamp resolution
+            os.utime(os.path.join(cache.cache_dir, f"{keys[-1]}.json"), (seed, seed))
+        entry_size = cache.entries()[0]["size"]
+
+        cache.get(keys[0])  # most recently used now
+        cache.evict(max_bytes=2 * entry_size)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNotNone(cache.get(keys[2]))
+        self.assertLessEqual(cache.size_bytes, 2 * entry_size)
+
+    def test_sweep_skips_cached_points(self):
+        cache = ResultCache(self.cache_dir)
+        first = SweepExecutor(self.graph, "simple", runs=3, workers=1, timestamp=100.0, result_cache=cache)
+        computed = first.run(build_grid([1, 2], [10.0]))
+        self.assertFalse(any(r.cached for r in computed.values()))
+
+        again = SweepExecutor(self.graph, "simple", runs=3, workers=1, timestamp=100.0,
+                              keep_traces=True, result_cache=cache)
+        results = again.run(build_grid([1, 2, 3], [10.0]))
+        self.assertEqual([r.cached for r in results.values()], [True, True, False])
+        for config_hash, res in computed.items():
+            self.assertEqual(results[config_hash].stability_score, res.stability_score)
+            self.assertEqual(results[config_hash].batch.n_runs, 3)
+
+    def test_key_ignores_workflow_path(self):
+        path = os.path.abspath(WORKFLOW_PATH)
+        same_file = os.path.join(os.path.dirname(path), ".", os.path.basename(path))
+        runner = CliRunner()
+        with runner.isolated_filesystem(temp_dir=self.cache_dir):
+            outputs = [runner.invoke(main, ["validate", p, "--runs", "3", "--cache-dir", self.cache_dir]).output
+                       for p in (path, same_file)]
+        self.assertNotIn("Reusing cached results", outputs[0])
+        self.assertIn("Reusing cached results", outputs[1])
+
+        cache = ResultCache(self.cache_dir)
+        points = build_grid([1], [10.0])
+        SweepExecutor(self.graph, path, runs=3, workers=1, timestamp=100.0, result_cache=cache).run(points)
+        results = SweepExecutor(self.graph, same_file, runs=3, workers=1, timestamp=100.0, result_cache=cache).run(points)
+        self.assertTrue(all(r.cached for r in results.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from invariant.execution.signals import ExecutionSignal, WorkflowExecutionTrace, TraceBatch, concat_traces
+
+class TestColumnarTrace(unittest.TestCase):
+    def test_signal_views_round_trip(self):
+        trace = WorkflowExecutionTrace(run_id="r", timestamp=0.0)
+        trace.add_signal(ExecutionSignal("a", 0.0, 0.002, metadata={"type": "perception"}))
+        trace.add_signal(ExecutionSignal("b", 0.002, 0.005, input_data_hashes={"in": "abc"}))
+        trace.record("a", 0.005, 0.006, "perception")
+
+        self.assertEqual(len(trace), 3)
+        self.assertEqual(trace.node_table, ["a", "b"])
+        np.testing.assert_array_equal(trace.node_index, [0, 1, 0])
+        signals = trace.signals
+        self.assertEqual(signals[0].metadata, {"type": "perception"})
+        self.assertEqual(signals[1].input_data_hashes, {"in": "abc"})
+        self.assertAlmostEqual(signals[1].duration_ms, 3.0)
+        # Last execution wins, as with the original dict comprehension
+        self.assertAlmostEqual(trace.get_node_latencies()["a"], 1.0)
+
+    def test_batch_views_are_copy_on_write(self):
+        batch = TraceBatch("r", 0.0, ["a", "b"], ["x", "y"],
+                           start_times=np.array([[0.0, 1.0]]), end_times=np.array([[1.0, 3.0]]))
+        trace = batch.trace(0)
+        self.assertTrue(np.shares_memory(trace.start_times, batch.start_times))
+        trace.record("c", 3.0, 4.0)
+        self.assertEqual(batch.node_ids, ["a", "b"])
+        self.assertEqual(batch.start_times.shape, (1, 2))
+        self.assertEqual(trace.node_table, ["a", "b", "c"])
+
+    def test_concat_traces_shares_node_table(self):
+        batch = TraceBatch("r", 0.0, ["a", "b"], ["x", "y"],
+                           start_times=np.zeros((3, 2)), end_times=np.ones((3, 2)))
+        columns = concat_traces(batch.to_traces())
+        self.assertEqual(columns.node_ids, ["a", "b"])
+        np.testing.assert_array_equal(columns.run_index, [0, 0, 1, 1, 2, 2])
+        np.testing.assert_array_equal(columns.durations_ms, np.full(6, 1000.0))
+
+    def test_concat_traces_from_generator(self):
+        # Each trace (and its own node table) is freed before the next is made
+        def traces():
+            for i in range(50):
+                trace = WorkflowExecutionTrace(run_id=str(i), timestamp=0.0)
+                trace.record(f"n{i}", 0.0, 1.0)
+                yield trace
+        columns = concat_traces(traces())
+        self.assertEqual(columns.node_ids, [f"n{i}" for i in range(50)])
+        np.testing.assert_array_equal(columns.node_index, np.arange(50))
+
+if __name__ == '__main__':
+    unittest.main()
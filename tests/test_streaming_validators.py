@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from invariant.workflow.loader import WorkflowLoader
+from invariant.execution.engine import DeterministicEngine, PerturbationModel
+from invariant.core.config import ExperimentConfig
+from invariant.execution.signals import WorkflowExecutionTrace
+from invariant.validation.behavioral import BehavioralValidator
+from invariant.validation.temporal import TemporalValidator
+from invariant.validation.structural import StructuralValidator
+from invariant.validation.streaming import P2Quantile
+from invariant.validation.base import BaseValidator, ValidationResult
+
+WORKFLOW_PATH = "examples/simple_workflow.yaml"
+
+def make_traces(n_runs=200):
+    graph = WorkflowLoader.from_yaml(WORKFLOW_PATH)
+    engine = DeterministicEngine(graph, ExperimentConfig({"seed": 3}, timestamp=1000.0))
+    engine.set_perturbation(PerturbationModel(latency_max_ms=20.0, jitter_ms=5.0, seed=3))
+    return graph, engine.run_batch(n_runs).to_traces()
+
+class TestStreamingValidators(unittest.TestCase):
+    def test_matches_batch_validators(self):
+        graph, traces = make_traces()
+        for validator in (BehavioralValidator(), TemporalValidator(), StructuralValidator()):
+            streaming = validator.incremental(graph)
+            streaming.update_many(traces)
+            expected = validator.validate(graph, traces)
+            got = streaming.result()
+            self.assertEqual(got.pass_status, expected.pass_status)
+            self.assertEqual(got.message, expected.message)
+
+        streaming = BehavioralValidator().incremental(graph)
+        streaming.update_many(traces)
+        expected_result = BehavioralValidator().validate(graph, traces)
+        streamed = streaming.result()
+        for key in ("divergence", "pairwise_rms_ms", "rank_instability"):
+            self.assertAlmostEqual(streamed.run_metrics[key], expected_result.run_metrics[key])
+        expected, result = expected_result.metrics, streamed.metrics
+        for node_id in graph.node_ids:
+            stats, got = expected[node_id], result[node_id]
+            self.assertAlmostEqual(got["mean"], stats["mean"])
+            self.assertAlmostEqual(got["variance"], stats["variance"])
+            self.assertAlmostEqual(got["cv"], stats["cv"])
+
+    def test_structural_ignores_nodes_outside_the_graph(self):
+        graph, traces = make_traces(3)
+        extra = WorkflowExecutionTrace(run_id="extra", timestamp=0.0)
+        extra.record("lidar", 0.0, 0.01)
+        traces.append(extra)
+        streaming = StructuralValidator().incremental(graph)
+        streaming.update_many(traces)
+        expected = StructuralValidator().validate(graph, traces)
+        self.assertEqual((streaming.result().pass_status, streaming.result().message),
+                         (expected.pass_status, expected.message))
+        self.assertTrue(expected.pass_status)
+
+    def test_batch_only_validator_gets_buffered_default(self):
+        class RunCounter(BaseValidator):
+            def validate(self, graph, traces):
+                return ValidationResult(len(traces) > 1, "runs", f"{len(traces)} runs")
+
+        graph, traces = make_traces(5)
+        streaming = RunCounter().incremental(graph)
+        streaming.update_many(traces)
+        self.assertEqual(streaming.result(), RunCounter().validate(graph, traces))
+
+    def test_p2_quantile_tracks_numpy(self):
+        samples = np.random.default_rng(0).lognormal(0.0, 0.5, 20000)
+        for p in (0.5, 0.95, 0.99):
+            sketch = P2Quantile(p)
+            for x in samples:
+                sketch.add(float(x))
+            exact = np.percentile(samples, p * 100)
+            self.assertLess(abs(sketch.value() - exact) / exact, 0.02)
+
+    def test_small_sample_quantiles_are_exact(self):
+        sketch = P2Quantile(0.5)
+        for x in (5.0, 1.0, 3.0):
+            sketch.add(x)
+        self.assertEqual(sketch.value(), 3.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+
+import numpy as np
+
+from invariant.core.batch import StateBatch, ActionBatch
+from invariant.core.engine import SafetySupervisor
+from invariant.core.outcome import Decision, SafetyOutcome
+from invariant.core.types import SystemState, ProposedAction, ActionType
+from invariant.telemetry.client import TelemetryBridge
+from invariant.validators.physical import PhysicalConstraintValidator
+from invariant.validators.policy import GeofenceValidator
+from invariant.validators.uncertainty import UncertaintyValidator
+
+class RecordingTelemetry(TelemetryBridge):
+    def __init__(self):
+        super().__init__()
+        self.logged = []
+
+    def log_decision(self, state, action, outcome):
+        self.logged.append(outcome)
+
+def velocity(v, w=0.0, action_id="a"):
+    return ProposedAction(action_id=action_id, type=ActionType.VELOCITY_CMD, payload={"v": v, "w": w})
+
+class TestSafetySupervisor(unittest.TestCase):
+    def setUp(self):
+        self.telemetry = RecordingTelemetry()
+        self.supervisor = SafetySupervisor(telemetry_bridge=self.telemetry)
+        self.supervisor.register_validator(PhysicalConstraintValidator(max_linear_velocity=2.0))
+        self.supervisor.register_validator(GeofenceValidator(x_limit=10.0))
+        self.supervisor.register_validator(UncertaintyValidator())
+
+    def test_approved(self):
+        outcome = self.supervisor.evaluate(SystemState(pose={"x": 0, "y": 0}), velocity(1.5, 0.1))
+        self.assertIsInstance(outcome, SafetyOutcome)
+        self.assertTrue(outcome.is_safe())
+        self.assertEqual(outcome.reason, "Safe")
+
+    def test_overspeed_is_clamped(self):
+        outcome = self.supervisor.evaluate(SystemState(pose={"x": 5, "y": 5}), velocity(5.0, 0.1))
+        self.assertEqual(outcome.decision, Decision.MODIFIED)
+        self.assertEqual(outcome.modified_action.payload, {"v": 2.0, "w": 0.1})
+        self.assertEqual(outcome.violations[0].description, "Linear velocity 5.00 exceeds limit 2.0")
+
+    def test_geofence_rejected_and_logged(self):
+        outcome = self.supervisor.evaluate(SystemState(pose={"x": 12, "y": 0}), velocity(0.5))
+        self.assertEqual(outcome.decision, Decision.REJECTED)
+        self.assertEqual(outcome.reason, "Blocked by 1 checks")
+        self.assertEqual(outcome.violations[0].description, "System outside operational area (12.0, 0.0)")
+        self.assertEqual(self.telemetry.logged[-1].decision, Decision.REJECTED)
+
+    def test_fast_path_defers_formatting(self):
+        record = self.supervisor.evaluate_fast(
+            SystemState(pose={"x": 0, "y": 0}, sensor_health={"lidar": False}), velocity(0.5)
+        )
+        violation = record.violations[0]
+        self.assertIsNone(violation._description)
+        self.assertEqual(violation.description, "Critical sensor 'lidar' reported unhealthy")
+
+class TestEvaluateBatch(unittest.TestCase):
+    def test_matches_per_robot_evaluation(self):
+        telemetry = TelemetryBridge()
+        telemetry.enabled = False
+        # Without short-circuiting every violation is reported, so rule lists compare too
+        supervisor = SafetySupervisor(telemetry_bridge=telemetry, short_circuit=False)
+        supervisor.register_validator(PhysicalConstraintValidator(max_linear_velocity=2.0, max_angular_velocity=1.0))
+        supervisor.register_validator(GeofenceValidator(x_limit=10.0, y_limit=10.0))
+        supervisor.register_validator(UncertaintyValidator())
+
+        rng = np.random.default_rng(0)
+        n = 200
+        states = [
+            SystemState(
+                pose={"x": float(x), "y": float(y)},
+                sensor_health={"lidar": bool(ok)} if i % 3 == 0 else {}
+            )
+            for i, (x, y, ok) in enumerate(zip(rng.uniform(-12, 12, n), rng.uniform(-12, 12, n), rng.random(n) > 0.2))
+        ]
+        actions = [velocity(float(v), float(w), str(i))
+                   for i, (v, w) in enumerate(zip(rng.uniform(-3, 3, n), rng.uniform(-1.5, 1.5, n)))]
+
+        batch = supervisor.evaluate_batch(StateBatch.from_states(states), ActionBatch.from_actions(actions))
+        for i in range(n):
+            expected = supervisor.evaluate_fast(states[i], actions[i])
+            self.assertEqual(batch.decision(i), expected.decision)
+            self.assertEqual(sorted(batch.violated_rules(i)), sorted(v.rule_id for v in expected.violations))
+            if expected.modified_payload is not None:
+                self.assertEqual(batch.v[i], expected.modified_payload["v"])
+                self.assertEqual(batch.w[i], expected.modified_payload["w"])
+
+class CheapLookingUncertainty(UncertaintyValidator):
+    estimated_cost_us = 0.1
+
+class ExpensiveLookingGeofence(GeofenceValidator):
+    estimated_cost_us = 5.0
+
+class TestValidatorOrdering(unittest.TestCase):
+    def test_rejectors_run_first_and_short_circuit(self):
+        telemetry = RecordingTelemetry()
+        supervisor = SafetySupervisor(telemetry_bridge=telemetry)
+        supervisor.register_validator(PhysicalConstraintValidator())
+        supervisor.register_validator(UncertaintyValidator())
+        supervisor.register_validator(GeofenceValidator())
+
+        order = list(supervisor.validator_stats())
+        self.assertEqual(order[-1], "PhysicalConstraints")
+
+        outcome = supervisor.evaluate_fast(SystemState(pose={"x": 50, "y": 0}), velocity(9.0))
+        self.assertEqual(outcome.decision, Decision.REJECTED)
+        stats = supervisor.validator_stats()
+        self.assertEqual(stats["GeofencePolicy"]["rejections"], 1)
+        # Physical limits can't change a rejection, so they were skipped
+        self.assertEqual(stats["PhysicalConstraints"]["calls"], 0)
+
+    def test_adaptive_reordering_prefers_frequent_rejector(self):
+        supervisor = SafetySupervisor(telemetry_bridge=RecordingTelemetry(), reorder_interval=50)
+        supervisor.register_validator(ExpensiveLookingGeofence())
+        supervisor.register_validator(CheapLookingUncertainty())
+        self.assertEqual(list(supervisor.validator_stats())[0], "UncertaintyCheck")
+
+        # The uncertainty check never fires here, so the geofence should move to the front
+        for _ in range(200):
+            supervisor.evaluate_fast(SystemState(pose={"x": 50, "y": 0}), velocity(0.1))
+        self.assertEqual(list(supervisor.validator_stats())[0], "GeofencePolicy")
+
+    def test_disabled_short_circuit_reports_all_violations(self):
+        supervisor = SafetySupervisor(telemetry_bridge=RecordingTelemetry(), short_circuit=False)
+        supervisor.register_validator(GeofenceValidator())
+        supervisor.register_validator(UncertaintyValidator())
+        outcome = supervisor.evaluate_fast(
+            SystemState(pose={"x": 50, "y": 0}, sensor_health={"imu": False}), velocity(0.1)
+        )
+        self.assertEqual(len(outcome.violations), 2)
+
+if __name__ == '__main__':
+    unittest.main()
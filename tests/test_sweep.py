@@ -0,0 +1,22 @@
+import unittest
+
+from invariant.workflow.loader import WorkflowLoader
+from invariant.execution.sweep import SweepExecutor, build_grid
+
+class TestSweepExecutor(unittest.TestCase):
+    def test_results_independent_of_worker_count(self):
+        graph = WorkflowLoader.from_yaml("examples/simple_workflow.yaml")
+        points = build_grid([1, 2], [10.0, 150.0], [5.0])
+
+        serial = SweepExecutor(graph, "simple", runs=3, workers=1, timestamp=100.0).run(points)
+        parallel = SweepExecutor(graph, "simple", runs=3, workers=2, timestamp=100.0).run(points)
+
+        self.assertEqual(list(serial), list(parallel))
+        for config_hash, res in serial.items():
+            other = parallel[config_hash]
+            self.assertEqual(res.point, other.point)
+            self.assertEqual(res.stability_score, other.stability_score)
+            self.assertEqual([r.metrics for r in res.results], [r.metrics for r in other.results])
+
+if __name__ == '__main__':
+    unittest.main()
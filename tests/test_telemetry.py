@@ -0,0 +1,70 @@
+import json
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from invariant.core.engine import SafetySupervisor
+from invariant.core.types import SystemState, ProposedAction, ActionType
+from invariant.telemetry.client import TelemetryBridge
+from invariant.validators.physical import PhysicalConstraintValidator
+
+class _Collector(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        _Collector.requests_seen.append((self.path, self.headers["Content-Type"], body))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+class TestTelemetryBridge(unittest.TestCase):
+    def test_decisions_are_batched_off_thread(self):
+        _Collector.requests_seen = []
+        server = HTTPServer(("127.0.0.1", 0), _Collector)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            bridge = TelemetryBridge(endpoint=f"http://127.0.0.1:{server.server_port}", flush_interval_s=0.5)
+            supervisor = SafetySupervisor(telemetry_bridge=bridge)
+            supervisor.register_validator(PhysicalConstraintValidator())
+            for i in range(20):
+                action = ProposedAction(action_id=str(i), type=ActionType.VELOCITY_CMD, payload={"v": 0.5})
+                supervisor.evaluate_fast(SystemState(), action)
+
+            self.assertTrue(bridge.flush(timeout=5.0))
+            bridge.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(bridge.stats()["sent"], 20)
+        self.assertLess(len(_Collector.requests_seen), 20)
+        path, content_type, body = _Collector.requests_seen[0]
+        self.assertEqual(path, TelemetryBridge.BATCH_PATH)
+        self.assertEqual(content_type, "application/x-ndjson")
+        first = json.loads(body.splitlines()[0])
+        self.assertEqual(first["decision"], "approved")
+
+    def test_overflow_drops_oldest(self):
+        bridge = TelemetryBridge(capacity=4)
+        bridge._start = lambda: None # keep the sender from draining the buffer
+        action = ProposedAction(action_id="a", type=ActionType.VELOCITY_CMD, payload={})
+        for _ in range(10):
+            bridge.log_decision(SystemState(), action, object())
+        self.assertEqual(bridge.stats()["dropped"], 6)
+        self.assertEqual(bridge.stats()["pending"], 4)
+
+    def test_restart_registers_exit_hook_once(self):
+        bridge = TelemetryBridge(flush_interval_s=0.01)
+        with mock.patch("invariant.telemetry.client.atexit.register") as register:
+            for _ in range(3):
+                bridge._start()
+                bridge.close()
+        register.assert_called_once_with(bridge.close)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from invariant.workflow.graph import WorkflowGraph
+from invariant.workflow.node import Node, NodeConstraints
+from invariant.execution.signals import WorkflowExecutionTrace
+from invariant.validation.temporal import TemporalValidator
+
+def make_trace(run_id, latencies_ms):
+    """latencies_ms: list of (node_id, start_s, latency_ms)"""
+    trace = WorkflowExecutionTrace(run_id=run_id, timestamp=0.0)
+    for node_id, start, latency in latencies_ms:
+        trace.record(node_id, start, start + latency / 1000.0)
+    return trace
+
+class TestTemporalValidator(unittest.TestCase):
+    def setUp(self):
+        self.graph = WorkflowGraph()
+        self.graph.add_node(Node(id="cam", node_type="perception", ports=[],
+                                 constraints=NodeConstraints(max_latency_ms=10.0, min_rate_hz=20.0)))
+        self.graph.add_node(Node(id="plan", node_type="planning", ports=[],
+                                 constraints=NodeConstraints(timeout_ms=50.0, percentile_budgets_ms={"p50": 20.0})))
+
+    def _check_both(self, traces):
+        result = TemporalValidator().validate(self.graph, traces)
+        streaming = TemporalValidator().incremental(self.graph)
+        streaming.update_many(traces)
+        self.assertEqual(streaming.result().pass_status, result.pass_status)
+        self.assertEqual(streaming.result().metrics["violations"], result.metrics["violations"])
+        return result
+
+    def test_breach_in_earlier_run_is_reported(self):
+        traces = [make_trace("r0", [("cam", 0.0, 15.0)]), make_trace("r1", [("cam", 0.0, 5.0)])]
+        result = self._check_both(traces)
+        self.assertFalse(result.pass_status)
+        self.assertEqual(result.metrics["nodes"]["cam"]["violation_rate"], 0.5)
+        self.assertEqual(result.metrics["nodes"]["cam"]["max"], 15.0)
+
+    def test_percentile_budget_and_timeout(self):
+        traces = [make_trace(f"r{i}", [("plan", 0.0, latency)]) for i, latency in enumerate([10.0, 30.0, 60.0])]
+        result = self._check_both(traces)
+        messages = " ".join(result.metrics["violations"])
+        self.assertIn("p50 latency 30.00ms", messages)
+        self.assertIn("timed out", messages)
+        self.assertAlmostEqual(result.metrics["nodes"]["plan"]["timeout_rate"], 1 / 3)
+
+    def test_min_rate(self):
+        # cam runs at 10Hz in the first run and 50Hz in the second
+        slow = make_trace("slow", [("cam", t * 0.1, 1.0) for t in range(5)])
+        fast = make_trace("fast", [("cam", t * 0.02, 1.0) for t in range(5)])
+        result = self._check_both([slow, fast])
+        stats = result.metrics["nodes"]["cam"]
+        self.assertEqual((stats["rate_checked"], stats["rate_violations"]), (2, 1))
+        self.assertAlmostEqual(stats["min_rate_hz"], 10.0)
+
+        # A single execution per run can't be rated, so it isn't a violation
+        self.assertTrue(TemporalValidator().validate(self.graph, [make_trace("one", [("cam", 0.0, 1.0)])]).pass_status)
+
+if __name__ == '__main__':
+    unittest.main()